@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import random as rnd
+import time
+import tracemalloc
+
+import gameEvents
+from gameAsync import AsyncGame, play_games
+from gameLogic import SeaBattleGameLogic, ComputerPlayer
+
+
+# Тысячи одновременных партий в одном цикле событий asyncio: память на партию, партий в секунду,
+# и партии с тайм-аутом хода, где один из игроков "думает" случайное время.
+# Вывод событий gameEvents на время замера отключен.
+# Запуск из корня проекта: python -m benchmarks.async_games --games 5000
+class ThinkingPlayer(ComputerPlayer):
+    def __init__(self, name, think: float) -> None:
+        super().__init__(name)
+        self.__think = think
+
+    async def move(self):
+        await asyncio.sleep(rnd.random() * self.__think)
+        return await super().move()
+
+
+def make_games(count: int, size: int, think: float = 0.0, move_timeout: float = None) -> list[AsyncGame]:
+    games = []
+    for i in range(count):
+        first = ThinkingPlayer(f"Комп {i}a", think) if think else ComputerPlayer(f"Комп {i}a")
+        games.append(AsyncGame(SeaBattleGameLogic(size, first, ComputerPlayer(f"Комп {i}b")), move_timeout))
+    return games
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Одновременные партии в асинхронном цикле игры")
+    parser.add_argument('--games', type=int, default=5000)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--think', type=float, default=0.004, help="максимальное время хода 'думающего' игрока, с")
+    parser.add_argument('--timeout', type=float, default=0.003, help="тайм-аут хода, с")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    rnd.seed(args.seed)
+
+    tracemalloc.start()
+    games = make_games(args.games, args.size)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{args.games} партий {args.size}x{args.size}: {memory / args.games / 1024:.1f} КиБ на партию")
+
+    start = time.perf_counter()
+    asyncio.run(play_games(games))
+    elapsed = time.perf_counter() - start
+    moves = sum(game.moves for game in games)
+    print(f"Без тайм-аутов: {elapsed:.2f} с, {args.games / elapsed:.0f} партий/с, {moves / elapsed:.0f} ходов/с")
+
+    games = make_games(args.games // 5, args.size, args.think, args.timeout)
+    start = time.perf_counter()
+    asyncio.run(play_games(games))
+    elapsed = time.perf_counter() - start
+    print(f"С тайм-аутом {args.timeout * 1e3:.0f} мс ({len(games)} партий): {elapsed:.2f} с, "
+          f"тайм-аутов {sum(game.timeouts for game in games)} из {sum(game.moves for game in games)} ходов")
@@ -0,0 +1,52 @@
+import argparse
+import time
+
+import gameEvents
+from gameBatch import BatchHuntShots, BatchRandomShots, BatchSimulation
+from gameSimulation import HeadlessSimulation
+from benchmarks.model import full_game
+
+
+# Пакетная симуляция против скалярных путей: партий в секунду SeaBattleGameLogic (ComputerPlayer),
+# HeadlessSimulation и BatchSimulation со случайной стратегией и с добиванием.
+# Вывод gameLogic на время замера отключен. Совпадение партий пакетного движка с HeadlessSimulation
+# и SeaBattleGameLogic проверяет tests/test_batch.py.
+# Запуск из корня проекта: python -m benchmarks.batch --games 50000
+def bench(func, games: int) -> float:
+    start = time.perf_counter()
+    func(games)
+    return games / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость пакетной симуляции партий")
+    parser.add_argument('--games', type=int, default=50000)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--batch', type=int, default=4096)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+
+    def logic_games(games: int) -> None:
+        for _ in range(games):
+            full_game(args.size)
+
+    def headless_games(games: int) -> None:
+        for _ in HeadlessSimulation(args.size).run(games, args.seed):
+            pass
+
+    def batch_games(make_strategy):
+        def play(games: int) -> None:
+            for _ in BatchSimulation(args.size, args.batch, make_strategy(), make_strategy()).run(games, args.seed):
+                pass
+        return play
+
+    base = bench(logic_games, max(1, args.games // 50))
+    print(f"Поле {args.size}x{args.size}")
+    print(f"SeaBattleGameLogic:       {base:8.0f} партий/с")
+    for name, func, games in [('HeadlessSimulation:', headless_games, args.games // 5),
+                              ('BatchSimulation random:', batch_games(BatchRandomShots), args.games),
+                              ('BatchSimulation hunt:', batch_games(BatchHuntShots), args.games)]:
+        rate = bench(func, games)
+        print(f"{name:<25} {rate:8.0f} партий/с ({rate / base:.1f}x)")
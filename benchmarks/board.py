@@ -0,0 +1,55 @@
+import argparse
+import random as rnd
+import time
+
+import bitBoard
+import gameEvents
+from gameLogic import Point, Ship, SeaBattleGameBoard, SeaBattleGameLogic
+from fleetPlacement import FleetPlacer, cell_to_xy
+
+
+# Микробенчмарк обработки выстрела разными реализациями игрового поля.
+# Каждое поле обстреливается целиком в случайном порядке; вывод событий gameEvents на время замера отключен,
+# чтобы мерить само поле, а не консоль.
+# Запуск из корня проекта: python -m benchmarks.board
+def make_fleet(size: int, rng) -> list[Ship]:
+    scale = max(1, (size // 10) ** 2)
+    quantity = {ship_size: n * scale for ship_size, n in SeaBattleGameLogic.Ships_Quantity.items()}
+    return [Ship([Point(*cell_to_xy(c, size)) for c in ship.body])
+            for ship in FleetPlacer(size, quantity, rng).place()]
+
+
+def bench(board_class, size: int, rounds: int, seed: int) -> float:
+    rng = rnd.Random(seed)
+    elapsed = 0.0
+    shots = 0
+    for _ in range(rounds):
+        board = board_class(size, make_fleet(size, rng))
+        cells = [Point(x, y) for x in range(1, size + 1) for y in range(1, size + 1)]
+        rng.shuffle(cells)
+        incoming_shot = board.incoming_shot
+        start = time.perf_counter()
+        for p in cells:
+            incoming_shot(p)
+        elapsed += time.perf_counter() - start
+        shots += len(cells)
+    return elapsed / shots
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость обработки выстрела по игровому полю")
+    parser.add_argument('--sizes', type=int, nargs='*', default=[6, 10, 100])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    backends = [('list', SeaBattleGameBoard), ('bits', bitBoard.BitGameBoard)]
+    if bitBoard.np is not None:
+        backends.append(('numpy', bitBoard.NumpyGameBoard))
+
+    gameEvents.use(gameEvents.NullSink())
+    for size in args.sizes:
+        rounds = max(1, 20000 // (size * size))
+        line = f"{size:>4}x{size:<4}"
+        for name, board_class in backends:
+            line += f"  {name}: {bench(board_class, size, rounds, args.seed) * 1e6:8.2f} мкс/выстрел"
+        print(line)
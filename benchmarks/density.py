@@ -0,0 +1,47 @@
+import argparse
+import time
+
+from gameSimulation import HeadlessSimulation, RandomShots
+from gameStrategies import DensityShots
+from gameTournament import PairStats
+
+
+# Стратегия "карта плотности" против случайной: среднее число выстрелов до победы
+# и время выбора хода. Запуск из корня проекта: python -m benchmarks.density --games 2000
+class TimedShots(DensityShots):
+    def __init__(self) -> None:
+        super().__init__()
+        self.moves = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def choose(self) -> int:
+        start = time.perf_counter()
+        cell = super().choose()
+        elapsed = time.perf_counter() - start
+        self.moves += 1
+        self.total += elapsed
+        self.worst = max(self.worst, elapsed)
+        return cell
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Карта плотности против случайной стрельбы")
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Поле {args.size}x{args.size}, партий: {args.games}")
+    for name, first, second in [('random - random', RandomShots(), RandomShots()),
+                                ('density - density', DensityShots(), DensityShots()),
+                                ('density - random', DensityShots(), RandomShots())]:
+        stats = PairStats()
+        for result in HeadlessSimulation(args.size, first, second).run(args.games, args.seed):
+            stats.add(result)
+        print(f"{name:<18}: {stats}")
+
+    timed = TimedShots()
+    for _ in HeadlessSimulation(args.size, timed, RandomShots()).run(args.games, args.seed):
+        pass
+    print(f"Выбор хода: в среднем {timed.total / timed.moves * 1e3:.3f} мс, максимум {timed.worst * 1e3:.3f} мс")
@@ -0,0 +1,73 @@
+import argparse
+import os
+import random as rnd
+import tempfile
+import time
+
+import gameEvents
+from gameLogic import ComputerPlayer, SeaBattleGameLogic
+from benchmarks.model import play
+
+
+# Партии в секунду с разными приемниками шины событий gameEvents: партии двух ComputerPlayer
+# через SeaBattleGameLogic. Консоль имитируется файлом os.devnull с построчной буферизацией (как терминал):
+# 'console 1' пишет каждое сообщение отдельно (как прежние print), 'console' - буфером строк.
+# Сначала сверка: журнал LogSink содержит ровно столько строк, сколько событий было отправлено.
+# Компьютер ходит без ожидания [Enter].
+# Запуск из корня проекта: python -m benchmarks.events --games 1000
+class CountSink(gameEvents.EventSink):
+    def __init__(self) -> None:
+        self.count = 0
+
+    def handle(self, kind: int, text: str, data) -> None:
+        self.count += 1
+
+
+def games_per_second(sink, games: int, size: int, seed: int) -> float:
+    gameEvents.use(sink)
+    rnd.seed(seed)
+    start = time.perf_counter()
+    for _ in range(games):
+        play(SeaBattleGameLogic(size, ComputerPlayer('Комп 1', pause=False), ComputerPlayer('Комп 2', pause=False)))
+    gameEvents.use()
+    elapsed = time.perf_counter() - start
+    sink.close()
+    return games / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Партии в секунду с разными приемниками событий")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'events.log')
+
+    counter = CountSink()
+    log = gameEvents.LogSink(path)
+    gameEvents.use(counter, log)
+    rnd.seed(args.seed)
+    for _ in range(10):
+        play(SeaBattleGameLogic(args.size, ComputerPlayer('Комп 1', pause=False),
+                                ComputerPlayer('Комп 2', pause=False)))
+    gameEvents.use()
+    log.close()
+    with open(path, encoding='utf-8') as f:
+        lines = sum(1 for _ in f)
+    os.remove(path)
+    print(f"сверка: событий {counter.count}, строк в журнале {lines}, расхождений {abs(counter.count - lines)}")
+
+    terminal = open(os.devnull, 'w', buffering=1)
+    sinks = [
+        ('null', lambda: gameEvents.NullSink()),
+        ('console 1', lambda: gameEvents.ConsoleSink(terminal, buffer_lines=1)),
+        ('console', lambda: gameEvents.ConsoleSink(terminal)),
+        ('log', lambda: gameEvents.LogSink(path)),
+    ]
+    print(f"Поле {args.size}x{args.size}, партий: {args.games}")
+    for name, make in sinks:
+        print(f"{name:<10}: {games_per_second(make(), args.games, args.size, args.seed):8.0f} партий/с")
+    terminal.close()
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
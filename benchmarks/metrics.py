@@ -0,0 +1,43 @@
+import argparse
+import random as rnd
+import time
+
+import gameEvents
+import gameMetrics
+from gameLogic import ComputerPlayer, SeaBattleGameBoard, SeaBattleGameLogic
+from benchmarks.model import play
+
+
+# Цена замеров gameMetrics: партии двух ComputerPlayer через SeaBattleGameLogic до включения замеров,
+# с включенными замерами и после их выключения. Вывод на время замера отключен, компьютер ходит без ожидания [Enter].
+# Запуск из корня проекта: python -m benchmarks.metrics --games 2000
+def games_per_second(games: int, size: int, seed: int) -> float:
+    rnd.seed(seed)
+    start = time.perf_counter()
+    for _ in range(games):
+        play(SeaBattleGameLogic(size, ComputerPlayer('Комп 1', pause=False), ComputerPlayer('Комп 2', pause=False)))
+    return games / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Цена замеров gameMetrics")
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    original = SeaBattleGameBoard.incoming_shot
+
+    before = games_per_second(args.games, args.size, args.seed)
+    gameMetrics.enable()
+    during = games_per_second(args.games, args.size, args.seed)
+    calls = {name: item['count'] for name, item in gameMetrics.snapshot().items()}
+    gameMetrics.disable()
+    after = games_per_second(args.games, args.size, args.seed)
+
+    print(f"Поле {args.size}x{args.size}, партий: {args.games}")
+    print(f"Замеры не включались: {before:8.0f} партий/с")
+    print(f"Замеры включены:      {during:8.0f} партий/с ({during / before - 1:+.1%}), вызовов: {calls}")
+    print(f"Замеры выключены:     {after:8.0f} партий/с ({after / before - 1:+.1%}), "
+          f"исходные методы восстановлены: {SeaBattleGameBoard.incoming_shot is original}")
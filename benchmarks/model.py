@@ -0,0 +1,58 @@
+import argparse
+import random as rnd
+import time
+import tracemalloc
+
+import gameEvents
+from gameLogic import ComputerPlayer, SeaBattleGameLogic
+
+
+# Замер времени и памяти модели Point/Ship: расстановка кораблей init_ships и полная партия
+# двух ComputerPlayer через SeaBattleGameLogic. Вывод на время замера отключен, компьютер ходит без ожидания [Enter].
+# Запуск из корня проекта: python -m benchmarks.model
+def play(logic: SeaBattleGameLogic):
+    while True:
+        for player in [logic.player1, logic.player2]:
+            while player.last_shot_success:
+                logic.process_event(player.get_move())
+                if player.is_winner:
+                    return player
+
+
+def init_ships(size: int) -> None:
+    ComputerPlayer('Комп').init_ships(size, SeaBattleGameLogic.Ships_Quantity)
+
+
+def full_game(size: int) -> None:
+    play(SeaBattleGameLogic(size, ComputerPlayer('Комп 1', pause=False), ComputerPlayer('Комп 2', pause=False)))
+
+
+def allocations(func, size: int) -> tuple[int, int]:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    func(size)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return peak, blocks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Время и память модели Point/Ship")
+    parser.add_argument('--sizes', type=int, nargs='*', default=[6, 10, 20])
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    rnd.seed(args.seed)
+    for size in args.sizes:
+        for name, func in [('init_ships', init_ships), ('партия', full_game)]:
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                func(size)
+            elapsed = (time.perf_counter() - start) / args.rounds
+            peak, blocks = allocations(func, size)
+            print(f"{size:>3}x{size:<3} {name:<10}: {elapsed * 1e3:8.3f} мс, "
+                  f"пик памяти {peak / 1024:8.1f} КиБ, осталось блоков {blocks}")
@@ -0,0 +1,70 @@
+import argparse
+import random as rnd
+import time
+
+from fleetPlacement import FleetPlacer
+from gameConfig import parse_fleet
+from gameLogic import SeaBattleGameLogic
+from gameSimulation import RandomShots, SimBoard
+from gameStrategies import DensityShots, MonteCarloShots
+
+
+# Стратегия Монте-Карло при разном размере пула расстановок: сколько выстрелов нужно, чтобы потопить
+# весь флот, и сколько длится выбор хода. Для сравнения - случайная стрельба и карта плотности.
+# "Из пула" - доля расстановок, доживших с прошлых ходов, от размера пула.
+# Запуск из корня проекта: python -m benchmarks.montecarlo --games 50 --samples 50 200 800
+def sink(strategy, size: int, fleet: dict, seed: int) -> tuple[int, list[float], list[int]]:
+    rng = rnd.Random(seed)
+    board = SimBoard(size, FleetPlacer(size, fleet, rng).place())
+    strategy.reset(size, fleet, board.shots, rng)
+    shots = 0
+    latencies = []
+    kept = []
+    while board.alive_ships_count:
+        if isinstance(strategy, MonteCarloShots):
+            kept.append(strategy.samples)
+        start = time.perf_counter()
+        cell = strategy.choose()
+        latencies.append(time.perf_counter() - start)
+        strategy.observe(cell, board.incoming_shot(cell))
+        shots += 1
+    return shots, latencies, kept
+
+
+def report(name: str, strategy, args, fleet: dict, target: int = 0) -> None:
+    shots = []
+    latencies = []
+    kept = []
+    for game in range(args.games):
+        n, times, pool = sink(strategy, args.size, fleet, args.seed + game)
+        shots.append(n)
+        latencies.extend(times)
+        kept.extend(pool[1:])
+    mean = sum(shots) / len(shots)
+    error = (sum((n - mean) ** 2 for n in shots) / len(shots)) ** 0.5 / len(shots) ** 0.5
+    line = (f"{name:<22}: выстрелов до победы {mean:6.2f} ± {error:4.2f}, ход в среднем "
+            f"{sum(latencies) / len(latencies) * 1e3:7.2f} мс, максимум {max(latencies) * 1e3:7.2f} мс")
+    if target and kept:
+        line += f", из пула {sum(kept) / len(kept) / target:5.1%}"
+    print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Стратегия Монте-Карло: выстрелы до победы и время хода")
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--fleet', type=str, default=None, help="флот, например 4:1,3:2,2:3,1:4")
+    parser.add_argument('--samples', type=int, nargs='*', default=[50, 200, 800])
+    parser.add_argument('--move-time', type=float, default=0.2, help="ограничение времени на ход, с")
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    fleet = parse_fleet(args.fleet) if args.fleet else SeaBattleGameLogic.Ships_Quantity
+    print(f"Поле {args.size}x{args.size}, флот {fleet}, партий: {args.games}, процессов: {args.workers}")
+    report('random', RandomShots(), args, fleet)
+    report('density', DensityShots(), args, fleet)
+    for samples in args.samples:
+        strategy = MonteCarloShots(samples, args.move_time, args.workers)
+        report(f'montecarlo {samples}', strategy, args, fleet, samples)
+        strategy.close()
@@ -0,0 +1,69 @@
+import argparse
+import random as rnd
+import time
+import tracemalloc
+
+import gameEvents
+from gameLogic import ComputerPlayer, MovePool, Point, SeaBattleGameLogic
+from benchmarks.model import play
+
+
+# Выбор случайного хода компьютера: прежний список всех Point с pop(i) по случайному индексу
+# против MovePool. Замеряется выбор всех клеток поля подряд, память пула сразу после создания
+# и полная партия двух ComputerPlayer (без расстановки флота). Вывод на время замера отключен,
+# компьютер ходит без ожидания [Enter].
+# Запуск из корня проекта: python -m benchmarks.moves --sizes 10 50 200
+def list_pool(size: int) -> list:
+    moves = []
+    for y in rnd.sample(range(size), size):
+        for x in rnd.sample(range(size), size):
+            moves.append(Point(x + 1, y + 1))
+    return moves
+
+
+def drain_list(size: int) -> None:
+    moves = list_pool(size)
+    while moves:
+        moves.pop(rnd.randint(0, len(moves) - 1))
+
+
+def drain_pool(size: int) -> None:
+    moves = MovePool(size * size)
+    while len(moves):
+        moves.pop()
+
+
+def timed(func, size: int) -> float:
+    start = time.perf_counter()
+    func(size)
+    return time.perf_counter() - start
+
+
+def memory(func, size: int) -> int:
+    tracemalloc.start()
+    pool = func(size)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del pool
+    return allocated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость выбора хода ComputerPlayer")
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10, 50, 200])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    rnd.seed(args.seed)
+    for size in args.sizes:
+        cells = size * size
+        old, new = timed(drain_list, size), timed(drain_pool, size)
+        print(f"{size:>4}x{size:<4} все клетки: список {old / cells * 1e6:7.2f} мкс/ход, "
+              f"MovePool {new / cells * 1e6:5.2f} мкс/ход; память при создании: "
+              f"список {memory(list_pool, size) / 1024:8.1f} КиБ, MovePool {memory(MovePool, cells) / 1024:.1f} КиБ")
+        # расстановка флота (и построение таблиц положений для нового размера) в замер партии не входит
+        logic = SeaBattleGameLogic(size, ComputerPlayer('Комп 1', pause=False), ComputerPlayer('Комп 2', pause=False))
+        start = time.perf_counter()
+        play(logic)
+        print(f"{'':>9} партия ComputerPlayer: {(time.perf_counter() - start) * 1e3:.1f} мс")
@@ -0,0 +1,62 @@
+import argparse
+import os
+import tempfile
+import time
+
+from gameConfig import parse_fleet
+from gameLogic import SeaBattleGameLogic
+from gameRecord import LoggedShots
+from gameStrategies import DensityShots, ExactShots, MonteCarloShots
+from openingBook import BookShots, OpeningBook, book_name, build, write_book
+from benchmarks.montecarlo import sink
+
+
+# Книга дебютов: время выбора первых depth ходов с книгой и без нее (живой расчет). ExactShots
+# без книги считается с выключенным кэшем вероятностей, т.е. каждый ход заново, как в новой партии.
+# Сначала сверка: ходы из книги должны совпасть с ходами ExactShots в тех же партиях.
+# Если файла книги нет, он строится (с замером времени построения).
+# Запуск из корня проекта: python -m benchmarks.opening --size 10 --depth 4
+def opening_latency(strategy, args, fleet: dict) -> tuple[float, list[list[int]]]:
+    latencies = []
+    moves = []
+    for game in range(args.games):
+        log = []
+        _, times, _ = sink(LoggedShots(strategy, log), args.size, fleet, args.seed + game)
+        latencies.extend(times[:args.depth])
+        moves.append(log[:args.depth])
+    return sum(latencies) / len(latencies), moves
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Время первых ходов с книгой дебютов и без нее")
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--fleet', type=str, default=None, help="флот, например 4:1,3:2,2:3,1:4")
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--book', type=str, default=None, help="файл книги (по умолчанию - во временном каталоге)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    fleet = parse_fleet(args.fleet) if args.fleet else dict(SeaBattleGameLogic.Ships_Quantity)
+    path = args.book if args.book else os.path.join(tempfile.gettempdir(), book_name(args.size, fleet))
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        write_book(path, args.size, fleet, args.depth, build(args.size, fleet, args.depth, args.workers))
+        print(f"Книга {path} построена за {time.perf_counter() - start:.1f} с")
+
+    with OpeningBook(path) as book:
+        args.depth = min(args.depth, book.depth)
+        print(f"Поле {args.size}x{args.size}, флот {fleet}, книга на {book.depth} ходов "
+              f"({os.path.getsize(path)} байт), партий: {args.games}, замер первых {args.depth} ходов")
+        exact = ExactShots(cache_size=0)
+        _, live_moves = opening_latency(exact, args, fleet)       # прогрев: граф переходов PlacementCounter
+        live, live_moves = opening_latency(exact, args, fleet)
+        booked, book_moves = opening_latency(BookShots(exact, book), args, fleet)
+        mismatches = sum(a != b for a, b in zip(live_moves, book_moves))
+        print(f"сверка с ExactShots: {mismatches} расхождений")
+        print(f"{'exact':<12}: без книги {live * 1e3:9.3f} мс/ход, с книгой {booked * 1e3:7.3f} мс/ход")
+        for name, strategy in [('montecarlo', MonteCarloShots()), ('density', DensityShots())]:
+            live, _ = opening_latency(strategy, args, fleet)
+            booked, _ = opening_latency(BookShots(strategy, book), args, fleet)
+            print(f"{name:<12}: без книги {live * 1e3:9.3f} мс/ход, с книгой {booked * 1e3:7.3f} мс/ход")
@@ -0,0 +1,33 @@
+import argparse
+import random as rnd
+import time
+
+from fleetPlacement import FleetPlacer
+from gameLogic import SeaBattleGameLogic
+
+
+# Скорость массовой генерации расстановок флота (расстановок в секунду).
+# Запуск из корня проекта: python -m benchmarks.placement --fleets 100000
+Configurations = [
+    ('6x6, стандартный флот', 6, SeaBattleGameLogic.Ships_Quantity),
+    ('10x10, стандартный флот', 10, SeaBattleGameLogic.Ships_Quantity),
+    ('10x10, классический флот', 10, {4: 1, 3: 2, 2: 3, 1: 4}),
+    ('6x6, плотный флот', 6, {3: 2, 2: 3, 1: 4}),
+    ('100x100, 700 кораблей', 100, {3: 100, 2: 200, 1: 400}),
+]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость генерации расстановок флота")
+    parser.add_argument('--fleets', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for name, size, quantity in Configurations:
+        placer = FleetPlacer(size, quantity, rnd.Random(args.seed))
+        count = max(10, args.fleets // placer.ships_count * 7)
+        placer.place()              # построение таблиц положений не входит в замер
+        start = time.perf_counter()
+        for _ in placer.generate(count):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"{name:<26}: {count / elapsed:>9.0f} расстановок/с")
@@ -0,0 +1,51 @@
+import argparse
+import random as rnd
+import time
+
+from fleetPlacement import FleetPlacer
+from gameLogic import SeaBattleGameLogic
+from gameSimulation import SimBoard
+from placementCount import PlacementCounter
+
+
+# Точный подсчет расстановок и вероятностей занятости клеток: время первого вызова
+# (с построением графа переходов), подсчета и вероятностей по наблюдению из середины партии
+# и доля попаданий в кэш. Запуск из корня проекта: python -m benchmarks.placement_count
+Configurations = [
+    ('6x6, стандартный флот', 6, SeaBattleGameLogic.Ships_Quantity),
+    ('10x10, стандартный флот', 10, SeaBattleGameLogic.Ships_Quantity),
+    ('10x10, классический флот', 10, {4: 1, 3: 2, 2: 3, 1: 4}),
+]
+
+
+# Наблюдение после shots случайных выстрелов по случайной расстановке
+def observation(size: int, quantity: dict, shots: int, rng) -> bytes:
+    board = SimBoard(size, FleetPlacer(size, quantity, rng).place())
+    for cell in rng.sample(range(size * size), shots):
+        board.incoming_shot(cell)
+    return bytes(board.shots)
+
+
+def timed(function, *args) -> tuple:
+    start = time.perf_counter()
+    ret = function(*args)
+    return ret, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость точного подсчета расстановок флота")
+    parser.add_argument('--shots', type=float, default=0.3, help="доля обстрелянных клеток в наблюдении")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for name, size, quantity in Configurations:
+        rng = rnd.Random(args.seed)
+        counter = PlacementCounter(size, quantity)
+        total, first = timed(counter.count)
+        seen = observation(size, quantity, int(size * size * args.shots), rng)
+        _, count_time = timed(counter.count, seen)
+        _, probabilities_time = timed(counter.probabilities, seen)
+        _, cached_time = timed(counter.probabilities, seen)
+        print(f"{name}: {total} расстановок, первый вызов {first:.2f} с, "
+              f"подсчет {count_time:.2f} с, вероятности {probabilities_time:.2f} с, "
+              f"из кэша {cached_time * 1e6:.0f} мкс, кэш: {counter.hits} попаданий / {counter.misses} промахов")
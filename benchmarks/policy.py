@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import random as rnd
+import time
+
+import numpy as np
+
+import gameEvents
+from gameAsync import AsyncGame, play_games
+from gameLogic import SeaBattleGameLogic
+from gamePolicy import PolicyBatcher, PolicyModel, PolicyPlayer, self_play
+
+
+# Игрок с политикой: ходов в секунду при пакетах 1, 64 и 1024 наблюдений.
+# "модель" - только проход сети (encode + forward + выбор клетки) по пакету наблюдений из самоигры;
+# "партии" - столько же одновременных партий PolicyPlayer против PolicyPlayer в цикле asyncio:
+# с общей очередью PolicyBatcher (один проход сети на тик) и без нее (проход сети на каждый ход).
+# Сначала сверка: выбор клеток пакетом совпадает с выбором по одному наблюдению.
+# Без --weights веса модели случайные (скорость от весов не зависит).
+# Запуск из корня проекта: python -m benchmarks.policy --size 10 --batches 1 64 1024
+def model_rate(model: PolicyModel, marks: np.ndarray, batch: int, moves: int) -> float:
+    rounds = max(1, moves // batch)
+    start = time.perf_counter()
+    for i in range(rounds):
+        first = i * batch % (len(marks) - batch + 1)
+        model.choose(marks[first:first + batch])
+    return rounds * batch / (time.perf_counter() - start)
+
+
+def games_rate(model: PolicyModel, size: int, games: int, batched: bool, seed: int) -> tuple[float, float]:
+    rnd.seed(seed)
+    batcher = PolicyBatcher(model, max_batch=max(games, 1)) if batched else None
+    runs = [AsyncGame(SeaBattleGameLogic(size, PolicyPlayer("Политика 1", model, batcher),
+                                         PolicyPlayer("Политика 2", model, batcher))) for _ in range(games)]
+    start = time.perf_counter()
+    asyncio.run(play_games(runs))
+    elapsed = time.perf_counter() - start
+    moves = sum(game.moves for game in runs)
+    return moves / elapsed, batcher.moves / batcher.ticks if batched else 1.0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость игрока с политикой при пакетном выборе хода")
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--batches', type=int, nargs='*', default=[1, 64, 1024])
+    parser.add_argument('--moves', type=int, default=20000, help="ходов в замере модели")
+    parser.add_argument('--weights', type=str, default=None, help="файл весов .npz (см. gamePolicy)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    model = PolicyModel.load(args.weights) if args.weights else PolicyModel.create(args.size, seed=args.seed)
+    size = model.board_size
+    marks, _, _ = self_play(model, size, SeaBattleGameLogic.Ships_Quantity, 64, args.seed, epsilon=0.5)
+    sample = marks[:1024]
+    one_by_one = np.array([model.choose(row[None])[0] for row in sample])
+    print(f"сверка: {int((model.choose(sample) != one_by_one).sum())} расхождений на {len(sample)} наблюдениях")
+
+    print(f"Поле {size}x{size}, слои {[w.shape for w, _ in model.layers]}")
+    for batch in args.batches:
+        rate = model_rate(model, marks, batch, args.moves)
+        batched, mean_batch = games_rate(model, size, batch, True, args.seed)
+        single, _ = games_rate(model, size, batch, False, args.seed)
+        print(f"пакет {batch:>5}: модель {rate:10.0f} ходов/с; партии с очередью {batched:8.0f} ходов/с "
+              f"(в среднем {mean_batch:6.1f} запросов на тик), без очереди {single:8.0f} ходов/с")
@@ -0,0 +1,71 @@
+import argparse
+import os
+import random as rnd
+import tempfile
+import time
+
+import gameEvents
+from gameLogic import GameEvent
+from gameRecord import RecordReader, RecordWriter, record_simulation, replay
+
+
+# Записи партий: скорость записи из безголовой симуляции, размер записи на партию и на выстрел,
+# потоковое чтение, переход к случайной партии по индексу и воспроизведение через SeaBattleGameLogic
+# с проверкой, что победитель совпал с записанным.
+# Вывод событий gameEvents на время замера отключен.
+# Запуск из корня проекта: python -m benchmarks.records --games 100000
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Запись, чтение и воспроизведение партий")
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--replay', type=int, default=2000, help="сколько партий воспроизвести")
+    parser.add_argument('--lookups', type=int, default=100000, help="сколько переходов к случайной партии")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    path = os.path.join(tempfile.mkdtemp(), 'games.sbr')
+
+    start = time.perf_counter()
+    with RecordWriter(path) as writer:
+        record_simulation(writer, args.games, args.size, base_seed=args.seed)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+    print(f"Запись {args.games} партий {args.size}x{args.size} (вместе с симуляцией): {elapsed:.2f} с, "
+          f"{args.games / elapsed:.0f} партий/с")
+
+    with RecordReader(path) as reader:
+        start = time.perf_counter()
+        shots = sum(len(record.shots) for record in reader)
+        elapsed = time.perf_counter() - start
+        print(f"Размер: {size / 2 ** 20:.1f} МиБ, {size / args.games:.0f} байт на партию, "
+              f"{size / shots:.2f} байт на выстрел")
+        print(f"Потоковое чтение: {elapsed:.2f} с, {args.games / elapsed:.0f} партий/с")
+
+        rng = rnd.Random(args.seed)
+        numbers = [rng.randrange(len(reader)) for _ in range(args.lookups)]
+        start = time.perf_counter()
+        for n in numbers:
+            reader[n]
+        elapsed = time.perf_counter() - start
+        print(f"Переход к случайной партии: {elapsed / args.lookups * 1e6:.1f} мкс")
+
+        start = time.perf_counter()
+        mismatches = 0
+        for n in range(min(args.replay, len(reader))):
+            record = reader[n]
+            last = None
+            for last in replay(record):
+                pass
+            winner = 0
+            if last is not None and last.type == GameEvent.Event_Win:
+                winner = 1 if last.player.name == "Игрок 1" else 2
+            mismatches += winner != record.winner
+        elapsed = time.perf_counter() - start
+        count = min(args.replay, len(reader))
+        print(f"Воспроизведение {count} партий: {elapsed:.2f} с, {count / elapsed:.0f} партий/с, "
+              f"расхождений победителя: {mismatches}")
+
+    os.remove(path + '.idx')
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
@@ -0,0 +1,54 @@
+import argparse
+import io
+import random as rnd
+import time
+
+import gameEvents
+from gameLogic import GameEvent, Point, SeaBattleGameLogic, ComputerPlayer
+from main import ConsoleGameGui
+
+
+# Время перерисовки консольного интерфейса после выстрела: полный кадр (первый вызов draw)
+# и обновление буфера после каждого выстрела - с выводом всего кадра одной записью и в режиме in_place.
+# Вывод идет в io.StringIO, события gameEvents на время замера отключены.
+# Запуск из корня проекта: python -m benchmarks.render --sizes 10 50
+def bench(size: int, in_place: bool, seed: int) -> tuple[float, float, float]:
+    rnd.seed(seed)
+    player1 = ComputerPlayer("Комп 1")
+    player2 = ComputerPlayer("Комп 2")
+    out = io.StringIO()
+    gui = ConsoleGameGui(size, SeaBattleGameLogic(size, player1, player2), in_place=in_place, out=out)
+    start = time.perf_counter()
+    gui.draw()
+    full = time.perf_counter() - start
+
+    cells = [Point(x, y) for x in range(1, size + 1) for y in range(1, size + 1)]
+    elapsed = 0.0
+    worst = 0.0
+    draws = 0
+    for player in [player1, player2]:
+        for shot in rnd.sample(cells, len(cells)):
+            gui.process_event(GameEvent(GameEvent.Event_Shot, player, shot))
+            out.seek(0)
+            out.truncate()
+            start = time.perf_counter()
+            gui.draw()
+            step = time.perf_counter() - start
+            elapsed += step
+            worst = max(worst, step)
+            draws += 1
+    return full, elapsed / draws, worst
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость перерисовки консольного интерфейса")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    for size in args.sizes:
+        for in_place in [False, True]:
+            full, mean, worst = bench(size, in_place, args.seed)
+            print(f"{size}x{size}, {'in_place' if in_place else 'кадр целиком'}: полный кадр {full * 1e3:.3f} мс, "
+                  f"после выстрела в среднем {mean * 1e3:.3f} мс, максимум {worst * 1e3:.3f} мс")
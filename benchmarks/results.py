@@ -0,0 +1,159 @@
+import argparse
+import itertools
+import os
+import random as rnd
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import gameEvents
+from gameConfig import parse_fleet
+from gameLogic import SeaBattleGameLogic
+from gameResults import GameRow, ResultStore, ResultWriter, connect, row_from_logic, row_from_result
+from gameSimulation import simulate
+from play import make_strategy, play_game
+
+
+# Хранилище результатов: скорость потоковой записи и задержка аналитических запросов.
+# Сначала сверка на небольшой базе: настоящие партии (HeadlessSimulation и SeaBattleGameLogic) читаются
+# обратно без изменений, доля побед и распределение выстрелов из базы совпадают с подсчетом по строкам,
+# а партия play.py, прочитанная из базы, переигрывается по своему зерну с тем же итогом.
+# Сбой записи в фоновом потоке выбрасывается из close(), и поток при этом останавливается.
+# Затем в новую базу пишутся rows синтетических партий (пары типов игроков, размеры полей 6, 10 и 20,
+# случайные победители и выстрелы) через ResultWriter - массовой загрузкой (bulk, индексы строятся
+# при закрытии) или с --stream с индексами: строк в секунду всего и сколько времени симуляция ждала
+# в add() и при закрытии (запись идет в фоновом потоке). После записи - медиана задержки запросов.
+# База создается во временном каталоге и удаляется (если не задан --db).
+# Запуск из корня проекта: python -m benchmarks.results --rows 10000000
+Types = ['computer', 'random', 'density', 'montecarlo', 'exact']
+Fleets = {6: '3:1,2:2,1:4', 10: '4:1,3:2,2:3,1:4', 20: '5:1,4:2,3:3,2:4,1:5'}
+Cells = {6: 10, 10: 20, 20: 35}
+
+
+def synthetic_rows(count: int, seed: int):
+    gen = rnd.Random(seed)
+    sizes = list(Fleets)
+    for i in range(count):
+        size = sizes[i % len(sizes)]
+        player1 = Types[gen.randrange(len(Types))]
+        player2 = Types[gen.randrange(len(Types))]
+        winner = 1 if gen.random() < 0.5 else 2
+        cells = Cells[size]
+        shots = gen.randint(cells, size * size)
+        other = gen.randint(cells // 2, shots)
+        yield GameRow(player1, player2, size, Fleets[size], i, winner,
+                      shots if winner == 1 else other, other if winner == 1 else shots, None)
+
+
+def check(path: str) -> int:
+    rnd.seed(0)
+    rows = [row_from_result(result, 'random', 'random', 10, SeaBattleGameLogic.Ships_Quantity)
+            for result in simulate(200, 10, base_seed=0)]
+    kinds = ['density', 'computer']
+    strategies = [make_strategy(kind) for kind in kinds]
+    for seed in range(100, 120):
+        logic, _ = play_game(kinds, strategies, 6, SeaBattleGameLogic.Ships_Quantity, seed, True)
+        rows.append(row_from_logic(logic, seed, *kinds))
+    rows.extend(synthetic_rows(5000, 1))
+    with ResultWriter(path, batch=1000) as writer:
+        writer.add_many(rows)
+    mismatches = 0
+    with ResultStore(path) as store:
+        stored = store.games(limit=len(rows) + 1)
+        mismatches += sum(a != b for a, b in zip(rows, stored)) + abs(len(rows) - len(stored))
+        games = Counter(row[:4] for row in rows)
+        wins = Counter(row[:4] for row in rows if row.winner == 1)
+        expected = sorted((*key, n, wins[key]) for key, n in games.items())
+        mismatches += sorted(store.win_rates()) != expected
+        for size in {row.board_size for row in rows}:
+            shots = Counter(row.shots1 if row.winner == 1 else row.shots2 for row in rows if row.board_size == size)
+            mismatches += store.shots_distribution(size) != sorted(shots.items())
+        density = Counter(row.shots1 if row.winner == 1 else row.shots2 for row in rows if row.board_size == 10
+                          and (row.player1 if row.winner == 1 else row.player2) == 'density')
+        mismatches += store.shots_distribution(10, 'density') != sorted(density.items())
+        # партия из базы переигрывается по зерну в другом порядке партий
+        row = store.games(*kinds, seed=110)[0]
+        logic, _ = play_game(kinds, [make_strategy(kind) for kind in kinds], row.board_size,
+                             parse_fleet(row.fleet), row.seed, True)
+        mismatches += row_from_logic(logic, row.seed, *kinds) != row
+    return mismatches
+
+
+# Сбой записи в фоновом потоке (триггер отклоняет строку с зерном -1): close() выбрасывает ошибку
+# и останавливает поток, даже если строки в add() продолжали поступать. Возвращает количество нарушений
+def check_failure(path: str) -> int:
+    connection = connect(path)
+    connection.execute("CREATE TRIGGER fail BEFORE INSERT ON results WHEN NEW.seed = -1 "
+                       "BEGIN SELECT RAISE(ABORT, 'сбой записи'); END")
+    connection.close()
+    writer = ResultWriter(path, batch=10, max_pending=1)
+    rows = list(synthetic_rows(100, 2))
+    rows[15] = rows[15]._replace(seed=-1)
+    failed = False
+    try:
+        for row in rows:
+            writer.add(row)
+        writer.close()
+    except sqlite3.Error:
+        try:
+            writer.close()
+        except sqlite3.Error:
+            failed = True
+    alive = any(thread.name == 'ResultWriter' for thread in threading.enumerate())
+    return (not failed) + alive
+
+
+def latency(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость записи и запросов хранилища результатов")
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--batch', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--stream', action='store_true', help="писать с индексами (без bulk)")
+    parser.add_argument('--db', type=str, default=None, help="файл базы (по умолчанию временный)")
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"сверка: {check(os.path.join(directory, 'check.db'))} расхождений, "
+              f"сбой записи: {check_failure(os.path.join(directory, 'failure.db'))} нарушений")
+
+        path = args.db if args.db else os.path.join(directory, 'results.db')
+        blocked = 0.0
+        start = time.perf_counter()
+        rows = synthetic_rows(args.rows, 0)
+        with ResultWriter(path, batch=args.batch, bulk=not args.stream) as writer:
+            for _ in range(0, args.rows, args.batch):
+                chunk = list(itertools.islice(rows, args.batch))
+                before = time.perf_counter()
+                writer.add_many(chunk)
+                blocked += time.perf_counter() - before
+            before = time.perf_counter()
+        blocked += time.perf_counter() - before
+        elapsed = time.perf_counter() - start
+        print(f"запись {args.rows} строк: {elapsed:.1f} с, {args.rows / elapsed:.0f} строк/с, "
+              f"ожидание в add {blocked:.1f} с (с закрытием), база {os.path.getsize(path) / 2 ** 20:.0f} МБ")
+
+        with ResultStore(path) as store:
+            queries = [
+                ('доля побед по парам', lambda: store.win_rates()),
+                ('доля побед, поле 10', lambda: store.win_rates(10)),
+                ('выстрелы до победы, поле 6', lambda: store.shots_distribution(6)),
+                ('выстрелы до победы, поле 20', lambda: store.shots_distribution(20)),
+                ('... только density, поле 10', lambda: store.shots_distribution(10, 'density')),
+                ('партия по зерну', lambda: store.games(seed=args.rows // 2)),
+                ('партии пары, 100 строк', lambda: store.games('density', 'exact', 10)),
+            ]
+            for name, query in queries:
+                print(f"{name:<30}: {latency(query, args.repeat) * 1e3:10.2f} мс")
@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import random as rnd
+import socket
+import subprocess
+import sys
+import time
+
+from gameServer import (Msg_Start, Msg_Turn, Msg_Result, Msg_Over, Mode_Match, Mode_Computer,
+                        encode_hello, encode_move, read_server_message)
+
+
+# Нагрузочный клиент сервера игры: idle соединений, которые попадают в пары и не ходят,
+# и active клиентов, играющих против сервера без пауз. Выводит время ответа на выстрел
+# (от отправки Msg_Shot до получения Msg_Result своего выстрела) - p50 и p99, выстрелов в секунду
+# и память процесса сервера на одну сессию.
+# Без --port сервер запускается в отдельном процессе на свободном порту.
+# Запуск из корня проекта: python -m benchmarks.server_load --idle 10000 --active 1000
+def server_memory(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: list[float], p: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+async def open_idle(host: str, port: int, count: int, batch: int = 500) -> list:
+    async def connect(i: int):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(encode_hello(Mode_Match, f"idle {i}"))
+        return writer
+
+    writers = []
+    for start in range(0, count, batch):
+        writers.extend(await asyncio.gather(*(connect(i) for i in range(start, min(count, start + batch)))))
+    return writers
+
+
+async def play_active(host: str, port: int, name: str, deadline: float, latencies: list, rng) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    games = 0
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(encode_hello(Mode_Computer, name))
+            cells = []
+            sent = 0.0
+            while True:
+                kind, data = await read_server_message(reader)
+                if kind == Msg_Start:
+                    size = data[0]
+                    cells = [(x, y) for x in range(1, size + 1) for y in range(1, size + 1)]
+                    rng.shuffle(cells)
+                elif kind == Msg_Turn:
+                    if time.perf_counter() >= deadline:
+                        writer.write(encode_move(data, quit_game=True))
+                        return games
+                    sent = time.perf_counter()
+                    writer.write(encode_move(data, *cells.pop()))
+                elif kind == Msg_Result and data[0] == 0:
+                    latencies.append(time.perf_counter() - sent)
+                elif kind == Msg_Over:
+                    games += 1
+                    break
+    finally:
+        writer.close()
+    return games
+
+
+async def main(args, server_pid: int) -> None:
+    memory = server_memory(server_pid) if server_pid else 0
+    start = time.perf_counter()
+    idle = await open_idle(args.host, args.port, args.idle)
+    await asyncio.sleep(1.0)
+    print(f"idle соединений: {len(idle)} за {time.perf_counter() - start:.1f} с")
+    if server_pid:
+        idle_memory = server_memory(server_pid)
+        print(f"Память сервера: {idle_memory / 2 ** 20:.1f} МиБ, "
+              f"{(idle_memory - memory) / max(1, args.idle) / 1024:.1f} КиБ на idle соединение")
+
+    latencies = []
+    deadline = time.perf_counter() + args.duration
+    rng = rnd.Random(args.seed)
+    start = time.perf_counter()
+    tasks = []
+    for i in range(args.active):
+        tasks.append(asyncio.create_task(play_active(args.host, args.port, f"active {i}", deadline, latencies,
+                                                     rnd.Random(rng.random()))))
+        if i % 100 == 99:
+            await asyncio.sleep(0)
+    await asyncio.sleep(args.duration / 2)
+    if server_pid:
+        print(f"Память сервера при {args.active} активных сессиях: {server_memory(server_pid) / 2 ** 20:.1f} МиБ")
+    games = sum(await asyncio.gather(*tasks))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"active клиентов: {args.active}, партий: {games}, выстрелов: {len(latencies)} "
+          f"({len(latencies) / elapsed:.0f}/с)")
+    print(f"Время ответа на выстрел: p50 {percentile(latencies, 0.5) * 1e3:.2f} мс, "
+          f"p99 {percentile(latencies, 0.99) * 1e3:.2f} мс")
+    for writer in idle:
+        writer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный клиент сервера игры")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help="порт уже запущенного сервера")
+    parser.add_argument('--idle', type=int, default=10000)
+    parser.add_argument('--active', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=20.0, help="длительность активной нагрузки, с")
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if args.port is None:
+        args.port = free_port()
+        server = subprocess.Popen([sys.executable, 'gameServer.py', '--host', args.host, '--port', str(args.port),
+                                   '--size', str(args.size)], stdout=subprocess.PIPE, text=True)
+        print(server.stdout.readline().strip())
+    try:
+        asyncio.run(main(args, server.pid if server else 0))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
@@ -0,0 +1,44 @@
+import argparse
+import random as rnd
+import time
+
+import gameEvents
+from gameLogic import ComputerPlayer, SeaBattleGameBoard, SeaBattleGameLogic, fleet_error, random_fleet
+
+
+# Подготовка партии на больших полях: случайная расстановка флота, проверка расстановки
+# (состав флота, границы, расстояние между кораблями - по индексу занятости) и полная подготовка
+# SeaBattleGameLogic с двумя ComputerPlayer. Флот - стандартный, умноженный на (size // 10) ** 2,
+# т.е. плотность флота одна и та же. Время проверки - построение поля с кораблями минус построение
+# пустого поля; в пересчете на клетку флота оно не должно расти с размером поля.
+# Запуск из корня проекта: python -m benchmarks.setup --sizes 10 100 300 1000
+def timed(func, *args):
+    start = time.perf_counter()
+    ret = func(*args)
+    return time.perf_counter() - start, ret
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Подготовка партии на больших полях")
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10, 100, 300, 1000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    rnd.seed(args.seed)
+    for size in args.sizes:
+        scale = max(1, (size // 10) ** 2)
+        fleet = {ship_size: n * scale for ship_size, n in SeaBattleGameLogic.Ships_Quantity.items()}
+        placing, ships = timed(random_fleet, size, fleet)
+        cells = sum(ship.size for ship in ships)
+        empty, _ = timed(SeaBattleGameBoard, size, [])
+        full, board = timed(SeaBattleGameBoard, size, ships)
+        counting, error = timed(fleet_error, ships, fleet)
+        assert board.alive_ships_count == len(ships) and not error
+        validation = full - empty + counting
+        setup, _ = timed(SeaBattleGameLogic, size, ComputerPlayer('Комп 1'), ComputerPlayer('Комп 2'),
+                         SeaBattleGameBoard, fleet)
+        print(f"{size:>4}x{size:<4} кораблей {len(ships):>6}, клеток флота {cells:>7}: "
+              f"расстановка {placing * 1e3:8.1f} мс, проверка {validation * 1e3:7.1f} мс "
+              f"({validation / cells * 1e6:.2f} мкс/клетку), пустое поле {empty * 1e3:6.1f} мс, "
+              f"подготовка партии {setup * 1e3:8.1f} мс")
@@ -0,0 +1,25 @@
+import argparse
+import time
+
+from gameSimulation import HeadlessSimulation
+
+
+# Замер скорости безголовой симуляции: партий в секунду на одном ядре
+# Запуск из корня проекта: python -m benchmarks.simulation --games 20000 --size 10
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость безголовой симуляции партий")
+    parser.add_argument('--games', type=int, default=20000)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sim = HeadlessSimulation(args.size)
+    start = time.perf_counter()
+    total_shots = 0
+    for result in sim.run(args.games, args.seed):
+        total_shots += result.shots1 + result.shots2
+    elapsed = time.perf_counter() - start
+
+    print(f"Поле {args.size}x{args.size}, партий: {args.games}")
+    print(f"Время: {elapsed:.3f} с, партий/с: {args.games / elapsed:.0f}, "
+          f"выстрелов за партию: {total_shots / args.games:.1f}")
@@ -0,0 +1,71 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+# Холодный старт play.py: время процесса от запуска до конца одной партии без вывода (--headless)
+# против пустого запуска интерпретатора, и разбор python -X importtime: какие модули загружаются
+# при старте и сколько времени занимает каждый модуль верхнего уровня. Тяжелые подсистемы (стратегии,
+# сервер, numpy, asyncio) при партии двух компьютеров со случайной стрельбой загружаться не должны.
+# Перед замером кэш байт-кода (__pycache__) обновляется пробным запуском.
+# Запуск из корня проекта: python -m benchmarks.startup --runs 20
+Heavy_Modules = ['numpy', 'asyncio', 'multiprocessing', 'gameStrategies', 'gameServer', 'gameAsync', 'main',
+                 'cProfile', 'json']
+Target = 0.030
+
+
+def run_time(command: list[str], runs: int, env: dict) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, env=env, check=True)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2]
+
+
+# Модули верхнего уровня (импортированные не из других модулей) и их суммарное время, с
+def import_times(command: list[str], env: dict) -> dict:
+    stderr = subprocess.run(command[:1] + ['-X', 'importtime'] + command[1:], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, env=env, text=True, check=True).stderr
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules[name.rstrip()] = int(cumulative) / 1e6
+    return modules
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Холодный старт play.py")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    game = [sys.executable, 'play.py', '--headless', '--seed', '0']
+    subprocess.run(game, stdout=subprocess.DEVNULL, env=env, check=True)
+
+    empty = run_time([sys.executable, '-c', 'pass'], args.runs, env)
+    results = [
+        ('play.py --headless', run_time(game, args.runs, env)),
+        ('... --size 10, флот 4:1,3:2,2:3,1:4', run_time(game + ['--size', '10', '--fleet', '4:1,3:2,2:3,1:4'],
+                                                          args.runs, env)),
+        ('... --player2 density', run_time(game + ['--player2', 'density'], args.runs, env)),
+    ]
+    print(f"{'пустой интерпретатор':<36}: {empty * 1e3:6.1f} мс (медиана {args.runs} запусков)")
+    for name, elapsed in results:
+        print(f"{name:<36}: {elapsed * 1e3:6.1f} мс, цель {Target * 1e3:.0f} мс: "
+              f"{'да' if elapsed < Target else 'нет'}")
+
+    modules = import_times(game, env)
+    top = [(name.strip(), seconds) for name, seconds in modules.items() if not name.startswith('  ')]
+    print(f"импорт при старте: {len(modules)} модулей, модули верхнего уровня {sum(s for _, s in top) * 1e3:.1f} мс")
+    for name, seconds in sorted(top, key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<28}: {seconds * 1e3:6.2f} мс")
+    loaded = [name for name in Heavy_Modules if any(m.strip() == name for m in modules)]
+    print(f"тяжелые модули при старте: {', '.join(loaded) if loaded else 'нет'}")
@@ -0,0 +1,63 @@
+import argparse
+import copy
+import random as rnd
+import time
+
+import gameEvents
+from gameLogic import ComputerPlayer, GameEvent, SeaBattleGameBoard, SeaBattleGameLogic
+from gameState import restore, snapshot
+from benchmarks.model import play
+
+
+# Снимки партии gameState против copy.deepcopy(SeaBattleGameLogic): снятие и восстановление состояния,
+# ветка и розыгрыш до конца партии из середины. Совпадение ветки и восстановленной партии с живой
+# проверяет tests/test_state.py. Вывод на время замера отключен, компьютер ходит без ожидания [Enter].
+# Запуск из корня проекта: python -m benchmarks.state --size 10
+def current_player(logic: SeaBattleGameLogic):
+    return logic.player1 if logic.player1.last_shot_success else logic.player2
+
+
+# Партия, сыгранная до середины: shots выстрелов или до победы
+def midgame(size: int, board_class, shots: int) -> SeaBattleGameLogic:
+    logic = SeaBattleGameLogic(size, ComputerPlayer('Комп 1', pause=False), ComputerPlayer('Комп 2', pause=False),
+                               board_class)
+    for _ in range(shots):
+        player = current_player(logic)
+        logic.process_event(GameEvent(GameEvent.Event_Shot, player, player.choose_shot()))
+        if player.is_winner:
+            break
+    return logic
+
+
+def timed(func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Снимки партии против copy.deepcopy")
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    gameEvents.use(gameEvents.NullSink())
+    rnd.seed(args.seed)
+    rng = rnd.Random(args.seed)
+
+    logic = midgame(args.size, SeaBattleGameBoard, args.size * args.size // 2)
+    state = snapshot(logic)
+    rounds = args.rounds
+    results = [
+        ('deepcopy', timed(lambda: copy.deepcopy(logic), max(1, rounds // 10))),
+        ('deepcopy + розыгрыш', timed(lambda: play(copy.deepcopy(logic)), max(1, rounds // 10))),
+        ('snapshot', timed(lambda: snapshot(logic), rounds)),
+        ('restore', timed(lambda: restore(logic, state), rounds)),
+        ('fork', timed(state.fork, rounds * 10)),
+        ('fork + розыгрыш', timed(lambda: state.fork().rollout(rng), rounds)),
+    ]
+    print(f"поле {args.size}x{args.size}, партия из середины:")
+    for name, elapsed in results:
+        print(f"  {name:<20}: {elapsed * 1e6:10.2f} мкс")
@@ -0,0 +1,175 @@
+import argparse
+import io
+import json
+import platform
+import random as rnd
+import sys
+import time
+
+import gameEvents
+from gameConfig import check_config, parse_fleet
+from gameLogic import ComputerPlayer, GameEvent, Point, SeaBattleGameBoard, SeaBattleGameLogic, Ship, random_fleet
+from main import ConsoleGameGui
+from benchmarks.model import play
+
+
+# Набор замеров горячих путей ядра игры с сохранением результатов и сравнением с базовой линией.
+# Замеры: Ship.may_exist, Ship.nearby (первое обращение, до кэширования), ComputerPlayer.init_ships,
+# SeaBattleGameBoard.incoming_shot, полная партия двух ComputerPlayer и ConsoleGameGui.draw после выстрела -
+# для каждого сочетания размера поля и флота (сочетания, в которых флот не помещается на поле, пропускаются).
+# Результат замера - лучшее из repeat повторений время одной операции; результаты пишутся в JSON:
+#   {"python": ..., "machine": ..., "results": {"<замер>/<размер>/<флот>": секунд на операцию, ...}}
+# compare сравнивает два файла и завершается с кодом 1, если какой-то замер медленнее базового
+# больше чем на threshold (доля). Вывод на время замера отключен, компьютер ходит без ожидания [Enter].
+# Запуск из корня проекта:
+#   python -m benchmarks.suite run --out baseline.json
+#   python -m benchmarks.suite run --out current.json
+#   python -m benchmarks.suite compare baseline.json current.json --threshold 0.1
+def best_time(func, ops: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / ops
+
+
+def bodies(size: int, fleet: dict, count: int) -> list[list[Point]]:
+    ret = []
+    while len(ret) < count:
+        ret.extend(list(ship.body) for ship in random_fleet(size, fleet))
+    return ret[:count]
+
+
+def bench_may_exist(size: int, fleet: dict, repeat: int) -> float:
+    ships = bodies(size, fleet, 1000)
+    may_exist = Ship.may_exist
+    return best_time(lambda: [may_exist(body) for body in ships], len(ships), repeat)
+
+
+def bench_nearby(size: int, fleet: dict, repeat: int) -> float:
+    ships = bodies(size, fleet, 1000)
+    fresh = [[Ship(body) for body in ships] for _ in range(repeat)]
+    return best_time(lambda: [ship.nearby for ship in fresh.pop()], len(ships), repeat)
+
+
+def bench_init_ships(size: int, fleet: dict, repeat: int) -> float:
+    player = ComputerPlayer('Комп')
+    return best_time(lambda: [player.init_ships(size, fleet) for _ in range(10)], 10, repeat)
+
+
+def bench_incoming_shot(size: int, fleet: dict, repeat: int) -> float:
+    cells = [Point(x, y) for x in range(1, size + 1) for y in range(1, size + 1)]
+    boards = [SeaBattleGameBoard(size, random_fleet(size, fleet)) for _ in range(repeat)]
+    shots = rnd.sample(cells, len(cells))
+
+    def shoot_all():
+        board = boards.pop()
+        for shot in shots:
+            board.incoming_shot(shot)
+    return best_time(shoot_all, len(cells), repeat)
+
+
+def bench_full_game(size: int, fleet: dict, repeat: int) -> float:
+    games = max(1, 2000 // (size * size))
+    return best_time(lambda: [play(SeaBattleGameLogic(size, ComputerPlayer('Комп 1', pause=False),
+                                                      ComputerPlayer('Комп 2', pause=False), ships_quantity=fleet))
+                              for _ in range(games)],
+                     games, repeat)
+
+
+def bench_draw(size: int, fleet: dict, repeat: int) -> float:
+    cells = [Point(x, y) for x in range(1, size + 1) for y in range(1, size + 1)]
+    best = float('inf')
+    for _ in range(repeat):
+        player1 = ComputerPlayer("Комп 1", pause=False)
+        player2 = ComputerPlayer("Комп 2", pause=False)
+        out = io.StringIO()
+        gui = ConsoleGameGui(size, SeaBattleGameLogic(size, player1, player2, ships_quantity=fleet), out=out)
+        gui.draw()
+        elapsed = 0.0
+        for shot in rnd.sample(cells, len(cells)):
+            gui.process_event(GameEvent(GameEvent.Event_Shot, player1, shot))
+            out.seek(0)
+            out.truncate()
+            start = time.perf_counter()
+            gui.draw()
+            elapsed += time.perf_counter() - start
+        best = min(best, elapsed / len(cells))
+    return best
+
+
+Benches = {
+    'may_exist': bench_may_exist,
+    'nearby': bench_nearby,
+    'init_ships': bench_init_ships,
+    'incoming_shot': bench_incoming_shot,
+    'full_game': bench_full_game,
+    'draw': bench_draw,
+}
+
+
+def run(sizes: list[int], fleets: list[str], repeat: int, seed: int) -> dict:
+    results = {}
+    for size in sizes:
+        for spec in fleets:
+            fleet = parse_fleet(spec)
+            try:
+                check_config(size, fleet)
+            except ValueError:
+                continue
+            for name, bench in Benches.items():
+                rnd.seed(seed)
+                results[f"{name}/{size}/{spec}"] = bench(size, fleet, repeat)
+    return results
+
+
+# Сравнение результатов: строки (замер, базовое время, текущее время, отношение) и список регрессий
+def compare(baseline: dict, current: dict, threshold: float) -> tuple[list[tuple], list[str]]:
+    rows = []
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys()):
+        ratio = current[key] / baseline[key]
+        rows.append((key, baseline[key], current[key], ratio))
+        if ratio > 1 + threshold:
+            regressions.append(key)
+    return rows, regressions
+
+
+def load(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замеры горячих путей ядра игры и сравнение с базовой линией")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="выполнить замеры и сохранить результаты в JSON")
+    run_parser.add_argument('--out', default='benchmark.json')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=[6, 10, 20, 50])
+    run_parser.add_argument('--fleets', nargs='+', default=['3:1,2:2,1:4', '4:1,3:2,2:3,1:4'],
+                            help="флоты 'длина:количество,...'")
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--seed', type=int, default=0)
+    compare_parser = commands.add_parser('compare', help="сравнить результаты с базовой линией")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help="допустимое замедление, доля")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        gameEvents.use(gameEvents.NullSink())
+        results = run(args.sizes, args.fleets, args.repeat, args.seed)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results},
+                      f, indent=1, ensure_ascii=False)
+        for key, seconds in results.items():
+            print(f"{key:<40}: {seconds * 1e6:12.3f} мкс")
+        print(f"Результаты сохранены в {args.out}")
+    else:
+        rows, regressions = compare(load(args.baseline), load(args.current), args.threshold)
+        for key, base, current, ratio in rows:
+            mark = '  РЕГРЕССИЯ' if key in regressions else ''
+            print(f"{key:<40}: {base * 1e6:12.3f} -> {current * 1e6:12.3f} мкс ({ratio - 1:+7.1%}){mark}")
+        print(f"Замеров: {len(rows)}, медленнее базовых больше чем на {args.threshold:.0%}: {len(regressions)}")
+        sys.exit(1 if regressions else 0)
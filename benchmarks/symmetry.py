@@ -0,0 +1,81 @@
+import argparse
+import random as rnd
+import time
+
+from boardSymmetry import SymmetryCache, Symmetries, transform
+from gameLogic import SeaBattleGameBoard, SeaBattleGameLogic
+from gameSimulation import simulate
+from gameStrategies import ExactShots
+from placementCount import PlacementCounter
+
+
+# Общий кэш вероятностей с точностью до симметрий поля: доля попаданий в кэш и ускорение пакетной
+# симуляции партий ExactShots против ExactShots (оба игрока выбирают случайную из равных клеток и
+# пользуются одним кэшем). Варианты с одинаковым размером кэша:
+#   "без кэша"   - каждый ход считается заново;
+#   "свой кэш"   - LRU-кэш PlacementCounter у каждой стратегии, ключ - само наблюдение;
+#   "симметрии"  - общий SymmetryCache с канонической формой наблюдения (свой кэш стратегий отключен).
+# Сначала сверка: вероятности через кэш для всех 8 симметричных копий наблюдений совпадают
+# с прямым расчетом, и партии с общим кэшем совпадают с партиями без него.
+# Наблюдения для сверки - случайные промахи на пустом поле.
+# Запуск из корня проекта: python -m benchmarks.symmetry --size 6 --games 100
+def observations(size: int, count: int, seed: int) -> list[bytes]:
+    gen = rnd.Random(seed)
+    ret = []
+    while len(ret) < count:
+        marks = bytearray(size * size)
+        for c in gen.sample(range(size * size), gen.randrange(size * size // 3)):
+            marks[c] = SeaBattleGameBoard.Miss_Shot
+        ret.append(bytes(marks))
+    return ret
+
+
+def check(size: int, fleet: dict, games: int) -> int:
+    counter = PlacementCounter(size, fleet, 0)
+    cache = SymmetryCache()
+    mismatches = 0
+    for observation in observations(size, 20, 0):
+        for s in range(Symmetries):
+            copy = transform(observation, size, s)
+            mismatches += cache.values(copy, None, counter.probabilities) != counter.probabilities(copy)
+    for random_ties in (False, True):
+        plain = simulate(games, size, 0, ExactShots(random_ties=random_ties), ExactShots(random_ties=random_ties),
+                         fleet)
+        shared = SymmetryCache()
+        cached = simulate(games, size, 0, ExactShots(0, shared, random_ties), ExactShots(0, shared, random_ties),
+                          fleet)
+        mismatches += sum(a != b for a, b in zip(plain, cached))
+    return mismatches
+
+
+def run(games: int, size: int, fleet: dict, first, second) -> float:
+    start = time.perf_counter()
+    simulate(games, size, 1, first, second, fleet)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Общий кэш вероятностей с точностью до симметрий поля")
+    parser.add_argument('--size', type=int, default=6)
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--cache', type=int, default=100000, help="размер кэша, записей")
+    parser.add_argument('--check-games', type=int, default=20)
+    args = parser.parse_args()
+
+    fleet = SeaBattleGameLogic.Ships_Quantity
+    print(f"сверка: {check(args.size, fleet, args.check_games)} расхождений")
+
+    none = run(args.games, args.size, fleet, ExactShots(0, random_ties=True), ExactShots(0, random_ties=True))
+    print(f"{'без кэша':<10}: {none:7.1f} с, {args.games / none:6.2f} партий/с")
+    own = (ExactShots(args.cache, random_ties=True), ExactShots(args.cache, random_ties=True))
+    base = run(args.games, args.size, fleet, *own)
+    hits = sum(s.counter.hits for s in own)
+    misses = sum(s.counter.misses for s in own)
+    print(f"{'свой кэш':<10}: {base:7.1f} с, {args.games / base:6.2f} партий/с, "
+          f"попаданий {hits / (hits + misses):6.1%}, ускорение x{none / base:.2f}")
+    shared = SymmetryCache(args.cache)
+    elapsed = run(args.games, args.size, fleet, ExactShots(args.cache, shared, True),
+                  ExactShots(args.cache, shared, True))
+    print(f"{'симметрии':<10}: {elapsed:7.1f} с, {args.games / elapsed:6.2f} партий/с, "
+          f"попаданий {shared.hit_rate:6.1%} ({len(shared)} записей), ускорение x{none / elapsed:.2f} "
+          f"(x{base / elapsed:.2f} к своему кэшу)")
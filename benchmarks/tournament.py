@@ -0,0 +1,33 @@
+import argparse
+import os
+import time
+
+from gameTournament import Tournament
+
+
+# Замер масштабирования турнира по количеству процессов
+# Запуск из корня проекта: python -m benchmarks.tournament --games 200000
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Масштабирование турнира по ядрам")
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    workers_list = [1]
+    while workers_list[-1] * 2 <= args.max_workers:
+        workers_list.append(workers_list[-1] * 2)
+    if workers_list[-1] != args.max_workers:
+        workers_list.append(args.max_workers)
+
+    base_rate = None
+    print(f"Поле {args.size}x{args.size}, партий: {args.games}, ядер: {os.cpu_count()}")
+    for workers in workers_list:
+        tournament = Tournament(args.size, ['random'])
+        start = time.perf_counter()
+        stats = tournament.run(args.games, workers)
+        elapsed = time.perf_counter() - start
+        rate = args.games / elapsed
+        base_rate = base_rate if base_rate else rate
+        print(f"процессов: {workers:>3}, партий/с: {rate:>9.0f}, ускорение: {rate / base_rate:5.2f}, "
+              f"эффективность: {rate / base_rate / workers:5.2f}")
@@ -0,0 +1,241 @@
+import gameEvents
+from gameLogic import Point, Ship, SeaBattleGameBoard, print_error, ship_error
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# ============================================
+# Альтернативные реализации игрового поля с тем же интерфейсом, что у SeaBattleGameBoard:
+# size, alive_ships_count, board, enemy_shots, add_ship(), incoming_shot(), load_shots().
+# Клетка (x, y) кодируется номером бита cell = (x - 1) * size + (y - 1)
+
+# ---------------------------------
+# класс игрового поля на битовых масках (целые числа Python).
+# Попадание, проверка "убит" и пометка соседей убитого корабля - по одной операции с масками.
+# Быстрее списков на полях до нескольких десятков клеток в стороне; на 100x100 маски длиной
+# в 10000 бит делают выстрел медленнее, чем у SeaBattleGameBoard (замер: python -m benchmarks.board).
+# board и enemy_shots - неизменяемые представления (кортежи кортежей), состояние хранится в масках
+class BitGameBoard:
+    def __init__(self, size: int, ships: list[Ship]) -> None:
+        self.__board_size = size
+        self.__ships = []
+        self.__ship_at = {}             # номер клетки -> индекс корабля в self.__ships
+        self.__ship_masks = []
+        self.__nearby_masks = []
+        self.__body = 0
+        self.__misses = 0
+        self.__hits = 0
+        self.__neighbors = 0
+        self.__alive_ships_count = 0
+        self.__enemy_shots = None       # кэш представления enemy_shots в виде кортежа кортежей
+        for ship in ships:
+            self.add_ship(ship)
+
+    def cell(self, p: Point) -> int:
+        return (p.x - 1) * self.__board_size + (p.y - 1)
+
+    def mask(self, points) -> int:
+        ret = 0
+        for p in points:
+            ret |= 1 << self.cell(p)
+        return ret
+
+    # Те же проверки, что и в SeaBattleGameBoard.add_ship
+    def add_ship(self, ship: Ship) -> bool:
+        error = ship_error(self, ship, lambda p: self.cell(p) in self.__ship_at)
+        if error:
+            print_error(error)
+            return False
+
+        index = len(self.__ships)
+        for p in ship.body:
+            self.__ship_at[self.cell(p)] = index
+        ship_mask = self.mask(ship.body)
+        self.__body |= ship_mask
+        self.__ship_masks.append(ship_mask)
+        self.__nearby_masks.append(self.mask(p for p in ship.nearby if p.in_board(self)))
+        self.__ships.append(ship)
+        self.__alive_ships_count += 1
+        return True
+
+    def __str__(self) -> str:
+        ret = f"Игровое поле размером {self.size}x{self.size}:\n"
+        for ship in self.__ships:
+            ret = ret + str(ship) + '\n'
+        return ret
+
+    @property
+    def size(self) -> int:
+        return self.__board_size
+
+    @property
+    def alive_ships_count(self) -> int:
+        return self.__alive_ships_count
+
+    def __grid(self, layers: list[tuple[int, int]], default: int) -> tuple[tuple[int, ...], ...]:
+        size = self.__board_size
+        grid = [[default] * size for _ in range(size)]
+        for mask, value in layers:
+            while mask:
+                low = mask & -mask
+                x, y = divmod(low.bit_length() - 1, size)
+                grid[x][y] = value
+                mask ^= low
+        return tuple(map(tuple, grid))
+
+    @property
+    def board(self) -> tuple[tuple[int, ...], ...]:
+        return self.__grid([(self.__body, SeaBattleGameBoard.Ship_Body)], SeaBattleGameBoard.Sea_Spot)
+
+    # Представление в формате SeaBattleGameBoard.enemy_shots; строится только после изменений.
+    # Только для чтения: изменить отметки можно лишь выстрелом или load_shots
+    @property
+    def enemy_shots(self) -> tuple[tuple[int, ...], ...]:
+        if self.__enemy_shots is None:
+            self.__enemy_shots = self.__grid([(self.__neighbors, SeaBattleGameBoard.Ship_Neighbor),
+                                              (self.__misses, SeaBattleGameBoard.Miss_Shot),
+                                              (self.__hits, SeaBattleGameBoard.Hit_Shot)],
+                                             SeaBattleGameBoard.Fog_Of_War)
+        return self.__enemy_shots
+
+    # Поведение то же, что у SeaBattleGameBoard.incoming_shot
+    def incoming_shot(self, shot: Point) -> bool:
+        cell = self.cell(shot)
+        bit = 1 << cell
+        if (self.__misses | self.__hits) & bit:
+            raise ValueError
+        self.__enemy_shots = None
+
+        if not self.__body & bit:
+            gameEvents.emit(gameEvents.Msg_Miss, "Мимо ))", shot)
+            self.__misses |= bit
+            return False
+
+        self.__hits |= bit
+        index = self.__ship_at[cell]
+        self.__ships[index].reduce(shot)
+        if self.__ship_masks[index] & ~self.__hits:
+            gameEvents.emit(gameEvents.Msg_Injured, "Ранил", shot)
+        else:
+            gameEvents.emit(gameEvents.Msg_Killed, "Убил!", shot)
+            self.__alive_ships_count -= 1
+            self.__neighbors |= self.__nearby_masks[index] & ~(self.__misses | self.__hits)
+        return True
+
+    # Поведение то же, что у SeaBattleGameBoard.load_shots
+    def load_shots(self, enemy_shots: list[list[int]]) -> None:
+        masks = dict.fromkeys((SeaBattleGameBoard.Ship_Neighbor, SeaBattleGameBoard.Miss_Shot,
+                               SeaBattleGameBoard.Hit_Shot), 0)
+        for x, row in enumerate(enemy_shots):
+            for y, mark in enumerate(row):
+                if mark in masks:
+                    masks[mark] |= 1 << (x * self.__board_size + y)
+        self.__neighbors = masks[SeaBattleGameBoard.Ship_Neighbor]
+        self.__misses = masks[SeaBattleGameBoard.Miss_Shot]
+        self.__hits = masks[SeaBattleGameBoard.Hit_Shot]
+        self.__enemy_shots = None
+        self.__alive_ships_count = 0
+        for ship, ship_mask in zip(self.__ships, self.__ship_masks):
+            ship.restore(p for p in ship.body if not self.__hits >> self.cell(p) & 1)
+            if ship_mask & ~self.__hits:
+                self.__alive_ships_count += 1
+
+
+# ---------------------------------
+# класс игрового поля на массивах NumPy - для больших полей, где битовые маски становятся длинными.
+# enemy_shots хранится прямо как массив uint8 в кодировке SeaBattleGameBoard
+class NumpyGameBoard:
+    def __init__(self, size: int, ships: list[Ship]) -> None:
+        if np is None:
+            raise ImportError("Для NumpyGameBoard нужен пакет numpy")
+        self.__board_size = size
+        self.__ships = []
+        self.__ship_at = np.full((size, size), -1, dtype=np.int32)
+        self.__hits_left = []
+        self.__nearby = []
+        self.__enemy_shots = np.full((size, size), SeaBattleGameBoard.Fog_Of_War, dtype=np.uint8)
+        self.__alive_ships_count = 0
+        for ship in ships:
+            self.add_ship(ship)
+
+    # Те же проверки, что и в SeaBattleGameBoard.add_ship
+    def add_ship(self, ship: Ship) -> bool:
+        error = ship_error(self, ship, lambda p: self.__ship_at[p.x - 1, p.y - 1] >= 0)
+        if error:
+            print_error(error)
+            return False
+
+        index = len(self.__ships)
+        for p in ship.body:
+            self.__ship_at[p.x - 1, p.y - 1] = index
+        nearby = [p for p in ship.nearby if p.in_board(self)]
+        self.__nearby.append((np.array([p.x - 1 for p in nearby], dtype=np.intp),
+                              np.array([p.y - 1 for p in nearby], dtype=np.intp)))
+        self.__hits_left.append(ship.size)
+        self.__ships.append(ship)
+        self.__alive_ships_count += 1
+        return True
+
+    def __str__(self) -> str:
+        ret = f"Игровое поле размером {self.size}x{self.size}:\n"
+        for ship in self.__ships:
+            ret = ret + str(ship) + '\n'
+        return ret
+
+    @property
+    def size(self) -> int:
+        return self.__board_size
+
+    @property
+    def alive_ships_count(self) -> int:
+        return self.__alive_ships_count
+
+    @property
+    def board(self):
+        return np.where(self.__ship_at >= 0, SeaBattleGameBoard.Ship_Body,
+                        SeaBattleGameBoard.Sea_Spot).astype(np.uint8)
+
+    @property
+    def enemy_shots(self):
+        return self.__enemy_shots
+
+    # Поведение то же, что у SeaBattleGameBoard.incoming_shot
+    def incoming_shot(self, shot: Point) -> bool:
+        x, y = shot.x - 1, shot.y - 1
+        if self.__enemy_shots[x, y] not in (SeaBattleGameBoard.Fog_Of_War, SeaBattleGameBoard.Ship_Neighbor):
+            raise ValueError
+
+        index = int(self.__ship_at[x, y])
+        if index < 0:
+            gameEvents.emit(gameEvents.Msg_Miss, "Мимо ))", shot)
+            self.__enemy_shots[x, y] = SeaBattleGameBoard.Miss_Shot
+            return False
+
+        self.__enemy_shots[x, y] = SeaBattleGameBoard.Hit_Shot
+        self.__ships[index].reduce(shot)
+        self.__hits_left[index] -= 1
+        if self.__hits_left[index]:
+            gameEvents.emit(gameEvents.Msg_Injured, "Ранил", shot)
+        else:
+            gameEvents.emit(gameEvents.Msg_Killed, "Убил!", shot)
+            self.__alive_ships_count -= 1
+            xs, ys = self.__nearby[index]
+            marks = self.__enemy_shots[xs, ys]
+            self.__enemy_shots[xs, ys] = np.where(marks == SeaBattleGameBoard.Fog_Of_War,
+                                                  SeaBattleGameBoard.Ship_Neighbor, marks)
+        return True
+
+    # Поведение то же, что у SeaBattleGameBoard.load_shots
+    def load_shots(self, enemy_shots) -> None:
+        self.__enemy_shots[:] = np.asarray(enemy_shots, dtype=np.uint8)
+        hit = self.__enemy_shots == SeaBattleGameBoard.Hit_Shot
+        self.__alive_ships_count = 0
+        for index, ship in enumerate(self.__ships):
+            left = [p for p in ship.body if not hit[p.x - 1, p.y - 1]]
+            self.__hits_left[index] = len(left)
+            ship.restore(left)
+            if self.__hits_left[index]:
+                self.__alive_ships_count += 1
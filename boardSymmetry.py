@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from math import isqrt
+
+
+# ============================================
+# Симметрии квадратного поля и общий кэш расчетов по наблюдениям с точностью до симметрии.
+#
+# Наблюдение - плоская последовательность отметок (bytes, как PlacementCounter.normalize, или список)
+# в порядке cell = (x - 1) * size + (y - 1), т.е. по строкам x. Поворот или отражение поля не меняет
+# ни вероятностей, ни лучшего хода - они поворачиваются вместе с полем. Поэтому расчет достаточно
+# сделать для одного представителя: канонической формы - наименьшей из 8 симметричных копий.
+#
+# Симметрия - номер 0..7, биты которого задают преобразования (по порядку):
+#   4 - отражение строк (x -> size + 1 - x): строки склеиваются в обратном порядке;
+#   2 - транспонирование (x <-> y): склеиваются столбцы seq[y::size];
+#   1 - поворот на 180 градусов: разворот всей последовательности seq[::-1].
+# Каждое преобразование переносит строку или столбец одним срезом, без цикла по клеткам.
+# transform(seq, size, s)[i] = seq[permutation(size, s)[i]]
+
+Symmetries = 8
+
+# перестановки клеток и обратные симметрии по размеру поля
+_tables_cache = {}
+
+
+def _join(seq, parts):
+    if isinstance(seq, (bytes, bytearray)):
+        return b''.join(parts)
+    ret = []
+    for part in parts:
+        ret += part
+    return ret
+
+
+def transform(seq, size: int, symmetry: int):
+    if symmetry & 4:
+        seq = _join(seq, [seq[x * size:(x + 1) * size] for x in range(size - 1, -1, -1)])
+    if symmetry & 2:
+        seq = _join(seq, [seq[y::size] for y in range(size)])
+    if symmetry & 1:
+        seq = seq[::-1]
+    return seq
+
+
+# Перестановки клеток всех симметрий и номер обратной симметрии для каждой
+def symmetry_tables(size: int) -> tuple[list[list[int]], list[int]]:
+    if size not in _tables_cache:
+        permutations = [transform(list(range(size * size)), size, s) for s in range(Symmetries)]
+        inverse = []
+        for permutation in permutations:
+            back = [0] * len(permutation)
+            for i, c in enumerate(permutation):
+                back[c] = i
+            inverse.append(permutations.index(back))
+        _tables_cache[size] = (permutations, inverse)
+    return _tables_cache[size]
+
+
+# Каноническая форма наблюдения и симметрия, которая в нее переводит.
+# Все 8 копий строятся из четырех: исходной, транспонированной, отраженной и отраженной транспонированной,
+# остальные - их развороты
+def canonical(observation: bytes, size: int) -> tuple[bytes, int]:
+    best = observation
+    best_symmetry = 0
+    for s in (0, 2, 4, 6):
+        seq = transform(observation, size, s)
+        if seq < best:
+            best, best_symmetry = seq, s
+        seq = seq[::-1]
+        if seq < best:
+            best, best_symmetry = seq, s | 1
+    return best, best_symmetry
+
+
+# ---------------------------------
+# класс общего кэша расчетов по наблюдениям с вытеснением давно не использованных (LRU).
+# Ключ - каноническая форма наблюдения и флот (любое хешируемое значение, например fleet_spec),
+# поэтому симметричные наблюдения разделяют одну запись. Расчет compute(наблюдение) вызывается
+# для канонической формы, а результат переводится обратно в клетки исходного наблюдения.
+# Одним кэшем могут пользоваться несколько стратегий и партий - для этого его передают стратегии
+# (например, ExactShots(shared=...)). Кэш заменяет собственный кэш расчета, а не дополняет его:
+# ExactShots с общим кэшем отключает LRU своего PlacementCounter, иначе одна работа кэшируется дважды.
+# Без канонической формы общий кэш медленнее расчета без кэша, поэтому такого режима нет
+class SymmetryCache:
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.__maxsize = maxsize
+        self.__cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__cache)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        self.__cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __lookup(self, observation: bytes, fleet, compute) -> tuple:
+        size = isqrt(len(observation))
+        form, symmetry = canonical(observation, size)
+        key = (form, fleet)
+        ret = self.__cache.get(key)
+        if ret is not None:
+            self.hits += 1
+            self.__cache.move_to_end(key)
+            return ret, size, symmetry
+        self.misses += 1
+        ret = (compute(form),)
+        self.__cache[key] = ret
+        if len(self.__cache) > self.__maxsize:
+            self.__cache.popitem(last=False)
+        return ret, size, symmetry
+
+    # Значения по клеткам (например, вероятности кораблей): compute возвращает последовательность
+    # длины size * size для канонической формы; возвращается новый список для исходного наблюдения
+    def values(self, observation: bytes, fleet, compute) -> list:
+        (ret,), size, symmetry = self.__lookup(observation, fleet, compute)
+        return list(transform(ret, size, symmetry_tables(size)[1][symmetry]))
+
+    # Клетка (например, лучший выстрел): compute возвращает клетку канонической формы или None
+    def cell(self, observation: bytes, fleet, compute):
+        (ret,), size, symmetry = self.__lookup(observation, fleet, compute)
+        return None if ret is None else symmetry_tables(size)[0][symmetry][ret]
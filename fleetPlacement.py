@@ -0,0 +1,197 @@
+from collections import namedtuple
+
+
+# ============================================
+# Расстановка флота на поле.
+# Клетка (x, y) кодируется одним числом cell = (x - 1) * size + (y - 1), т.е. в том же порядке,
+# что и SeaBattleGameBoard.enemy_shots[x - 1][y - 1]. Корабли не могут касаться сторонами
+# (соседи - как в Ship.nearby), по диагонали касаться могут.
+# Модуль не зависит от gameLogic, поэтому его можно использовать и из ComputerPlayer.init_ships
+
+# положение корабля: клетки корабля, соседние клетки, маска корабля вместе с соседями, маска корабля.
+# Маски есть только у положений из таблиц ship_placements; на больших полях (см. FleetPlacer) они None
+Placement = namedtuple('Placement', ['body', 'nearby', 'mask', 'body_mask'])
+
+
+def cell_to_xy(cell: int, board_size: int) -> tuple[int, int]:
+    return cell // board_size + 1, cell % board_size + 1
+
+
+def xy_to_cell(x: int, y: int, board_size: int) -> int:
+    return (x - 1) * board_size + (y - 1)
+
+
+# Соседи клетки по сторонам (как в Ship.nearby), только внутри поля
+def cell_neighbors(cell: int, board_size: int) -> list[int]:
+    x, y = divmod(cell, board_size)
+    ret = []
+    if x > 0:
+        ret.append(cell - board_size)
+    if x < board_size - 1:
+        ret.append(cell + board_size)
+    if y > 0:
+        ret.append(cell - 1)
+    if y < board_size - 1:
+        ret.append(cell + 1)
+    return ret
+
+
+# ---------------------------------
+# Таблица всех возможных положений корабля заданной длины на поле заданного размера.
+# Строится один раз для каждой пары (board_size, ship_size)
+_placements_cache = {}
+
+
+def ship_placements(board_size: int, ship_size: int) -> list[Placement]:
+    key = (board_size, ship_size)
+    if key in _placements_cache:
+        return _placements_cache[key]
+
+    placements = []
+    directions = [board_size, 1] if ship_size > 1 else [board_size]
+    for step in directions:
+        for cell in range(board_size * board_size):
+            x, y = divmod(cell, board_size)
+            if (step == board_size and x + ship_size > board_size) or (step == 1 and y + ship_size > board_size):
+                continue
+            body = tuple(cell + z * step for z in range(ship_size))
+            nearby = set()
+            for c in body:
+                nearby.update(cell_neighbors(c, board_size))
+            nearby = tuple(sorted(nearby.difference(body)))
+            body_mask = 0
+            for c in body:
+                body_mask |= 1 << c
+            mask = body_mask
+            for c in nearby:
+                mask |= 1 << c
+            placements.append(Placement(body, nearby, mask, body_mask))
+
+    _placements_cache[key] = placements
+    return placements
+
+
+def fleet_mask(fleet: list[Placement]) -> int:
+    ret = 0
+    for ship in fleet:
+        ret |= ship.body_mask
+    return ret
+
+
+# ---------------------------------
+# класс генератора случайной расстановки флота.
+# Корабли ставятся в порядке ships_quantity (как в ComputerPlayer.init_ships - сначала длинные).
+# Для каждого корабля сначала делается Random_Tries попыток случайного выбора положения, затем
+# перебираются все свободные положения в случайном порядке; если свободных нет, предыдущий корабль
+# переставляется (поиск с возвратом). Поиск, застрявший дольше Restart_Steps шагов, начинается заново.
+# На полях больше Table_Cells клеток таблицы положений (и маски на все поле) слишком велики,
+# поэтому там корабли ставятся случайными попытками по индексу занятости (см. __sparse_search).
+# Если расстановка не найдена за Max_Restarts попыток или не существует вовсе,
+# выбрасывается ValueError - бесконечного цикла не бывает
+class FleetPlacer:
+    Random_Tries = 20
+    Restart_Steps = 2000
+    Max_Restarts = 100
+    Table_Cells = 128 * 128
+
+    def __init__(self, board_size: int, ships_quantity: dict, rng) -> None:
+        self.__board_size = board_size
+        self.__rng = rng
+        self.__sparse = board_size * board_size > self.Table_Cells
+        self.__ships = []               # таблицы положений кораблей или, на больших полях, их длины
+        for ship_size, quantity in ships_quantity.items():
+            if ship_size < 1 or ship_size > board_size:
+                raise ValueError(f"Корабль длиной {ship_size} не помещается на поле {board_size}x{board_size}")
+            ship = ship_size if self.__sparse else ship_placements(board_size, ship_size)
+            self.__ships.extend([ship] * quantity)
+
+    @property
+    def board_size(self) -> int:
+        return self.__board_size
+
+    @property
+    def ships_count(self) -> int:
+        return len(self.__ships)
+
+    def __options(self, candidates: list[Placement], occupied: int):
+        random = self.__rng.random
+        for _ in range(self.Random_Tries):
+            ship = candidates[int(random() * len(candidates))]
+            if not ship.body_mask & occupied:
+                yield ship
+        free = [ship for ship in candidates if not ship.body_mask & occupied]
+        self.__rng.shuffle(free)
+        yield from free
+
+    def place(self) -> list[Placement]:
+        search = self.__sparse_search if self.__sparse else self.__search
+        for _ in range(self.Max_Restarts):
+            fleet = search()
+            if fleet is not None:
+                return fleet
+        raise ValueError(f"Не удалось расставить {len(self.__ships)} кораблей "
+                         f"на поле {self.__board_size}x{self.__board_size}")
+
+    # Одна попытка поиска с возвратом. Возвращает None, если попытка исчерпала Restart_Steps шагов;
+    # если перебраны все варианты, расстановки не существует
+    def __search(self):
+        ships = self.__ships
+        fleet = []
+        occupied = [0]
+        stack = []
+        steps = 0
+        while len(fleet) < len(ships):
+            if len(stack) == len(fleet):
+                stack.append(self.__options(ships[len(fleet)], occupied[-1]))
+            ship = next(stack[-1], None)
+            steps += 1
+            if ship is not None:
+                fleet.append(ship)
+                occupied.append(occupied[-1] | ship.mask)
+                continue
+            # для этого корабля места нет - переставляем предыдущий
+            stack.pop()
+            if not fleet:
+                raise ValueError(f"Расстановки {len(ships)} кораблей на поле "
+                                 f"{self.__board_size}x{self.__board_size} не существует")
+            if steps > self.Restart_Steps:
+                return None
+            fleet.pop()
+            occupied.pop()
+        return fleet
+
+    # Расстановка на большом поле без таблиц: каждый корабль ставится случайными попытками, пока
+    # его клетки не окажутся вне множества blocked - клеток уже поставленных кораблей и их соседей.
+    # Попытка стоит O(длины корабля), память - O(клеток флота). Возвращает None, если какой-то
+    # корабль не удалось поставить за Restart_Steps попыток
+    def __sparse_search(self):
+        size = self.__board_size
+        random = self.__rng.random
+        blocked = set()
+        fleet = []
+        for ship_size in self.__ships:
+            for _ in range(self.Restart_Steps):
+                vertical = ship_size > 1 and random() < 0.5
+                step = size if vertical else 1
+                x = int(random() * (size - ship_size + 1 if vertical else size))
+                y = int(random() * (size if vertical else size - ship_size + 1))
+                body = tuple(x * size + y + z * step for z in range(ship_size))
+                if not blocked.isdisjoint(body):
+                    continue
+                nearby = set()
+                for c in body:
+                    nearby.update(cell_neighbors(c, size))
+                nearby = tuple(sorted(nearby.difference(body)))
+                blocked.update(body)
+                blocked.update(nearby)
+                fleet.append(Placement(body, nearby, None, None))
+                break
+            else:
+                return None
+        return fleet
+
+    # Массовая генерация: count расстановок подряд, без накопления в памяти
+    def generate(self, count: int):
+        place = self.place
+        for _ in range(count):
+            yield place()
@@ -0,0 +1,140 @@
+import asyncio
+import sys
+import threading
+
+from gameLogic import GameEvent, Player, SeaBattleGameLogic
+
+
+# ============================================
+# Асинхронный цикл игры: игроки отдают ходы корутиной Player.move(), и один цикл событий asyncio
+# ведет сколько угодно партий одновременно - состояние каждой партии хранится в ее объектах,
+# а ожидание хода одного игрока не останавливает остальные партии.
+# Порядок ходов тот же, что в ConsoleGameGui.get_event: игрок ходит, пока попадает.
+# Если задан move_timeout и игрок не сделал ход за это время, генерируется событие Event_Timeout,
+# и ход переходит к противнику (как после промаха). Event_Quit от игрока завершает партию
+
+# ---------------------------------
+# класс одной асинхронной партии
+class AsyncGame:
+    # on_event вызывается с каждым событием партии (например, для отрисовки);
+    # process_event обрабатывает выстрел, по умолчанию - logic.process_event
+    def __init__(self, logic: SeaBattleGameLogic, move_timeout: float = None, on_event=None,
+                 process_event=None) -> None:
+        self.__logic = logic
+        self.__move_timeout = move_timeout
+        self.__on_event = on_event
+        self.__process_event = process_event if process_event else logic.process_event
+        self.__result = None
+        self.moves = 0
+        self.timeouts = 0
+
+    @property
+    def logic(self) -> SeaBattleGameLogic:
+        return self.__logic
+
+    # Итоговое событие партии: Event_Win или Event_Quit; None, пока партия идет
+    @property
+    def result(self) -> GameEvent:
+        return self.__result
+
+    async def __next_move(self, player: Player) -> GameEvent:
+        if self.__move_timeout is None:
+            return await player.move()
+        try:
+            return await asyncio.wait_for(player.move(), self.__move_timeout)
+        except asyncio.TimeoutError:
+            return GameEvent(GameEvent.Event_Timeout, player)
+
+    def __notify(self, event: GameEvent) -> GameEvent:
+        if self.__on_event is not None:
+            self.__on_event(event)
+        return event
+
+    # Играет партию до победы или выхода и возвращает итоговое событие
+    async def run(self) -> GameEvent:
+        logic = self.__logic
+        while True:
+            for player in [logic.player1, logic.player2]:
+                while player.last_shot_success:
+                    event = await self.__next_move(player)
+                    self.moves += 1
+                    if event.type == GameEvent.Event_Quit:
+                        self.__result = self.__notify(event)
+                        return event
+
+                    if event.type == GameEvent.Event_Timeout:
+                        self.timeouts += 1
+                        player.last_shot_success = False
+                        player.enemy.last_shot_success = True
+                        self.__notify(event)
+                        continue
+
+                    self.__process_event(event)
+                    self.__notify(event)
+                    if player.is_winner:
+                        self.__result = self.__notify(GameEvent(GameEvent.Event_Win, player))
+                        return self.__result
+                # смена хода - место, где цикл событий переключается на другие партии
+                await asyncio.sleep(0)
+
+
+# Играет все партии одновременно в текущем цикле событий; возвращает итоговые события в том же порядке
+async def play_games(games: list[AsyncGame]) -> list[GameEvent]:
+    return await asyncio.gather(*(game.run() for game in games))
+
+
+# Синхронная обертка: создает count партий через make_logic() и играет их в одном цикле событий
+def run_games(count: int, make_logic, move_timeout: float = None) -> list[AsyncGame]:
+    games = [AsyncGame(make_logic(), move_timeout) for _ in range(count)]
+    asyncio.run(play_games(games))
+    return games
+
+
+# ---------------------------------
+# класс общего чтения консоли для асинхронной игры (см. HumanPlayer.move).
+# input() блокирует, поэтому строки stdin читает один поток-демон на весь процесс, а корутины
+# ждут их из очереди. Тайм-аут хода отменяет только ожидание строки: поток не остается ждать
+# ввода ради брошенного хода, а строка, набранная уже после тайм-аута, не достается следующему
+# ходу - readline() отбрасывает строки, набранные до ее приглашения. None - конец ввода
+class ConsoleInput:
+    def __init__(self, stream=None) -> None:
+        self.__stream = stream
+        self.__thread = None
+        self.__loop = None
+        self.__lines = None
+
+    def __read(self) -> None:
+        stream = self.__stream if self.__stream is not None else sys.stdin
+        while True:
+            line = stream.readline()
+            self.__put(line.rstrip('\n') if line else None)
+            if not line:
+                return
+
+    def __put(self, line) -> None:
+        loop, lines = self.__loop, self.__lines
+        try:
+            loop.call_soon_threadsafe(lines.put_nowait, line)
+        except RuntimeError:
+            # цикл событий, который ждал ввода, уже закрыт - строка никому не нужна
+            pass
+
+    async def readline(self, prompt: str = '') -> str | None:
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop:
+            self.__loop = loop
+            self.__lines = asyncio.Queue()
+        lines = self.__lines
+        while not lines.empty():
+            if lines.get_nowait() is None:
+                return None
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__read, name='ConsoleInput', daemon=True)
+            self.__thread.start()
+        if prompt:
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+        return await lines.get()
+
+
+console_input = ConsoleInput()
@@ -0,0 +1,284 @@
+import random as rnd
+from collections import namedtuple
+
+import numpy as np
+
+from fleetPlacement import FleetPlacer, Placement, ship_placements
+from gameLogic import SeaBattleGameBoard, SeaBattleGameLogic
+
+
+# ============================================
+# Пакетная симуляция: batch партий компьютер против компьютера идут одновременно в массивах numpy.
+# Правила те же, что в gameSimulation.HeadlessSimulation: попавший стреляет еще раз,
+# повторный выстрел не передает ход, соседи убитого корабля помечаются Ship_Neighbor.
+#
+# Поле игрока side в партии g - строка 2 * g + side всех массивов:
+#   ship_at    (2B, N)  номер корабля в клетке или -1
+#   marks      (2B, N)  отметки выстрелов, как SeaBattleGameBoard.enemy_shots
+#   hits_left  (2B, S)  сколько попаданий осталось до гибели каждого корабля
+#   placement  (2B, S)  номер положения корабля в общей таблице положений (для соседей убитого)
+# N = size * size, S - количество кораблей флота. Один шаг - по одному выстрелу в каждой
+# незаконченной партии: все выстрелы шага обрабатываются несколькими операциями с массивами.
+#
+# Стратегии стрельбы тоже пакетные (BatchShotStrategy): стратегия игрока side видит отметки
+# полей противника - срез marks[1 - side::2], строка g которого относится к партии g.
+#
+# Накладные расходы numpy на шаг окупаются только на больших пакетах: при batch порядка тысяч
+# случайная стрельба в 2-3 раза быстрее HeadlessSimulation, при batch в десятки партий - медленнее
+# (замер: python -m benchmarks.batch)
+
+# результаты пакета партий: победитель (1 или 2), выстрелы каждого игрока (B, 2) и количество ходов
+BatchResult = namedtuple('BatchResult', ['seed', 'winner', 'shots', 'turns'])
+
+
+# ---------------------------------
+# Общие таблицы положений кораблей поля заданного размера: клетки, длина и соседи каждого положения.
+# Клетки и соседи дополнены до одинаковой длины повтором последней клетки - повторная запись
+# того же значения ничего не меняет
+_tables_cache = {}
+
+
+def padded(rows: list[tuple]) -> np.ndarray:
+    width = max(len(row) for row in rows)
+    return np.array([row + (row[-1],) * (width - len(row)) for row in rows], dtype=np.intp)
+
+
+def placement_tables(board_size: int, ship_sizes: tuple) -> tuple:
+    key = (board_size, ship_sizes)
+    if key in _tables_cache:
+        return _tables_cache[key]
+
+    placements = [p for ship_size in ship_sizes for p in ship_placements(board_size, ship_size)]
+    # положения - общие объекты ship_placements, поэтому номер ищется по id
+    numbers = {id(p): i for i, p in enumerate(placements)}
+    sizes = np.array([len(p.body) for p in placements], dtype=np.int16)
+    _tables_cache[key] = (numbers, padded([p.body for p in placements]), sizes,
+                          padded([p.nearby for p in placements]))
+    return _tables_cache[key]
+
+
+# ---------------------------------
+# Пакетная стратегия стрельбы.
+# reset() вызывается перед каждым пакетом и получает отметки полей противника (B, N),
+# choose() получает номера партий, где стреляет этот игрок, и возвращает клетки выстрелов,
+# observe() получает результаты этих выстрелов (Shot_Miss, Shot_Injured, Shot_Killed, Shot_Already)
+class BatchShotStrategy:
+    def reset(self, board_size: int, ships_quantity: dict, observation: np.ndarray, rng) -> None:
+        pass
+
+    def choose(self, games: np.ndarray) -> np.ndarray:
+        pass
+
+    def observe(self, games: np.ndarray, cells: np.ndarray, results: np.ndarray) -> None:
+        pass
+
+
+# Пакетный аналог RandomShots: в каждой партии - случайная перестановка всех клеток
+class BatchRandomShots(BatchShotStrategy):
+    def __init__(self) -> None:
+        self.__order = None
+        self.__next = None
+
+    def reset(self, board_size: int, ships_quantity: dict, observation: np.ndarray, rng) -> None:
+        self.__order = np.argsort(rng.random(observation.shape), axis=1)
+        self.__next = np.zeros(len(observation), dtype=np.intp)
+
+    def choose(self, games: np.ndarray) -> np.ndarray:
+        cells = self.__order[games, self.__next[games]]
+        self.__next[games] += 1
+        return cells
+
+
+# Стратегия "охота и добивание": случайный выстрел в туман войны, а если есть раненый корабль -
+# в клетку тумана рядом с попаданием. Раненый корабль в партии не больше одного: добивание стреляет
+# только рядом с попаданиями, а корабли не касаются сторонами.
+# Охота идет по случайной перестановке клеток и пропускает уже отмеченные; добивание выбирает
+# среди клеток тумана рядом с попаданиями клетку с наибольшим случайным приоритетом
+class BatchHuntShots(BatchShotStrategy):
+    def __init__(self) -> None:
+        self.__observation = None
+        self.__size = 0
+        self.__order = None
+        self.__next = None
+        self.__priority = None
+        self.__wounded = None
+
+    def reset(self, board_size: int, ships_quantity: dict, observation: np.ndarray, rng) -> None:
+        self.__observation = observation
+        self.__size = board_size
+        self.__order = np.argsort(rng.random(observation.shape), axis=1)
+        self.__next = np.zeros(len(observation), dtype=np.intp)
+        self.__priority = rng.random(observation.shape, dtype=np.float32) + np.float32(1.0)
+        self.__wounded = np.zeros(len(observation), dtype=bool)
+
+    def __hunt(self, games: np.ndarray) -> np.ndarray:
+        order = self.__order
+        observation = self.__observation
+        following = self.__next
+        cells = np.empty(len(games), dtype=np.intp)
+        todo = np.arange(len(games))
+        while len(todo):
+            g = games[todo]
+            c = order[g, following[g]]
+            following[g] += 1
+            fog = observation[g, c] == SeaBattleGameBoard.Fog_Of_War
+            cells[todo[fog]] = c[fog]
+            todo = todo[~fog]
+        return cells
+
+    def __finish(self, games: np.ndarray) -> np.ndarray:
+        size = self.__size
+        marks = self.__observation[games].reshape(-1, size, size)
+        hit = marks == SeaBattleGameBoard.Hit_Shot
+        near = np.zeros_like(hit)
+        near[:, 1:, :] |= hit[:, :-1, :]
+        near[:, :-1, :] |= hit[:, 1:, :]
+        near[:, :, 1:] |= hit[:, :, :-1]
+        near[:, :, :-1] |= hit[:, :, 1:]
+        target = ((marks == SeaBattleGameBoard.Fog_Of_War) & near).reshape(len(games), -1)
+        return np.argmax(target * self.__priority[games], axis=1)
+
+    def choose(self, games: np.ndarray) -> np.ndarray:
+        wounded = self.__wounded[games]
+        if not wounded.any():
+            return self.__hunt(games)
+        cells = np.empty(len(games), dtype=np.intp)
+        cells[wounded] = self.__finish(games[wounded])
+        if not wounded.all():
+            cells[~wounded] = self.__hunt(games[~wounded])
+        return cells
+
+    def observe(self, games: np.ndarray, cells: np.ndarray, results: np.ndarray) -> None:
+        self.__wounded[games[results == SeaBattleGameBoard.Shot_Injured]] = True
+        self.__wounded[games[results == SeaBattleGameBoard.Shot_Killed]] = False
+
+
+# ---------------------------------
+# класс пакетной симуляции
+class BatchSimulation:
+    def __init__(self, board_size: int, batch: int = 4096, strategy1: BatchShotStrategy = None,
+                 strategy2: BatchShotStrategy = None, ships_quantity: dict = None) -> None:
+        self.__board_size = board_size
+        self.__batch = batch
+        self.__ships_quantity = ships_quantity if ships_quantity else SeaBattleGameLogic.Ships_Quantity
+        self.__strategies = [strategy1 if strategy1 else BatchRandomShots(),
+                             strategy2 if strategy2 else BatchRandomShots()]
+        # observe() вызывается только у стратегий, которые его переопределили
+        self.__observers = tuple(None if type(s).observe is BatchShotStrategy.observe else s.observe
+                                 for s in self.__strategies)
+        self.__rng = rnd.Random()
+        self.__placer = FleetPlacer(board_size, self.__ships_quantity, self.__rng)
+        self.__numbers, self.__bodies, self.__sizes, self.__nearby = placement_tables(
+            board_size, tuple(sorted(self.__ships_quantity)))
+        self.__fleets = []
+        self.__marks = None
+
+    @property
+    def board_size(self) -> int:
+        return self.__board_size
+
+    @property
+    def batch(self) -> int:
+        return self.__batch
+
+    # Расстановки флотов последнего пакета: fleets[2 * g + side] - флот игрока side в партии g
+    @property
+    def fleets(self) -> list[list[Placement]]:
+        return self.__fleets
+
+    # Отметки выстрелов по всем полям последнего пакета (2B, N)
+    @property
+    def marks(self) -> np.ndarray:
+        return self.__marks
+
+    def __setup(self, seed: int) -> tuple:
+        self.__rng.seed(seed)
+        place = self.__placer.place
+        numbers = self.__numbers
+        boards = 2 * self.__batch
+        self.__fleets = [place() for _ in range(boards)]
+        placement = np.array([[numbers[id(ship)] for ship in fleet] for fleet in self.__fleets], dtype=np.intp)
+        # ship_at строится одним присваиванием: клетки всех кораблей всех полей берутся из таблицы положений
+        body = self.__bodies[placement]
+        ship_at = np.full((boards, self.__board_size ** 2), -1, dtype=np.int16)
+        ids = np.broadcast_to(np.arange(placement.shape[1], dtype=np.int16)[:, None], body.shape[1:])
+        ship_at[np.arange(boards)[:, None, None], body] = ids
+        hits_left = self.__sizes[placement]
+        return ship_at, hits_left, placement
+
+    # Играет пакет из batch партий от начала до конца. Расстановки и стратегии берут случайность
+    # от генераторов, инициализированных зерном seed, поэтому пакет воспроизводим целиком
+    def play(self, seed: int) -> BatchResult:
+        size = self.__board_size
+        batch = self.__batch
+        ship_at, hits_left, placement = self.__setup(seed)
+        marks = np.full(ship_at.shape, SeaBattleGameBoard.Fog_Of_War, dtype=np.uint8)
+        self.__marks = marks
+        alive = np.full(2 * batch, hits_left.shape[1], dtype=np.int16)
+        nearby = self.__nearby
+        rng = np.random.default_rng(seed)
+        for side, strategy in enumerate(self.__strategies):
+            strategy.reset(size, self.__ships_quantity, marks[1 - side::2], rng)
+        choosers = (self.__strategies[0].choose, self.__strategies[1].choose)
+        observers = self.__observers
+
+        fog = SeaBattleGameBoard.Fog_Of_War
+        neighbor = SeaBattleGameBoard.Ship_Neighbor
+        winner = np.zeros(batch, dtype=np.int8)
+        shots = np.zeros((batch, 2), dtype=np.int32)
+        turns = np.ones(batch, dtype=np.int32)
+        current = np.zeros(batch, dtype=np.intp)
+        games = np.arange(batch)
+        while len(games):
+            side = current[games]
+            second = side.astype(bool)
+            cells = np.empty(len(games), dtype=np.intp)
+            if not second.all():
+                cells[~second] = choosers[0](games[~second])
+            if second.any():
+                cells[second] = choosers[1](games[second])
+            target = 2 * games + 1 - side
+            mark = marks[target, cells]
+            fresh = (mark == fog) | (mark == neighbor)
+            ship = ship_at[target, cells]
+            miss = fresh & (ship < 0)
+            hit = fresh & (ship >= 0)
+            marks[target[miss], cells[miss]] = SeaBattleGameBoard.Miss_Shot
+            hit_target = target[hit]
+            hit_ship = ship[hit]
+            marks[hit_target, cells[hit]] = SeaBattleGameBoard.Hit_Shot
+            hits_left[hit_target, hit_ship] -= 1
+            killed = hits_left[hit_target, hit_ship] == 0
+            finished = np.zeros(len(games), dtype=bool)
+            if killed.any():
+                killed_target = hit_target[killed]
+                alive[killed_target] -= 1
+                around = nearby[placement[killed_target, hit_ship[killed]]]
+                rows = killed_target[:, None]
+                around_marks = marks[rows, around]
+                marks[rows, around] = np.where(around_marks == fog, neighbor, around_marks)
+                won = np.flatnonzero(hit)[killed][alive[killed_target] == 0]
+                finished[won] = True
+                winner[games[won]] = side[won] + 1
+            shots[games, side] += 1
+            if observers[0] or observers[1]:
+                results = np.full(len(games), SeaBattleGameBoard.Shot_Already, dtype=np.int8)
+                results[miss] = SeaBattleGameBoard.Shot_Miss
+                hit_results = np.where(killed, SeaBattleGameBoard.Shot_Killed, SeaBattleGameBoard.Shot_Injured)
+                results[hit] = hit_results
+                for s, observe in enumerate(observers):
+                    if observe:
+                        mine = side == s
+                        observe(games[mine], cells[mine], results[mine])
+            missed = games[miss]
+            current[missed] ^= 1
+            turns[missed] += 1
+            if finished.any():
+                games = games[~finished]
+        return BatchResult(seed, winner, shots, turns)
+
+    # Генератор результатов пакетов по batch партий, пока не наберется games партий;
+    # пакет k играется с зерном base_seed + k
+    def run(self, games: int, base_seed: int = 0):
+        for k in range((games + self.__batch - 1) // self.__batch):
+            yield self.play(base_seed + k)
@@ -0,0 +1,90 @@
+import random as rnd
+
+from fleetPlacement import FleetPlacer
+from gameLogic import SeaBattleGameLogic, print_error
+
+
+# ============================================
+# Конфигурация партии: размер поля и состав флота.
+# Флот задается строкой "длина:количество,..." (например, "4:1,3:2,2:3,1:4") или в файле JSON:
+#   {"board_size": 1000, "fleet": {"5": 2000, "4": 2000, "3": 4000, "2": 6000, "1": 8000}}
+# Проверка конфигурации сначала отбрасывает заведомо невозможные флоты (корабль длиннее поля,
+# клеток кораблей больше, чем клеток поля), а затем пробует одну случайную расстановку флота
+
+Max_Board_Size = 1000
+Min_Board_Size = 2
+
+# Типы игроков: человек, компьютер со случайной стрельбой или компьютер со стратегией (модуль, класс).
+# Эти же имена - типы игроков в хранилище результатов (gameResults) и в турнире (gameTournament)
+Player_Types = {
+    'human': None,
+    'computer': None,
+    'random': ('gameSimulation', 'RandomShots'),
+    'density': ('gameStrategies', 'DensityShots'),
+    'montecarlo': ('gameStrategies', 'MonteCarloShots'),
+    'exact': ('gameStrategies', 'ExactShots'),
+}
+
+
+def parse_fleet(spec: str) -> dict:
+    fleet = {}
+    try:
+        for item in spec.split(','):
+            ship_size, quantity = item.split(':')
+            fleet[int(ship_size)] = fleet.get(int(ship_size), 0) + int(quantity)
+    except ValueError:
+        print_error(f"Непохоже на описание флота: '{spec}' (нужно 'длина:количество,...')")
+        raise
+    return fleet
+
+
+# Обратное parse_fleet: строка "длина:количество,..." по убыванию длины
+def fleet_spec(fleet: dict) -> str:
+    return ','.join(f"{ship_size}:{n}" for ship_size, n in sorted(fleet.items(), reverse=True) if n)
+
+
+# Проверяет размер поля и флот; при ошибке печатает ее и выбрасывает ValueError
+def check_config(board_size: int, fleet: dict) -> None:
+    error = ''
+    if not Min_Board_Size <= board_size <= Max_Board_Size:
+        error = f"Размер поля должен быть от {Min_Board_Size} до {Max_Board_Size} ({board_size = })"
+    elif not fleet or any(n < 0 for n in fleet.values()) or not any(fleet.values()):
+        error = f"Во флоте должен быть хотя бы один корабль ({fleet = })"
+    elif any(ship_size < 1 or ship_size > board_size for ship_size in fleet):
+        error = f"Корабли флота {fleet} должны иметь длину от 1 до {board_size}"
+    elif sum(ship_size * n for ship_size, n in fleet.items()) > board_size * board_size:
+        error = f"Флот {fleet} не помещается на поле {board_size}x{board_size}"
+    else:
+        try:
+            FleetPlacer(board_size, fleet, rnd.Random(0)).place()
+        except ValueError as e:
+            error = str(e)
+    if error:
+        print_error(error)
+        raise ValueError(error)
+
+
+# Читает конфигурацию из файла JSON; недостающие значения берутся по умолчанию.
+# Если файл не читается или в нем не та конфигурация, печатает ошибку и выбрасывает ValueError
+def load_config(path: str, board_size: int = 6, fleet: dict = None) -> tuple[int, dict]:
+    import json
+    error = ''
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        board_size = int(data.get('board_size', board_size))
+        if 'fleet' in data:
+            fleet = {int(ship_size): int(n) for ship_size, n in data['fleet'].items()}
+    except OSError as e:
+        error = f"Не удалось прочитать файл конфигурации '{path}': {e.strerror}"
+    except json.JSONDecodeError as e:
+        error = f"Файл конфигурации '{path}' - не JSON: {e}"
+    except (ValueError, TypeError, AttributeError):
+        error = (f"Неверная конфигурация в '{path}': нужно "
+                 '{"board_size": целое, "fleet": {"длина": количество, ...}}')
+    if error:
+        print_error(error)
+        raise ValueError(error)
+    fleet = fleet if fleet else dict(SeaBattleGameLogic.Ships_Quantity)
+    check_config(board_size, fleet)
+    return board_size, fleet
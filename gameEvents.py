@@ -0,0 +1,134 @@
+import atexit
+import sys
+
+
+# ============================================
+# Шина событий игры: поля и логика игры не пишут на консоль сами, а отправляют типизированные
+# события emit(kind, text, data), которые получают подключенные приемники (sinks).
+# kind - тип события (Msg_*), text - сообщение для человека, data - данные события
+# (для выстрелов - клетка Point).
+#
+# Приемники:
+# - ConsoleSink - консоль с буфером строк: вывод одной записью на много сообщений;
+# - NullSink - отбрасывает все (симуляции, бенчмарки, сервер);
+# - LogSink - файл журнала, запись пачками по batch строк.
+# По умолчанию подключен ConsoleSink. Буферы сбрасываются flush() - перед вводом с консоли,
+# перед отрисовкой поля - и при выходе из программы
+
+Msg_Miss = 0
+Msg_Injured = 1
+Msg_Killed = 2
+Msg_Already = 3
+Msg_Error = 4
+Msg_Info = 5
+
+Kind_Names = ('miss', 'injured', 'killed', 'already', 'error', 'info')
+
+
+# ---------------------------------
+# класс приемника событий: по умолчанию ничего не делает
+class EventSink:
+    def handle(self, kind: int, text: str, data) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+# ---------------------------------
+# класс приемника, который отбрасывает все события
+class NullSink(EventSink):
+    pass
+
+
+# ---------------------------------
+# класс консольного приемника: сообщения копятся в буфере и выводятся одной записью,
+# когда набралось buffer_lines строк или при flush(). out по умолчанию - текущий sys.stdout
+# на момент вывода (так работает contextlib.redirect_stdout)
+class ConsoleSink(EventSink):
+    def __init__(self, out=None, buffer_lines: int = 64) -> None:
+        self.__out = out
+        self.__buffer_lines = buffer_lines
+        self.__lines = []
+
+    def handle(self, kind: int, text: str, data) -> None:
+        if kind == Msg_Error or kind == Msg_Already:
+            self.__lines.append(f"Ошибка: {text}\n")
+        elif kind == Msg_Info:
+            self.__lines.append(text)
+        else:
+            self.__lines.append(f">> {text}")
+        if len(self.__lines) >= self.__buffer_lines:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.__lines:
+            out = self.__out if self.__out is not None else sys.stdout
+            out.write('\n'.join(self.__lines) + '\n')
+            out.flush()
+            self.__lines.clear()
+
+
+# ---------------------------------
+# класс приемника-журнала: строки '<тип>\t<данные>\t<сообщение>' пишутся в файл пачками по batch строк
+class LogSink(EventSink):
+    def __init__(self, path: str, batch: int = 1000) -> None:
+        self.__file = open(path, 'a', encoding='utf-8')
+        self.__batch = batch
+        self.__lines = []
+
+    def handle(self, kind: int, text: str, data) -> None:
+        self.__lines.append(f"{Kind_Names[kind]}\t{'' if data is None else data}\t{text}\n")
+        if len(self.__lines) >= self.__batch:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.__file.closed:
+            return
+        if self.__lines:
+            self.__file.write(''.join(self.__lines))
+            self.__lines.clear()
+        self.__file.flush()
+
+    def close(self) -> None:
+        if not self.__file.closed:
+            self.flush()
+            self.__file.close()
+
+
+# ---------------------------------
+_sinks = [ConsoleSink()]
+
+
+def emit(kind: int, text: str = '', data=None) -> None:
+    for sink in _sinks:
+        sink.handle(kind, text, data)
+
+
+def flush() -> None:
+    for sink in _sinks:
+        sink.flush()
+
+
+def subscribe(sink: EventSink) -> None:
+    _sinks.append(sink)
+
+
+def unsubscribe(sink: EventSink) -> None:
+    sink.flush()
+    _sinks.remove(sink)
+
+
+# Заменяет все приемники на sinks; прежние приемники сбрасываются и возвращаются
+# (чтобы потом вернуть их тем же use(*old))
+def use(*sinks: EventSink) -> list[EventSink]:
+    old = list(_sinks)
+    flush()
+    _sinks[:] = sinks
+    return old
+
+
+atexit.register(flush)
@@ -1,31 +1,47 @@
 import random as rnd
+import weakref
+
+import gameEvents
+from fleetPlacement import FleetPlacer, cell_neighbors, cell_to_xy
 
 
 # ============================================
+# Сообщения идут через шину событий gameEvents, а не прямо на консоль
 def print_error(str_: str) -> None:
-    print("Ошибка:", str_)
-    print()
-
-
-# ToDo: подумать, как реализовать эту функцию в GUI. И ту, что выше
-def say_as_comp(str_):
-    print(f">> {str_}")
+    gameEvents.emit(gameEvents.Msg_Error, str_)
 
 
 # ============================================
+# Точка неизменяема, и для каждой пары координат существует ровно один экземпляр:
+# Point(x, y) возвращает уже созданный объект, хэш вычисляется один раз при создании.
+# Таблица экземпляров держит точки по слабым ссылкам: точка, на которую больше никто не ссылается
+# (ввод игрока, ход клиента сервера, клетка закончившейся партии), из таблицы удаляется
 class Point:
-    def __init__(self, x, y) -> None:
-        self.__x = x
-        self.__y = y
+    __slots__ = ('__x', '__y', '__hash', '__weakref__')
+    __interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, x: int, y: int):
+        key = (cls, x, y)
+        p = Point.__interned.get(key)
+        if p is None:
+            p = super().__new__(cls)
+            p.__x = x
+            p.__y = y
+            p.__hash = hash((x, y))
+            Point.__interned[key] = p
+        return p
 
     def __str__(self) -> str:
         return f"[x = {self.x}, y = {self.y}]"
 
     def __eq__(self, other) -> bool:
-        return isinstance(other, type(self)) and self.x == other.x and self.y == other.y
+        return self is other or (isinstance(other, type(self)) and self.x == other.x and self.y == other.y)
 
     def __hash__(self):
-        return hash((self.x, self.y))
+        return self.__hash
+
+    def __reduce__(self):
+        return type(self), (self.__x, self.__y)
 
     @property
     def x(self) -> int:
@@ -35,16 +51,8 @@ class Point:
     def y(self) -> int:
         return self.__y
 
-    @x.setter
-    def x(self, x: int) -> None:
-        self.__x = x
-
-    @y.setter
-    def y(self, y: int) -> None:
-        self.__y = y
-
     def in_board(self, board) -> bool:
-        return self.x in range(1, board.size + 1) and self.y in range(1, board.size + 1)
+        return 1 <= self.__x <= board.size and 1 <= self.__y <= board.size
 
 
 # ---------------------------------
@@ -52,6 +60,7 @@ class Point:
 class GameEvent:
     Event_Shot = 1              # событие выстрела одного из игроков
     Event_Win = 2               # событие выигрыша одного из игроков
+    Event_Timeout = 3           # игрок не успел сделать ход (см. gameAsync)
     Event_Quit = 99             # Выход
 
     def __init__(self, event_type: int, player=None, event_data=None) -> None:
@@ -79,22 +88,26 @@ class Ship:
     State_Injured = 1
     State_Alive = 9
 
+    __slots__ = ('__body', '__hits', '__nearby', '__hash', '__state', '__size')
+
+    # Клетки корабля и хэш не меняются, поэтому вычисляются один раз при создании.
+    # Соседние клетки вычисляются при первом обращении к nearby и дальше берутся из кэша
     def __init__(self, body: list[Point]) -> None:
-        self.__body = set()
-        self.__hits = set()
         if Ship.may_exist(body):
-            for p in body:
-                self.__body.add(p)
-                self.__hits.add(p)
+            self.__body = frozenset(body)
+            self.__hits = set(self.__body)
+            self.__nearby = None
             self.__state = Ship.State_Alive
             self.__size = len(self.__body)
+            self.__hash = hash(self.__body)
         else:
             print_error("Корабль не может быть такой конфигурации")
             raise ValueError
 
     # Проверяет, можно ли из полученных координат построить корабль:
     # - все точки должны лежать на одной прямой
-    # - в корабле не должно быть разрывов
+    # - в корабле не должно быть разрывов (и повторов точек)
+    # Только целочисленные сравнения, за O(количества точек)
     @staticmethod
     def may_exist(points: list[Point]) -> bool:
         num_of_points = len(points)
@@ -102,30 +115,17 @@ class Ship:
         if num_of_points == 1:
             return True
 
-        _xx = _yy = 0
-        _min_x = _max_x = points[0].x
-        _min_y = _max_y = points[0].y
-        for p in points:
-            _min_x = p.x if p.x < _min_x else _min_x
-            _min_y = p.y if p.y < _min_y else _min_y
-            _max_x = p.x if p.x > _max_x else _max_x
-            _max_y = p.y if p.y > _max_y else _max_y
-            _xx = _xx + p.x
-            _yy = _yy + p.y
-
-        _vertical = (_xx / num_of_points == _min_x) and (_max_y - _min_y == num_of_points - 1)
-        _horizontal = (_yy / num_of_points == _min_y) and (_max_x - _min_x == num_of_points - 1)
-
-        if (_vertical and not _horizontal) or (_horizontal and not _vertical):
-            return True
-        else:
-            return False
+        xs = {p.x for p in points}
+        ys = {p.y for p in points}
+        if len(xs) == 1:
+            # вертикальный: разные y без разрывов
+            return len(ys) == num_of_points and max(ys) - min(ys) == num_of_points - 1
+        if len(ys) == 1:
+            return len(xs) == num_of_points and max(xs) - min(xs) == num_of_points - 1
+        return False
 
     def hit(self, shot: Point) -> bool:
-        for p in self.body:
-            if p == shot:
-                return True
-        return False
+        return shot in self.__body
 
     # ToDo: обработка ошибки при попытки извлечь из списка точку, которой там нет
     def reduce(self, point: Point) -> None:
@@ -135,6 +135,16 @@ class Ship:
         else:
             self.__state = Ship.State_Killed
 
+    # Восстанавливает непораженные клетки корабля (например, из снимка партии, см. gameState)
+    def restore(self, hits) -> None:
+        self.__hits = set(hits)
+        if len(self.__hits) == self.__size:
+            self.__state = Ship.State_Alive
+        elif len(self.__hits):
+            self.__state = Ship.State_Injured
+        else:
+            self.__state = Ship.State_Killed
+
     def __str__(self) -> str:
         ret = f"Корабль длиной {self.__size}: "
         for p in self.body:
@@ -145,10 +155,10 @@ class Ship:
         return isinstance(other, type(self)) and self.body == other.body
 
     def __hash__(self):
-        return hash(tuple(self.body))
+        return self.__hash
 
     @property
-    def body(self) -> set[Point]:
+    def body(self) -> frozenset[Point]:
         return self.__body
 
     @property
@@ -160,19 +170,38 @@ class Ship:
         return self.__state
 
     @property
-    def nearby(self) -> set[Point]:
-        neighbors = set()
-        for p in self.body:
-            neighbors.add(Point(p.x + 1, p.y))
-            neighbors.add(Point(p.x - 1, p.y))
-            neighbors.add(Point(p.x, p.y - 1))
-            neighbors.add(Point(p.x, p.y + 1))
-            # neighbors.add(Point(p.x + 1, p.y + 1))
-            # neighbors.add(Point(p.x + 1, p.y - 1))
-            # neighbors.add(Point(p.x - 1, p.y + 1))
-            # neighbors.add(Point(p.x - 1, p.y - 1))
-            neighbors.discard(p)
-        return neighbors
+    def nearby(self) -> frozenset[Point]:
+        if self.__nearby is None:
+            neighbors = set()
+            for p in self.body:
+                neighbors.add(Point(p.x + 1, p.y))
+                neighbors.add(Point(p.x - 1, p.y))
+                neighbors.add(Point(p.x, p.y - 1))
+                neighbors.add(Point(p.x, p.y + 1))
+                # neighbors.add(Point(p.x + 1, p.y + 1))
+                # neighbors.add(Point(p.x + 1, p.y - 1))
+                # neighbors.add(Point(p.x - 1, p.y + 1))
+                # neighbors.add(Point(p.x - 1, p.y - 1))
+            self.__nearby = frozenset(neighbors.difference(self.body))
+        return self.__nearby
+
+
+# ---------------------------------
+# Проверка корабля перед добавлением на поле за O(клеток корабля), общая для всех реализаций поля:
+#   - корабль должен располагаться внутри поля
+#   - корабль не должен пересекаться с имеющимися кораблями и касаться их сторонами
+# occupied(p) - индекс занятости поля: стоит ли в клетке p (внутри поля) корабль.
+# Возвращает текст ошибки или пустую строку
+def ship_error(board, ship: Ship, occupied) -> str:
+    for p in ship.body:
+        if not p.in_board(board):
+            return f"Координаты корабля {ship} находятся за пределами игрового поля"
+        if occupied(p):
+            return f"Корабль {ship} пересекается с другим кораблем"
+    for p in ship.nearby:
+        if p.in_board(board) and occupied(p):
+            return f"Корабль {ship} касается другого корабля"
+    return ''
 
 
 # ---------------------------------
@@ -185,33 +214,33 @@ class SeaBattleGameBoard:
     Miss_Shot = 4
     Hit_Shot = 5
 
+    # результаты выстрела для стратегий компьютерного игрока
+    Shot_Miss = 0
+    Shot_Injured = 1
+    Shot_Killed = 2
+    Shot_Already = 3
+
     def __init__(self, size: int, ships: list[Ship]) -> None:
         self.__board_size = size
         self.__board = [[SeaBattleGameBoard.Sea_Spot for _ in range(self.__board_size)] for _ in range(self.__board_size)]
         self.__enemy_shots = [[SeaBattleGameBoard.Fog_Of_War for _ in range(self.__board_size)]
                               for _ in range(self.__board_size)]
         self.__ships = []
+        self.__ship_at = {}             # индекс занятости: клетка корабля -> корабль
         self.__alive_ships_count = 0
         for ship in ships:
             self.add_ship(ship)
 
-    # Добавляет корабль на поле
-    # Перед добавлением корабля делает следующие проверки:
-    #   - длина корабля должна быть 1, 2 или 3
-    #   - корабль должен располагаться внутри поля
-    #   - ToDo: расстояние от имеющихся кораблей должно составлять минимум одну клетку
+    # Добавляет корабль на поле, если он проходит проверки ship_error
     def add_ship(self, ship: Ship) -> bool:
-        if ship.size not in [1, 2, 3]:
-            print_error(f"Разрешены корабли длиной 1, 2 или 3 ({ship.size = })")
+        error = ship_error(self, ship, self.__ship_at.__contains__)
+        if error:
+            print_error(error)
             return False
 
-        for p in ship.body:
-            if not p.in_board(self):
-                print_error(f"Координаты корабля {ship} находятся за пределами игрового поля")
-                return False
-
         for p in ship.body:
             self.__board[p.x - 1][p.y - 1] = SeaBattleGameBoard.Ship_Body
+            self.__ship_at[p] = ship
         self.__ships.append(ship)
         self.__alive_ships_count += 1
 
@@ -247,28 +276,61 @@ class SeaBattleGameBoard:
         if (self.enemy_shots[shot.x - 1][shot.y - 1] not in
                 [SeaBattleGameBoard.Fog_Of_War, SeaBattleGameBoard.Ship_Neighbor]):
             raise ValueError
-        ret = None
-        for ship in self.__ships:
-            if ship.hit(shot):
-                self.enemy_shots[shot.x - 1][shot.y - 1] = SeaBattleGameBoard.Hit_Shot
-                ship.reduce(shot)
-                if ship.state == Ship.State_Injured:
-                    say_as_comp("Ранил")
-                elif ship.state == Ship.State_Killed:
-                    say_as_comp("Убил!")
-                    self.__alive_ships_count -= 1
-                    for p in ship.nearby:
-                        if p.in_board(self):
-                            if self.enemy_shots[p.x - 1][p.y - 1] == SeaBattleGameBoard.Fog_Of_War:
-                                self.enemy_shots[p.x - 1][p.y - 1] = SeaBattleGameBoard.Ship_Neighbor
-                ret = True
-                break
-        else:
-            say_as_comp("Мимо ))")
+        # корабль в клетке выстрела берется из индекса занятости, без перебора кораблей
+        ship = self.__ship_at.get(shot)
+        if ship is None:
+            gameEvents.emit(gameEvents.Msg_Miss, "Мимо ))", shot)
             self.enemy_shots[shot.x - 1][shot.y - 1] = SeaBattleGameBoard.Miss_Shot
-            ret = False
+            return False
 
-        return ret
+        self.enemy_shots[shot.x - 1][shot.y - 1] = SeaBattleGameBoard.Hit_Shot
+        ship.reduce(shot)
+        if ship.state == Ship.State_Injured:
+            gameEvents.emit(gameEvents.Msg_Injured, "Ранил", shot)
+        elif ship.state == Ship.State_Killed:
+            gameEvents.emit(gameEvents.Msg_Killed, "Убил!", shot)
+            self.__alive_ships_count -= 1
+            for p in ship.nearby:
+                if p.in_board(self):
+                    if self.enemy_shots[p.x - 1][p.y - 1] == SeaBattleGameBoard.Fog_Of_War:
+                        self.enemy_shots[p.x - 1][p.y - 1] = SeaBattleGameBoard.Ship_Neighbor
+        return True
+
+    # Заменяет отметки выстрелов противника (например, из снимка партии, см. gameState).
+    # Списки строк остаются прежними, меняется только их содержимое; состояние кораблей
+    # и количество живых кораблей пересчитываются по попаданиям
+    def load_shots(self, enemy_shots: list[list[int]]) -> None:
+        for row, marks in zip(self.__enemy_shots, enemy_shots):
+            row[:] = marks
+        self.__alive_ships_count = 0
+        for ship in self.__ships:
+            ship.restore(p for p in ship.body
+                         if self.__enemy_shots[p.x - 1][p.y - 1] != SeaBattleGameBoard.Hit_Shot)
+            if ship.state != Ship.State_Killed:
+                self.__alive_ships_count += 1
+
+
+# Случайная расстановка флота (см. fleetPlacement.FleetPlacer).
+# Если флот не помещается на поле, выбрасывает ValueError
+def random_fleet(board_size: int, ships_quantity: dict) -> list[Ship]:
+    try:
+        fleet = FleetPlacer(board_size, ships_quantity, rnd).place()
+    except ValueError as e:
+        print_error(str(e))
+        raise
+    return [Ship([Point(*cell_to_xy(c, board_size)) for c in ship.body]) for ship in fleet]
+
+
+# Проверка состава флота за O(количества кораблей): сколько кораблей каждой длины.
+# Возвращает текст ошибки или пустую строку
+def fleet_error(ships: list[Ship], ships_quantity: dict) -> str:
+    counts = {}
+    for ship in ships:
+        counts[ship.size] = counts.get(ship.size, 0) + 1
+    expected = {ship_size: n for ship_size, n in ships_quantity.items() if n}
+    if counts != expected:
+        return f"Состав флота {dict(sorted(counts.items()))} не совпадает с заданным {dict(sorted(expected.items()))}"
+    return ''
 
 
 # Класс Player, предназначенный для переопределения
@@ -286,6 +348,10 @@ class Player:
     def get_move(self) -> GameEvent:
         pass
 
+    # Ход для асинхронного цикла игры (см. gameAsync); по умолчанию - обычный get_move()
+    async def move(self) -> GameEvent:
+        return self.get_move()
+
     def congrats(self) -> str:
         return ''
 
@@ -327,12 +393,18 @@ class Player:
 
 
 class HumanPlayer(Player):
+    Prompt = "Введите координаты, разделенные пробелом (X Y), куда вы хотите выстрелить (q для выхода): "
+
     def __init__(self, name) -> None:
         super().__init__(name)
 
     # Подготовка кораблей в интерактивном режиме
-    # ToDo: пока не работет
+    # ToDo: пока не работет. Пока - готовая расстановка для стандартного флота,
+    # а для других полей и флотов - случайная
     def init_ships(self, board_size: int, ships_quantity: dict) -> list[Ship]:
+        if board_size < 6 or ships_quantity != SeaBattleGameLogic.Ships_Quantity:
+            gameEvents.emit(gameEvents.Msg_Info, f"Корабли игрока '{self.name}' расставлены случайно")
+            return random_fleet(board_size, ships_quantity)
         ships = [
             Ship([Point(5, 2), Point(5, 3), Point(5, 4)]),
             Ship([Point(1, 1), Point(1, 2)]),
@@ -347,112 +419,200 @@ class HumanPlayer(Player):
     # Получаем от пользователя его ход с обработкой различных исключений
     def get_move(self) -> GameEvent:
         while True:
-            print(f"Ход игрока '{self.name}'")
+            gameEvents.emit(gameEvents.Msg_Info, f"Ход игрока '{self.name}'")
+            gameEvents.flush()
             try:
-                str_ = input("Введите координаты, разделенные пробелом (X Y), "
-                             "куда вы хотите выстрелить (q для выхода): ")
+                str_ = input(HumanPlayer.Prompt)
             except KeyboardInterrupt:
                 return GameEvent(GameEvent.Event_Quit)
 
-            if not str_:
-                print("Не надо бояться - стреляете!")
-                continue
+            event = self.parse_move(str_)
+            if event is not None:
+                return event
+
+    # Ход из строки ввода; None - строка не годится (сообщение об этом уже выведено)
+    def parse_move(self, str_: str) -> GameEvent | None:
+        if not str_:
+            gameEvents.emit(gameEvents.Msg_Info, "Не надо бояться - стреляете!")
+            return None
+
+        if str_[0] == 'q':
+            return GameEvent(GameEvent.Event_Quit)
 
-            if str_[0] == 'q':
+        try:
+            x, y = map(int, str_.split())
+        except ValueError:
+            print_error(f"Непохоже, что вы указали верные координаты: '{str_}'")
+            gameEvents.emit(gameEvents.Msg_Info, "Попробуйте еще раз")
+            return None
+
+        shot = Point(x, y)
+        if not shot.in_board(self.board):
+            print_error(f"Вы стреляете в пустоту! Координаты ({x}, {y}) находятся за пределами "
+                        f"игрового поля {self.board.size}x{self.board.size}")
+            gameEvents.emit(gameEvents.Msg_Info, "Попробуйте еще раз")
+            return None
+        return GameEvent(GameEvent.Event_Shot, self, shot)
+
+    # input() блокирует, поэтому в асинхронной игре строки читает общий поток gameAsync.console_input,
+    # а ход ждет только очередную строку. При тайм-ауте хода отменяется это ожидание, и ничего
+    # не остается ждать ввода; строка, набранная после тайм-аута, следующим ходом не станет.
+    # Конец ввода - выход из игры
+    async def move(self) -> GameEvent:
+        from gameAsync import console_input
+        while True:
+            gameEvents.emit(gameEvents.Msg_Info, f"Ход игрока '{self.name}'")
+            gameEvents.flush()
+            str_ = await console_input.readline(HumanPlayer.Prompt)
+            if str_ is None:
                 return GameEvent(GameEvent.Event_Quit)
 
-            try:
-                x, y = map(int, str_.split())
-            except ValueError:
-                print_error(f"Непохоже, что вы указали верные координаты: '{str_}'")
-                print("Попробуйте еще раз")
-                continue
-
-            shot = Point(x, y)
-            if not shot.in_board(self.board):
-                print_error(f"Вы стреляете в пустоту! Координаты ({x}, {y}) находятся за пределами "
-                            f"игрового поля {self.board.size}x{self.board.size}")
-                print("Попробуйте еще раз")
-                continue
-            else:
-                return GameEvent(GameEvent.Event_Shot, self, shot)
+            event = self.parse_move(str_)
+            if event is not None:
+                return event
 
     def congrats(self) -> str:
         text = f"{self.name} поздравляю!\nВы победили!!"
         return text
 
 
+# Плоское представление enemy_shots для стратегий стрельбы:
+# view[cell] == board.enemy_shots[x - 1][y - 1], где cell = (x - 1) * size + (y - 1)
+class FlatShotsView:
+    def __init__(self, board: SeaBattleGameBoard) -> None:
+        self.__board = board
+
+    def __getitem__(self, cell: int) -> int:
+        return self.__board.enemy_shots[cell // self.__board.size][cell % self.__board.size]
+
+    def __len__(self) -> int:
+        return self.__board.size * self.__board.size
+
+
+# класс пула ходов: случайный выбор еще не использованной клетки и удаление любой клетки за O(1).
+# Клетки 0..n-1 образуют виртуальный массив, где удаленная клетка заменяется последней
+# (тасование Фишера-Йетса по одному шагу на выстрел). В словарях хранятся только переставленные
+# элементы и их позиции, поэтому пул не выделяет память под все поле
+class MovePool:
+    __slots__ = ('__count', '__moved', '__where')
+
+    def __init__(self, cells: int) -> None:
+        self.__count = cells
+        self.__moved = {}               # позиция -> клетка, если там не своя клетка
+        self.__where = {}               # клетка -> позиция, если клетка переставлена
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __contains__(self, cell: int) -> bool:
+        i = self.__where.get(cell, cell)
+        return i < self.__count and self.__moved.get(i, i) == cell
+
+    def __remove_at(self, i: int) -> int:
+        moved = self.__moved
+        where = self.__where
+        last = self.__count - 1
+        cell = moved.get(i, i)
+        tail = moved.pop(last, last)
+        where.pop(cell, None)
+        if i != last:
+            moved[i] = tail
+            where[tail] = i
+        self.__count = last
+        return cell
+
+    def pop(self) -> int:
+        return self.__remove_at(rnd.randrange(self.__count))
+
+    def discard(self, cell: int) -> None:
+        if cell in self:
+            self.__remove_at(self.__where.get(cell, cell))
+
+
 # класс компьютерного игрока
+# strategy - необязательная стратегия стрельбы (см. gameStrategies); без нее ходы выбираются случайно.
+# pause - ждать [Enter] перед каждым ходом в консольной игре
 class ComputerPlayer(Player):
-    def __init__(self, name) -> None:
+    def __init__(self, name, strategy=None, pause: bool = True) -> None:
         super().__init__(name)
-        self.__possible_moves = []
-
-    # Автоматическая генерация кораблей случайным образом
+        self.__possible_moves = MovePool(0)
+        self.__strategy = strategy
+        self.__pause = pause
+        self.__last_cell = None
+        self.__enemy_ships_count = 0
+        self.__ships_quantity = None    # флот партии - для стратегии
+
+    # Автоматическая генерация кораблей случайным образом (см. random_fleet).
+    # Если флот не помещается на поле, выбрасывает ValueError
     def init_ships(self, board_size: int, ships_quantity: dict) -> list[Ship]:
-        tmp_board = [[SeaBattleGameBoard.Fog_Of_War for _ in range(board_size)] for _ in range(board_size)]
-        ships = []
-
-        for ship_size in ships_quantity.keys():
-            # print(f"Генерим {ships_quantity[ship_size]} кораблей длиной {ship_size}:")
-            possible_ships = set()
-            for y in range(1, board_size + 1):
-                for x in range(1, board_size + 2 - ship_size):
-                    p = []
-                    for z in range(ship_size):
-                        p.append(Point(x + z, y))
-                    ship = Ship(p)
-                    possible_ships.add(ship)
-                    # print(f"{ship}")
-            # print("=========")
-            for x in range(1, board_size + 1):
-                for y in range(1, board_size +2 - ship_size):
-                    p = []
-                    for z in range(ship_size):
-                        p.append(Point(x, y + z))
-                    ship = Ship(p)
-                    possible_ships.add(ship)
-                    # print(f"{ship}")
-            list_of_candidates = list(possible_ships)
-
-            for _ in range(ships_quantity[ship_size]):
-                ship_found = False
-                while not ship_found:
-                    try:
-                        num = rnd.randint(0, len(list_of_candidates) - 1)
-                        ship = list_of_candidates[num]
-                        for p in ship.body:
-                            if tmp_board[p.x - 1][p.y - 1] != SeaBattleGameBoard.Fog_Of_War:
-                                # корабль пытается встать на занятые клетки
-                                break
-                        else:
-                            # корабль подходит
-                            # print(f">> Выбираем {num} из {len(list_of_candidates)}: {ship}")
-                            ships.append(ship)
-                            for p in ship.body:
-                                tmp_board[p.x - 1][p.y - 1] = SeaBattleGameBoard.Ship_Body
-                            for p in ship.nearby:
-                                if p.x in range(1, board_size + 1) and p.y in range(1, board_size + 1):
-                                    tmp_board[p.x - 1][p.y - 1] = SeaBattleGameBoard.Sea_Spot
-                            ship_found = True
-                    except IndexError as e:
-                        continue
-
-        return ships
+        self.__ships_quantity = ships_quantity
+        return random_fleet(board_size, ships_quantity)
 
     def generate_moves(self) -> None:
-        for y in rnd.sample(range(self.board.size), self.board.size):
-            for x in rnd.sample(range(self.board.size), self.board.size):
-                self.__possible_moves.append(Point(x + 1, y + 1))
+        self.__possible_moves = MovePool(self.board.size * self.board.size)
+        self.__last_cell = None
+        self.__enemy_ships_count = 0
 
     def get_move(self) -> GameEvent:
-        _ = input(f"Ход компьютера '{self.name}'\nНажмите [Enter] для продолжения...")
-        i = rnd.randint(0, len(self.__possible_moves) - 1)
-        shot = self.__possible_moves[i]
-        self.__possible_moves.pop(i)
-        print(f"{self.name} стреляет {shot}")
+        if self.__pause:
+            gameEvents.flush()
+            _ = input(f"Ход компьютера '{self.name}'\nНажмите [Enter] для продолжения...")
+        shot = self.choose_shot()
+        gameEvents.emit(gameEvents.Msg_Info, f"{self.name} стреляет {shot}", shot)
         return GameEvent(GameEvent.Event_Shot, self, shot)
 
+    # В асинхронном цикле компьютер ходит сразу, без ожидания [Enter] и без вывода на консоль
+    async def move(self) -> GameEvent:
+        return GameEvent(GameEvent.Event_Shot, self, self.choose_shot())
+
+    def choose_shot(self) -> Point:
+        if self.__strategy is not None:
+            return self.strategy_move()
+        board = self.enemy.board
+        if board.alive_ships_count < self.__enemy_ships_count:
+            self.prune_killed(board, self.__last_cell)
+        self.__enemy_ships_count = board.alive_ships_count
+        self.__last_cell = self.__possible_moves.pop()
+        return Point(*cell_to_xy(self.__last_cell, board.size))
+
+    # Последний выстрел убил корабль: клетки рядом с ним помечены Ship_Neighbor, стрелять туда незачем.
+    # Корабль - связные по сторонам попадания, начиная с клетки выстрела. Поле противника читается
+    # только здесь, т.е. один раз на убитый корабль
+    def prune_killed(self, board, cell: int) -> None:
+        size = board.size
+        shots = board.enemy_shots
+        ship = {cell}
+        stack = [cell]
+        while stack:
+            for c in cell_neighbors(stack.pop(), size):
+                mark = shots[c // size][c % size]
+                if mark == SeaBattleGameBoard.Ship_Neighbor:
+                    self.__possible_moves.discard(c)
+                elif mark == SeaBattleGameBoard.Hit_Shot and c not in ship:
+                    ship.add(c)
+                    stack.append(c)
+
+    # Ход по стратегии. Результат предыдущего выстрела стратегия узнает так же, как человек:
+    # по отметке на поле противника и по количеству его живых кораблей
+    def strategy_move(self) -> Point:
+        board = self.enemy.board
+        view = FlatShotsView(board)
+        if self.__last_cell is None:
+            self.__strategy.reset(board.size, self.__ships_quantity if self.__ships_quantity
+                                  else SeaBattleGameLogic.Ships_Quantity, view, rnd)
+        else:
+            mark = view[self.__last_cell]
+            if mark == SeaBattleGameBoard.Miss_Shot:
+                self.__strategy.observe(self.__last_cell, SeaBattleGameBoard.Shot_Miss)
+            elif mark == SeaBattleGameBoard.Hit_Shot:
+                self.__strategy.observe(self.__last_cell,
+                                        SeaBattleGameBoard.Shot_Killed
+                                        if board.alive_ships_count < self.__enemy_ships_count
+                                        else SeaBattleGameBoard.Shot_Injured)
+        self.__enemy_ships_count = board.alive_ships_count
+        self.__last_cell = self.__strategy.choose()
+        return Point(self.__last_cell // board.size + 1, self.__last_cell % board.size + 1)
+
     @property
     def board(self) -> SeaBattleGameBoard:
         return self.__board
@@ -462,6 +622,10 @@ class ComputerPlayer(Player):
         self.__board = board
         self.generate_moves()
 
+    @property
+    def strategy(self):
+        return self.__strategy
+
     def congrats(self) -> str:
         if self.enemy.__class__.__name__ == HumanPlayer:
             text = f"Увы, {self.enemy.name}, вы проиграли...\nЗаходите еще!"
@@ -479,14 +643,38 @@ class SeaBattleGameLogic:
         1: 4
     }
 
-    def __init__(self, size: int, player1: Player, player2: Player) -> None:
+    # board_class - реализация игрового поля: SeaBattleGameBoard или любая с тем же интерфейсом
+    # (например, bitBoard.BitGameBoard); ships_quantity - флот партии, по умолчанию Ships_Quantity.
+    # Расстановка каждого игрока проверяется за O(клеток флота): состав флота - fleet_error,
+    # границы, расстояние между кораблями - add_ship поля, прямолинейность - Ship.may_exist.
+    # Недопустимая расстановка - ValueError
+    def __init__(self, size: int, player1: Player, player2: Player, board_class=SeaBattleGameBoard,
+                 ships_quantity: dict = None) -> None:
         self.__board_size = size
+        self.__ships_quantity = ships_quantity if ships_quantity else self.Ships_Quantity
         self.__player1 = player1
         self.__player2 = player2
         self.__player1.enemy = self.__player2
         self.__player2.enemy = self.__player1
-        self.__player1.board = SeaBattleGameBoard(size, self.__player1.init_ships(size, self.Ships_Quantity))
-        self.__player2.board = SeaBattleGameBoard(size, self.__player2.init_ships(size, self.Ships_Quantity))
+        self.__player1.board = self.__setup_board(self.__player1, board_class)
+        self.__player2.board = self.__setup_board(self.__player2, board_class)
+
+    def __setup_board(self, player: Player, board_class):
+        ships = player.init_ships(self.__board_size, self.__ships_quantity)
+        error = fleet_error(ships, self.__ships_quantity)
+        if error:
+            print_error(f"{player.name}: {error}")
+            raise ValueError(error)
+        board = board_class(self.__board_size, ships)
+        if board.alive_ships_count != len(ships):
+            error = f"{player.name}: расстановка флота недопустима"
+            print_error(error)
+            raise ValueError(error)
+        return board
+
+    @property
+    def ships_quantity(self) -> dict:
+        return self.__ships_quantity
 
     @property
     def player1(self) -> Player:
@@ -505,12 +693,12 @@ class SeaBattleGameLogic:
                     event.player.last_shot_success = False
                     event.player.enemy.last_shot_success = True
         except ValueError:
-            print_error("Вы сюда уже стреляли!")
+            gameEvents.emit(gameEvents.Msg_Already, "Вы сюда уже стреляли!", event.data)
 
 
 if __name__ == "__main__":
     board_size = 6
     user = ComputerPlayer('Компутер')
-    user.board = SeaBattleGameBoard(board_size, user.init_ships())
+    user.board = SeaBattleGameBoard(board_size, user.init_ships(board_size, SeaBattleGameLogic.Ships_Quantity))
     print(user.name)
     print(user.board)
@@ -0,0 +1,147 @@
+import functools
+import time
+from bisect import bisect_left
+
+from gameLogic import Player, SeaBattleGameBoard, SeaBattleGameLogic
+
+
+# ============================================
+# Необязательные замеры горячих мест игры: количество вызовов, ошибок и гистограмма времени
+# для init_ships, get_move, incoming_shot, process_event (и ConsoleGameGui.draw, см. main.py).
+# Пока замеры выключены, код игры не меняется вовсе: enable() подменяет методы классов
+# обертками с замером, disable() возвращает исходные методы. Поэтому включать замеры нужно
+# после импорта всех классов игроков - методы подменяются у классов, известных в момент enable().
+# Результат - snapshot() (словарь), to_json() или to_prometheus() (текстовый формат Prometheus)
+
+# верхние границы корзин гистограммы, с
+Buckets = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+Bucket_Bounds_Ns = tuple(int(b * 1e9) for b in Buckets)
+
+
+# ---------------------------------
+# класс гистограммы времени вызовов одной функции
+class Histogram:
+    __slots__ = ('count', 'errors', 'total_ns', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.buckets = [0] * (len(Buckets) + 1)     # последняя корзина - больше Buckets[-1]
+
+    def observe(self, ns: int) -> None:
+        self.count += 1
+        self.total_ns += ns
+        self.buckets[bisect_left(Bucket_Bounds_Ns, ns)] += 1
+
+    def snapshot(self) -> dict:
+        cumulative = []
+        total = 0
+        for bound, n in zip(Buckets + (float('inf'),), self.buckets):
+            total += n
+            cumulative.append((bound, total))
+        return {'count': self.count, 'errors': self.errors, 'sum': self.total_ns / 1e9, 'buckets': cumulative}
+
+
+# замеряемые методы: (класс, имя метода, имя метрики). Для методов игроков берутся все подклассы Player
+_targets = [(SeaBattleGameBoard, 'incoming_shot', 'incoming_shot'),
+            (SeaBattleGameLogic, 'process_event', 'process_event'),
+            (Player, 'init_ships', 'init_ships'),
+            (Player, 'get_move', 'get_move')]
+_histograms = {}
+_originals = []                 # (класс, имя метода, исходный метод) подмененных методов
+
+
+def enabled() -> bool:
+    return bool(_originals)
+
+
+def histogram(name: str) -> Histogram:
+    if name not in _histograms:
+        _histograms[name] = Histogram()
+    return _histograms[name]
+
+
+def timed(func, hist: Histogram):
+    clock = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            hist.errors += 1
+            raise
+        finally:
+            hist.observe(clock() - start)
+    return wrapper
+
+
+def _subclasses(cls) -> list:
+    ret = [cls]
+    for sub in cls.__subclasses__():
+        ret.extend(_subclasses(sub))
+    return ret
+
+
+def _wrap(owner, attr: str, name: str) -> None:
+    for cls in _subclasses(owner):
+        # метод подменяется там, где он определен, иначе обертка наследника посчитала бы вызов дважды
+        if attr in cls.__dict__:
+            _originals.append((cls, attr, cls.__dict__[attr]))
+            setattr(cls, attr, timed(cls.__dict__[attr], histogram(name)))
+
+
+# Добавляет метод к замеряемым; если замеры уже включены, подменяет его сразу
+def instrument(owner, attr: str, name: str = None) -> None:
+    _targets.append((owner, attr, name if name else attr))
+    if enabled():
+        _wrap(owner, attr, name if name else attr)
+
+
+def enable() -> None:
+    if enabled():
+        return
+    for owner, attr, name in _targets:
+        _wrap(owner, attr, name)
+
+
+def disable() -> None:
+    while _originals:
+        cls, attr, method = _originals.pop()
+        setattr(cls, attr, method)
+
+
+def reset() -> None:
+    _histograms.clear()
+
+
+def snapshot() -> dict:
+    return {name: h.snapshot() for name, h in sorted(_histograms.items())}
+
+
+def to_json(indent: int = 2) -> str:
+    import json
+    data = snapshot()
+    for item in data.values():
+        item['buckets'] = {'+Inf' if bound == float('inf') else repr(bound): n for bound, n in item['buckets']}
+    return json.dumps(data, indent=indent)
+
+
+def to_prometheus(prefix: str = 'seabattle') -> str:
+    lines = [f"# HELP {prefix}_call_seconds Время вызова замеряемых функций игры",
+             f"# TYPE {prefix}_call_seconds histogram"]
+    data = snapshot()
+    for name, item in data.items():
+        for bound, n in item['buckets']:
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{prefix}_call_seconds_bucket{{function="{name}",le="{le}"}} {n}')
+        lines.append(f'{prefix}_call_seconds_sum{{function="{name}"}} {item["sum"]!r}')
+        lines.append(f'{prefix}_call_seconds_count{{function="{name}"}} {item["count"]}')
+    lines.append(f"# HELP {prefix}_call_errors_total Вызовы, завершившиеся исключением")
+    lines.append(f"# TYPE {prefix}_call_errors_total counter")
+    for name, item in data.items():
+        lines.append(f'{prefix}_call_errors_total{{function="{name}"}} {item["errors"]}')
+    return '\n'.join(lines) + '\n'
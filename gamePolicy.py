@@ -0,0 +1,288 @@
+import argparse
+import asyncio
+import random as rnd
+import time
+
+import numpy as np
+
+from fleetPlacement import FleetPlacer, cell_to_xy
+from gameConfig import check_config, parse_fleet
+from gameLogic import ComputerPlayer, GameEvent, Point, SeaBattleGameBoard, SeaBattleGameLogic
+from gameSimulation import SimBoard
+
+
+# ============================================
+# Игрок с обученной политикой выбора выстрела: небольшая полносвязная сеть (MLP; по умолчанию один скрытый
+# слой из 256 нейронов с ReLU, без скрытых слоев - линейная модель) на numpy предсказывает по наблюдению
+# (отметкам SeaBattleGameBoard.enemy_shots поля противника), в каких клетках стоят корабли,
+# и стреляет в клетку тумана войны с наибольшей оценкой.
+#
+# Наблюдение кодируется плотным вектором признаков encode(): по Feature_Channels признака на клетку
+# (туман, промах, попадание, сосед убитого, туман рядом с попаданием). Вход сети - пакет (B, признаки),
+# так что B наблюдений из разных партий считаются одним проходом - несколькими умножениями матриц.
+#
+# В асинхронном цикле игры (gameAsync) PolicyPlayer не считает ход сам, а ставит запрос в очередь
+# PolicyBatcher: запросы всех партий, пришедшие за один проход цикла событий, обрабатываются одним
+# пакетным проходом сети (тик). Веса хранятся в файле .npz (PolicyModel.save / PolicyModel.load).
+#
+# Обучение - на данных самоигры self_play(): партии топления флота текущей политикой (сначала -
+# случайной стрельбой); пример - наблюдение перед выстрелом и настоящая расстановка флота.
+# Запуск обучения: python gamePolicy.py --size 10 --games 2000 --rounds 3 --out policy_10.npz
+
+Feature_Channels = 5
+
+
+# Признаки пакета наблюдений marks (B, N) в кодировке SeaBattleGameBoard.enemy_shots -> (B, Feature_Channels * N)
+def encode(marks: np.ndarray, board_size: int) -> np.ndarray:
+    marks = marks.reshape(-1, board_size, board_size)
+    fog = marks == SeaBattleGameBoard.Fog_Of_War
+    hit = marks == SeaBattleGameBoard.Hit_Shot
+    near = np.zeros_like(hit)
+    near[:, 1:, :] |= hit[:, :-1, :]
+    near[:, :-1, :] |= hit[:, 1:, :]
+    near[:, :, 1:] |= hit[:, :, :-1]
+    near[:, :, :-1] |= hit[:, :, 1:]
+    features = np.stack([fog, marks == SeaBattleGameBoard.Miss_Shot, hit, marks == SeaBattleGameBoard.Ship_Neighbor,
+                         fog & near], axis=1)
+    return features.reshape(len(marks), -1).astype(np.float32)
+
+
+# ---------------------------------
+# класс модели политики: слои (W, b), скрытые слои с ReLU, выход - оценка (логит) корабля в каждой клетке
+class PolicyModel:
+    def __init__(self, board_size: int, layers: list[tuple[np.ndarray, np.ndarray]]) -> None:
+        cells = board_size * board_size
+        if layers[0][0].shape[0] != Feature_Channels * cells or layers[-1][0].shape[1] != cells:
+            raise ValueError(f"Слои модели не подходят для поля {board_size}x{board_size}")
+        self.__board_size = board_size
+        self.__layers = [(np.asarray(w, dtype=np.float32), np.asarray(b, dtype=np.float32)) for w, b in layers]
+
+    # Модель со случайными весами; hidden - размеры скрытых слоев (пустой - линейная модель)
+    @classmethod
+    def create(cls, board_size: int, hidden: tuple = (256,), seed: int = 0):
+        rng = np.random.default_rng(seed)
+        sizes = [Feature_Channels * board_size * board_size, *hidden, board_size * board_size]
+        layers = [(rng.standard_normal((n_in, n_out), dtype=np.float32) * np.float32((2 / n_in) ** 0.5),
+                   np.zeros(n_out, dtype=np.float32)) for n_in, n_out in zip(sizes, sizes[1:])]
+        return cls(board_size, layers)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            count = sum(1 for name in data.files if name.startswith('w'))
+            return cls(int(data['board_size']), [(data[f'w{i}'], data[f'b{i}']) for i in range(count)])
+
+    def save(self, path: str) -> None:
+        weights = {f'w{i}': w for i, (w, _) in enumerate(self.__layers)}
+        weights.update({f'b{i}': b for i, (_, b) in enumerate(self.__layers)})
+        with open(path, 'wb') as f:
+            np.savez(f, board_size=self.__board_size, **weights)
+
+    @property
+    def board_size(self) -> int:
+        return self.__board_size
+
+    @property
+    def layers(self) -> list[tuple[np.ndarray, np.ndarray]]:
+        return self.__layers
+
+    # Логиты (B, N) по признакам (B, Feature_Channels * N)
+    def forward(self, features: np.ndarray) -> np.ndarray:
+        h = features
+        for w, b in self.__layers[:-1]:
+            h = np.maximum(h @ w + b, 0)
+        w, b = self.__layers[-1]
+        return h @ w + b
+
+    # Выстрелы для пакета наблюдений marks (B, N): клетка тумана войны с наибольшим логитом
+    # (при равенстве - с меньшим номером)
+    def choose(self, marks: np.ndarray) -> np.ndarray:
+        logits = self.forward(encode(marks, self.__board_size))
+        logits[marks != SeaBattleGameBoard.Fog_Of_War] = -np.inf
+        return np.argmax(logits, axis=1)
+
+    # Обучение (Adam, бинарная кросс-энтропия по клеткам тумана войны): marks (M, N) - наблюдения,
+    # targets (M, N) - есть ли в клетке корабль. Возвращает средние потери каждой эпохи
+    def fit(self, marks: np.ndarray, targets: np.ndarray, epochs: int = 2, batch: int = 256,
+            lr: float = 1e-3, seed: int = 0) -> list[float]:
+        rng = np.random.default_rng(seed)
+        params = [p for layer in self.__layers for p in layer]
+        moments = [np.zeros_like(p) for p in params]
+        squares = [np.zeros_like(p) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        step = 0
+        losses = []
+        for _ in range(epochs):
+            order = rng.permutation(len(marks))
+            total = 0.0
+            for start in range(0, len(order), batch):
+                rows = order[start:start + batch]
+                x = encode(marks[rows], self.__board_size)
+                y = targets[rows].astype(np.float32)
+                mask = (marks[rows] == SeaBattleGameBoard.Fog_Of_War).astype(np.float32)
+                # прямой проход с сохранением активаций
+                activations = [x]
+                for w, b in self.__layers[:-1]:
+                    activations.append(np.maximum(activations[-1] @ w + b, 0))
+                w, b = self.__layers[-1]
+                logits = activations[-1] @ w + b
+                p = 1 / (1 + np.exp(-logits))
+                count = max(mask.sum(), 1.0)
+                total += float(-(mask * (y * np.log(p + 1e-7) + (1 - y) * np.log(1 - p + 1e-7))).sum() / count)
+                # обратный проход
+                grad = (p - y) * mask / count
+                grads = []
+                for i in range(len(self.__layers) - 1, -1, -1):
+                    w, _ = self.__layers[i]
+                    grads.append((activations[i].T @ grad, grad.sum(axis=0)))
+                    if i:
+                        grad = (grad @ w.T) * (activations[i] > 0)
+                grads = [g for layer in reversed(grads) for g in layer]
+                step += 1
+                for param, g, m, v in zip(params, grads, moments, squares):
+                    m *= beta1
+                    m += (1 - beta1) * g
+                    v *= beta2
+                    v += (1 - beta2) * g * g
+                    param -= lr * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+            losses.append(total / -(-len(order) // batch))
+        return losses
+
+
+# ---------------------------------
+# Самоигра: games партий топления случайно расставленного флота, все партии идут одновременно,
+# и на каждом шаге выстрелы всех незаконченных партий выбираются одним пакетным проходом model
+# (без модели - случайная стрельба; epsilon - доля случайных выстрелов для разнообразия данных).
+# Возвращает наблюдения перед каждым выстрелом (M, N), расстановки флота для них (M, N)
+# и количество выстрелов до победы в каждой партии
+def self_play(model, board_size: int, ships_quantity: dict, games: int, seed: int = 0,
+              epsilon: float = 0.0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    random = rnd.Random(seed)
+    rng = np.random.default_rng(seed)
+    placer = FleetPlacer(board_size, ships_quantity, random)
+    boards = [SimBoard(board_size, placer.place()) for _ in range(games)]
+    ships = np.array([board.ship_at for board in boards]) >= 0
+    shots = np.zeros(games, dtype=np.int32)
+    observations = []
+    rows = []
+    active = np.arange(games)
+    while len(active):
+        marks = np.array([boards[g].shots for g in active], dtype=np.uint8)
+        observations.append(marks)
+        rows.append(active)
+        priority = rng.random(marks.shape)
+        priority[marks != SeaBattleGameBoard.Fog_Of_War] = -1
+        cells = np.argmax(priority, axis=1)
+        if model is not None:
+            greedy = rng.random(len(active)) >= epsilon
+            if greedy.any():
+                cells[greedy] = model.choose(marks[greedy])
+        for g, c in zip(active.tolist(), cells.tolist()):
+            boards[g].incoming_shot(c)
+        shots[active] += 1
+        active = active[np.array([boards[g].alive_ships_count > 0 for g in active.tolist()], dtype=bool)]
+    return np.concatenate(observations), ships[np.concatenate(rows)].astype(np.uint8), shots
+
+
+# ---------------------------------
+# класс очереди запросов хода: запросы всех партий, пришедшие за один проход цикла событий asyncio,
+# обрабатываются одним пакетным проходом модели (тиком). Тик назначается на следующий проход цикла
+# при первом запросе; если в очереди набралось max_batch запросов, тик выполняется сразу
+class PolicyBatcher:
+    def __init__(self, model: PolicyModel, max_batch: int = 1024) -> None:
+        self.__model = model
+        self.__max_batch = max_batch
+        self.__pending = []
+        self.__scheduled = False
+        self.ticks = 0
+        self.moves = 0
+
+    @property
+    def model(self) -> PolicyModel:
+        return self.__model
+
+    # Ставит наблюдение (N,) в очередь; результат - Future с клеткой выстрела
+    def request(self, observation: np.ndarray) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__pending.append((observation, future))
+        if len(self.__pending) >= self.__max_batch:
+            self.tick()
+        elif not self.__scheduled:
+            self.__scheduled = True
+            loop.call_soon(self.__scheduled_tick)
+        return future
+
+    def __scheduled_tick(self) -> None:
+        self.__scheduled = False
+        self.tick()
+
+    def tick(self) -> None:
+        pending = self.__pending
+        if not pending:
+            return
+        self.__pending = []
+        cells = self.__model.choose(np.stack([observation for observation, _ in pending]))
+        for (_, future), cell in zip(pending, cells.tolist()):
+            if not future.done():
+                future.set_result(cell)
+        self.ticks += 1
+        self.moves += len(pending)
+
+
+# ---------------------------------
+# класс компьютерного игрока с политикой model. В асинхронном цикле игры ход запрашивается через
+# batcher (общий для многих партий), без него и в обычной игре - отдельным проходом модели
+class PolicyPlayer(ComputerPlayer):
+    def __init__(self, name, model: PolicyModel, batcher: PolicyBatcher = None, pause: bool = True) -> None:
+        super().__init__(name, pause=pause)
+        self.__model = model
+        self.__batcher = batcher
+
+    # Наблюдение - отметки поля противника, плоский массив (N,)
+    def observation(self) -> np.ndarray:
+        return np.asarray(self.enemy.board.enemy_shots, dtype=np.uint8).reshape(-1)
+
+    def choose_shot(self) -> Point:
+        cell = int(self.__model.choose(self.observation()[None])[0])
+        return Point(*cell_to_xy(cell, self.enemy.board.size))
+
+    async def move(self) -> GameEvent:
+        if self.__batcher is None:
+            return GameEvent(GameEvent.Event_Shot, self, self.choose_shot())
+        cell = await self.__batcher.request(self.observation())
+        return GameEvent(GameEvent.Event_Shot, self, Point(*cell_to_xy(cell, self.enemy.board.size)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Обучение политики выбора выстрела на данных самоигры")
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--fleet', type=str, default=None, help="флот, например 4:1,3:2,2:3,1:4")
+    parser.add_argument('--games', type=int, default=2000, help="партий самоигры в каждом раунде")
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--hidden', type=int, nargs='*', default=[256], help="размеры скрытых слоев")
+    parser.add_argument('--epsilon', type=float, default=0.1, help="доля случайных выстрелов в самоигре")
+    parser.add_argument('--weights', type=str, default=None, help="начальные веса (файл .npz)")
+    parser.add_argument('--out', type=str, default=None, help="файл весов (по умолчанию policy_<размер>.npz)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    fleet = parse_fleet(args.fleet) if args.fleet else dict(SeaBattleGameLogic.Ships_Quantity)
+    check_config(args.size, fleet)
+    out = args.out if args.out else f"policy_{args.size}.npz"
+    policy = PolicyModel.load(args.weights) if args.weights else PolicyModel.create(args.size, tuple(args.hidden),
+                                                                                    args.seed)
+    player = policy if args.weights else None
+    _, _, baseline = self_play(None, args.size, fleet, 500, args.seed + 1_000_000)
+    print(f"Поле {args.size}x{args.size}, флот {fleet}; случайная стрельба: {baseline.mean():.2f} выстрелов до победы")
+    for r in range(args.rounds):
+        start_time = time.perf_counter()
+        data, ships_data, _ = self_play(player, args.size, fleet, args.games, args.seed + r, args.epsilon)
+        losses = policy.fit(data, ships_data, args.epochs, seed=args.seed + r)
+        player = policy
+        _, _, shots_count = self_play(policy, args.size, fleet, 500, args.seed + 1_000_000)
+        print(f"раунд {r + 1}: примеров {len(data)}, потери {losses[-1]:.4f}, "
+              f"выстрелов до победы {shots_count.mean():.2f}, {time.perf_counter() - start_time:.1f} с")
+    policy.save(out)
+    print(f"Веса сохранены в {out}")
@@ -0,0 +1,283 @@
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+from fleetPlacement import cell_to_xy
+from gameLogic import GameEvent, Player, Point, Ship, SeaBattleGameBoard, SeaBattleGameLogic
+from gameSimulation import HeadlessSimulation, RandomShots, ShotStrategy
+from gameState import board_fleet
+
+
+# ============================================
+# Запись партий в компактном двоичном формате и их воспроизведение.
+#
+# Файл записей - заголовок File_Magic и записи подряд; файл только дописывается.
+# Запись партии (все числа little-endian):
+#   Header  '<IQHBHHI' длина записи в байтах, зерно, размер поля, победитель (0 - партия не закончена),
+#           количество кораблей первого и второго игрока, количество выстрелов
+#   корабли обоих игроков: начальная клетка и код (длина << 1 | вертикальный) - один байт на полях
+#           меньше 128x128, где корабль короче 128 клеток, иначе 2 или 4 байта (ship_format)
+#   выстрелы: только клетки, в порядке выстрелов. Кто стрелял, не хранится - это однозначно следует
+#   из правил (попавший стреляет еще раз) и восстанавливается при воспроизведении.
+# Клетка - cell = (x - 1) * size + (y - 1) шириной 1, 2 или 4 байта в зависимости от размера поля,
+# т.е. на поле до 15x15 выстрел занимает один байт. Наибольшее число этой ширины (No_Shot) вместо клетки -
+# тайм-аут хода в AsyncGame: выстрела не было, ход перешел к противнику.
+#
+# Зерно - беззнаковое 64-битное число, другие зерна RecordWriter не записывает (ValueError).
+#
+# Рядом лежит индекс path + '.idx' - смещения записей как массив uint64; через mmap
+# он дает переход к партии номер N без чтения предыдущих
+
+File_Magic = b'SBR1'
+Header = struct.Struct('<IQHBHHI')
+Offset = struct.Struct('<Q')
+
+# запись одной партии: флоты - по списку кораблей на игрока, корабль - кортеж клеток
+GameRecord = namedtuple('GameRecord', ['seed', 'board_size', 'winner', 'fleets', 'shots'])
+
+
+def cell_format(board_size: int) -> str:
+    cells = board_size * board_size
+    return 'B' if cells < 0xFF else 'H' if cells < 0xFFFF else 'I'
+
+
+# Ширина кода корабля: корабль не длиннее стороны поля, код - до 2 * size + 1
+def ship_format(board_size: int) -> str:
+    code = 2 * board_size + 1
+    return 'B' if code <= 0xFF else 'H' if code <= 0xFFFF else 'I'
+
+
+def no_shot(board_size: int) -> int:
+    return (1 << 8 * struct.calcsize(cell_format(board_size))) - 1
+
+
+def index_path(path: str) -> str:
+    return path + '.idx'
+
+
+def encode(record: GameRecord) -> bytes:
+    size = record.board_size
+    fmt = cell_format(size)
+    ships = []
+    for fleet in record.fleets:
+        for body in fleet:
+            start = min(body)
+            vertical = len(body) > 1 and max(body) - start >= size
+            ships.append(start)
+            ships.append(len(body) << 1 | vertical)
+    fleet1, fleet2 = record.fleets
+    body = struct.pack('<' + (fmt + ship_format(size)) * (len(fleet1) + len(fleet2)), *ships)
+    body += struct.pack(f'<{len(record.shots)}{fmt}', *record.shots)
+    return Header.pack(Header.size + len(body), record.seed, size, record.winner,
+                       len(fleet1), len(fleet2), len(record.shots)) + body
+
+
+def decode(data, offset: int = 0) -> tuple[GameRecord, int]:
+    length, seed, size, winner, ships1, ships2, shots = Header.unpack_from(data, offset)
+    fmt = cell_format(size)
+    pos = offset + Header.size
+    ships_format = '<' + (fmt + ship_format(size)) * (ships1 + ships2)
+    ships = struct.unpack_from(ships_format, data, pos)
+    pos += struct.calcsize(ships_format)
+    fleets = ([], [])
+    for i in range(ships1 + ships2):
+        start, code = ships[2 * i], ships[2 * i + 1]
+        step = size if code & 1 else 1
+        fleets[i >= ships1].append(tuple(start + z * step for z in range(code >> 1)))
+    cells = struct.unpack_from(f'<{shots}{fmt}', data, pos)
+    return GameRecord(seed, size, winner, fleets, cells), offset + length
+
+
+# ---------------------------------
+# класс записи партий: дописывает записи в файл и смещения в индекс
+class RecordWriter:
+    def __init__(self, path: str) -> None:
+        self.__data = open(path, 'ab')
+        self.__index = open(index_path(path), 'ab')
+        if not self.__data.tell():
+            self.__data.write(File_Magic)
+
+    # Запись кодируется целиком до записи в файлы, поэтому ошибка не оставляет в индексе лишнего смещения
+    def write(self, record: GameRecord) -> None:
+        if not 0 <= record.seed < 1 << 64:
+            raise ValueError(f"Зерно партии {record.seed} не помещается в запись: нужно число от 0 до 2**64 - 1")
+        data = encode(record)
+        self.__index.write(Offset.pack(self.__data.tell()))
+        self.__data.write(data)
+
+    def close(self) -> None:
+        self.__data.close()
+        self.__index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+# ---------------------------------
+# класс чтения файла записей через mmap: потоковый перебор без загрузки файла в память
+# и переход к партии номер N по индексу
+class RecordReader:
+    def __init__(self, path: str) -> None:
+        self.__file = open(path, 'rb')
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__data[:len(File_Magic)] != File_Magic:
+            self.__data.close()
+            self.__file.close()
+            raise ValueError(f"'{path}' - не файл записей партий")
+        if not os.path.exists(index_path(path)):
+            rebuild_index(path)
+        self.__index_file = open(index_path(path), 'rb')
+        self.__index = mmap.mmap(self.__index_file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.fstat(self.__index_file.fileno()).st_size else b''
+
+    def __len__(self) -> int:
+        return len(self.__index) // Offset.size
+
+    def __getitem__(self, n: int) -> GameRecord:
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError(n)
+        offset, = Offset.unpack_from(self.__index, n * Offset.size)
+        return decode(self.__data, offset)[0]
+
+    def __iter__(self):
+        data = self.__data
+        offset = len(File_Magic)
+        while offset < len(data):
+            record, offset = decode(data, offset)
+            yield record
+
+    def close(self) -> None:
+        if isinstance(self.__index, mmap.mmap):
+            self.__index.close()
+        self.__index_file.close()
+        self.__data.close()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+# Индекс строится заново одним проходом по длинам записей (например, если файл скопировали без него)
+def rebuild_index(path: str) -> int:
+    count = 0
+    with open(path, 'rb') as f, open(index_path(path), 'wb') as index:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            offset = len(File_Magic)
+            while offset < len(data):
+                index.write(Offset.pack(offset))
+                offset += Header.unpack_from(data, offset)[0]
+                count += 1
+        finally:
+            data.close()
+    return count
+
+
+# ---------------------------------
+# Воспроизведение: игрок, который расставляет записанный флот
+class ReplayPlayer(Player):
+    def __init__(self, name, fleet: list[tuple], board_size: int) -> None:
+        super().__init__(name)
+        self.__ships = [Ship([Point(*cell_to_xy(c, board_size)) for c in body]) for body in fleet]
+
+    def init_ships(self, board_size: int, ships_quantity: dict) -> list[Ship]:
+        return self.__ships
+
+
+# Генератор событий партии: заново проводит записанные выстрелы через SeaBattleGameLogic
+# и после каждого выдает обработанный GameEvent, в конце - Event_Win, если в партии есть победитель.
+# Стреляет тот игрок, чей ход по правилам: попавший стреляет еще раз; тайм-аут передает ход, как в AsyncGame
+def replay(record: GameRecord, board_class=SeaBattleGameBoard):
+    size = record.board_size
+    timeout = no_shot(size)
+    # флот партии восстанавливается по длинам записанных кораблей
+    fleet = {}
+    for body in record.fleets[0]:
+        fleet[len(body)] = fleet.get(len(body), 0) + 1
+    logic = SeaBattleGameLogic(size, ReplayPlayer("Игрок 1", record.fleets[0], size),
+                               ReplayPlayer("Игрок 2", record.fleets[1], size), board_class, fleet)
+    player1, player2 = logic.player1, logic.player2
+    for cell in record.shots:
+        player = player1 if player1.last_shot_success else player2
+        if cell == timeout:
+            player.last_shot_success = False
+            player.enemy.last_shot_success = True
+            yield GameEvent(GameEvent.Event_Timeout, player)
+            continue
+        event = GameEvent(GameEvent.Event_Shot, player, Point(*cell_to_xy(cell, size)))
+        logic.process_event(event)
+        yield event
+        if player.is_winner:
+            yield GameEvent(GameEvent.Event_Win, player)
+            return
+
+
+# ---------------------------------
+# класс записи партии SeaBattleGameLogic: флоты берутся с полей игроков, выстрелы - из process_event.
+# Подключается к AsyncGame(logic, on_event=recorder.on_event, process_event=recorder.process_event);
+# on_event нужен только для записи тайм-аутов
+class GameRecorder:
+    def __init__(self, logic: SeaBattleGameLogic, seed: int = 0) -> None:
+        self.__logic = logic
+        self.__seed = seed
+        self.__size = logic.player1.board.size
+        self.__fleets = (board_fleet(logic.player1.board), board_fleet(logic.player2.board))
+        self.__shots = []
+
+    def process_event(self, event: GameEvent) -> None:
+        if event.type == GameEvent.Event_Shot:
+            self.__shots.append((event.data.x - 1) * self.__size + (event.data.y - 1))
+        self.__logic.process_event(event)
+
+    def on_event(self, event: GameEvent) -> None:
+        if event.type == GameEvent.Event_Timeout:
+            self.__shots.append(no_shot(self.__size))
+
+    def record(self) -> GameRecord:
+        logic = self.__logic
+        winner = 1 if logic.player1.is_winner else 2 if logic.player2.is_winner else 0
+        return GameRecord(self.__seed, self.__size, winner, self.__fleets, tuple(self.__shots))
+
+
+# ---------------------------------
+# Запись партий безголовой симуляции: стратегии оборачиваются так, чтобы каждый выбранный
+# выстрел попадал в общий журнал в порядке выстрелов
+class LoggedShots(ShotStrategy):
+    def __init__(self, strategy: ShotStrategy, log: list) -> None:
+        self.__strategy = strategy
+        self.__log = log
+
+    def reset(self, board_size: int, ships_quantity: dict, observation, rng) -> None:
+        self.__strategy.reset(board_size, ships_quantity, observation, rng)
+
+    def choose(self) -> int:
+        cell = self.__strategy.choose()
+        self.__log.append(cell)
+        return cell
+
+    def observe(self, cell: int, result: int) -> None:
+        self.__strategy.observe(cell, result)
+
+    def take(self, cell: int) -> None:
+        self.__strategy.take(cell)
+
+
+def record_simulation(writer: RecordWriter, games: int, board_size: int, strategy1: ShotStrategy = None,
+                      strategy2: ShotStrategy = None, ships_quantity: dict = None, base_seed: int = 0) -> None:
+    log = []
+    sim = HeadlessSimulation(board_size, LoggedShots(strategy1 if strategy1 else RandomShots(), log),
+                             LoggedShots(strategy2 if strategy2 else RandomShots(), log), ships_quantity)
+    for i in range(games):
+        log.clear()
+        result = sim.play(base_seed + i)
+        writer.write(GameRecord(result.seed, board_size, result.winner,
+                                tuple([ship.body for ship in fleet] for fleet in sim.fleets), tuple(log)))
@@ -0,0 +1,281 @@
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+
+from gameConfig import Player_Types, fleet_spec
+from gameLogic import ComputerPlayer, HumanPlayer, SeaBattleGameBoard, SeaBattleGameLogic
+from gameSimulation import GameResult
+
+
+# ============================================
+# Хранилище результатов партий (SQLite): турниры, безголовые симуляции и партии SeaBattleGameLogic.
+#
+# Схема: configs - сочетания (тип первого игрока, тип второго игрока, размер поля, флот), по одной строке
+# на сочетание; results - партии: номер сочетания, зерно, победитель (1 или 2), выстрелы каждого игрока
+# и количество ходов (NULL, если неизвестно). Строки партий узкие (только целые числа), поэтому
+# 10 млн партий занимают сотни мегабайт, а не гигабайты.
+# Индексы под частые запросы:
+#   results_by_config (config, winner, shots1, shots2) - покрывающий индекс для доли побед по парам
+#                      и распределения выстрелов до победы: запросы читают только индекс, не таблицу;
+#   results_by_seed   (seed) - поиск партии по зерну (например, чтобы переиграть ее).
+#
+# ResultWriter пишет потоково: add() только кладет строку в буфер, а полные пачки по batch строк
+# вставляет в базу фоновый поток - одной транзакцией executemany на пачку. Симуляция ждет
+# только если фоновый поток отстал больше чем на max_pending пачек.
+# Вставка в случайном порядке ключей перестраивает индекс results_by_config, и на миллионах строк
+# это дороже самой вставки. Для массовой загрузки (bulk=True) писатель удаляет индексы и строит их
+# заново при закрытии - одной сортировкой; пока идет загрузка, запросы к базе не используют индексы.
+# На время загрузки в базе стоит отметка PRAGMA user_version = Bulk_Load, и connect() других соединений
+# индексы не создает; без отметки connect() создает только недостающие индексы
+
+# строка результата: типы игроков, размер поля, флот ("длина:количество,..."), зерно, победитель,
+# выстрелы каждого игрока, ходы
+GameRow = namedtuple('GameRow', ['player1', 'player2', 'board_size', 'fleet', 'seed', 'winner',
+                                 'shots1', 'shots2', 'turns'])
+
+Schema = '''
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY,
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    board_size INTEGER NOT NULL,
+    fleet TEXT NOT NULL,
+    UNIQUE (player1, player2, board_size, fleet)
+);
+CREATE TABLE IF NOT EXISTS results (
+    config INTEGER NOT NULL REFERENCES configs (id),
+    seed INTEGER,
+    winner INTEGER NOT NULL,
+    shots1 INTEGER NOT NULL,
+    shots2 INTEGER NOT NULL,
+    turns INTEGER
+);
+'''
+
+Indexes = '''
+CREATE INDEX IF NOT EXISTS results_by_config ON results (config, winner, shots1, shots2);
+CREATE INDEX IF NOT EXISTS results_by_seed ON results (seed);
+'''
+
+Drop_Indexes = '''
+DROP INDEX IF EXISTS results_by_config;
+DROP INDEX IF EXISTS results_by_seed;
+'''
+
+Index_Names = ('results_by_config', 'results_by_seed')
+
+# user_version базы, пока идет массовая загрузка
+Bulk_Load = 1
+
+# кэш страниц соединения писателя, КБ (отрицательное значение cache_size в SQLite - размер в КБ)
+Writer_Cache = 65536
+
+# выстрелы победителя
+_Winner_Shots = "CASE r.winner WHEN 1 THEN r.shots1 ELSE r.shots2 END"
+
+
+# Строка из результата безголовой симуляции (gameSimulation.GameResult)
+def row_from_result(result: GameResult, player1: str, player2: str, board_size: int, fleet: dict) -> GameRow:
+    return GameRow(player1, player2, board_size, fleet_spec(fleet), result.seed, result.winner,
+                   result.shots1, result.shots2, result.turns)
+
+
+# Тип игрока по gameConfig.Player_Types, те же имена, что у play.py и турнира: 'human', 'computer'
+# (компьютер без стратегии) или тип стратегии; стратегия не из Player_Types - по имени ее класса
+def player_type(player) -> str:
+    if isinstance(player, HumanPlayer):
+        return 'human'
+    strategy = getattr(player, 'strategy', None)
+    if strategy is None:
+        return 'computer' if isinstance(player, ComputerPlayer) else type(player).__name__
+    key = (type(strategy).__module__, type(strategy).__name__)
+    return next((kind for kind, path in Player_Types.items() if path == key), type(strategy).__name__)
+
+
+def shots_at(board) -> int:
+    return sum(1 for row in board.enemy_shots for mark in row
+               if mark == SeaBattleGameBoard.Miss_Shot or mark == SeaBattleGameBoard.Hit_Shot)
+
+
+# Строка из законченной партии SeaBattleGameLogic: победитель - тот, у кого is_winner (как в Player.congrats),
+# выстрелы игрока - отметки промахов и попаданий на поле противника. Ходы неизвестны.
+# Типы игроков без явных имен - player_type
+def row_from_logic(logic: SeaBattleGameLogic, seed: int = None, player1: str = None, player2: str = None) -> GameRow:
+    first, second = logic.player1, logic.player2
+    if first.is_winner:
+        winner = 1
+    elif second.is_winner:
+        winner = 2
+    else:
+        raise ValueError("Партия не закончена")
+    return GameRow(player1 if player1 else player_type(first), player2 if player2 else player_type(second),
+                   first.board.size, fleet_spec(logic.ships_quantity), seed, winner,
+                   shots_at(second.board), shots_at(first.board), None)
+
+
+def connect(path: str, indexes: bool = True) -> sqlite3.Connection:
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.executescript(Schema)
+    if indexes and not bulk_loading(connection):
+        existing = {name for name, in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        if not existing.issuperset(Index_Names):
+            connection.executescript(Indexes)
+    return connection
+
+
+def bulk_loading(connection: sqlite3.Connection) -> bool:
+    return connection.execute("PRAGMA user_version").fetchone()[0] == Bulk_Load
+
+
+# ---------------------------------
+# класс потокового писателя результатов
+class ResultWriter:
+    def __init__(self, path: str, batch: int = 100000, max_pending: int = 8, bulk: bool = False) -> None:
+        self.__path = path
+        self.__batch = batch
+        self.__bulk = bulk
+        self.__rows = []
+        self.__queue = queue.Queue(max_pending)
+        self.__error = None
+        self.written = 0
+        self.__thread = threading.Thread(target=self.__work, name='ResultWriter', daemon=True)
+        self.__thread.start()
+
+    def add(self, row: GameRow) -> None:
+        self.__rows.append(row)
+        if len(self.__rows) >= self.__batch:
+            self.flush()
+
+    def add_many(self, rows) -> None:
+        self.__rows.extend(rows)
+        if len(self.__rows) >= self.__batch:
+            self.flush()
+
+    # Отдает накопленные строки фоновому потоку (не дожидаясь записи)
+    def flush(self) -> None:
+        if self.__error is not None:
+            raise self.__error
+        if self.__rows:
+            self.__queue.put(self.__rows)
+            self.__rows = []
+
+    # Записывает все строки и ждет окончания записи. Поток останавливается и тогда, когда запись
+    # не удалась: ошибка фонового потока выбрасывается после его остановки
+    def close(self) -> None:
+        if self.__thread.is_alive():
+            try:
+                self.flush()
+            finally:
+                self.__rows = []
+                self.__queue.put(None)
+                self.__thread.join()
+        if self.__error is not None:
+            raise self.__error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    # фоновый поток: соединение SQLite создается и используется только здесь
+    def __work(self) -> None:
+        connection = None
+        try:
+            connection = connect(self.__path, not self.__bulk)
+            connection.execute(f"PRAGMA cache_size = -{Writer_Cache}")
+            if self.__bulk:
+                connection.executescript(f"PRAGMA user_version = {Bulk_Load};" + Drop_Indexes)
+            configs = {tuple(row[1:]): row[0] for row in
+                       connection.execute("SELECT id, player1, player2, board_size, fleet FROM configs")}
+            while True:
+                rows = self.__queue.get()
+                if rows is None:
+                    break
+                with connection:
+                    for row in rows:
+                        key = row[:4]
+                        if key not in configs:
+                            configs[key] = connection.execute(
+                                "INSERT INTO configs (player1, player2, board_size, fleet) VALUES (?, ?, ?, ?)",
+                                key).lastrowid
+                    connection.executemany(
+                        "INSERT INTO results (config, seed, winner, shots1, shots2, turns) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", [(configs[row[:4]],) + row[4:] for row in rows])
+                self.written += len(rows)
+            if self.__bulk:
+                connection.executescript(Indexes + "PRAGMA user_version = 0;")
+        except Exception as e:
+            self.__error = e
+            # поток больше не пишет, но очередь разбирает, чтобы не заблокировать симуляцию
+            while self.__queue.get() is not None:
+                pass
+            # индексы уже записанных строк восстанавливаются, если база это позволяет
+            if self.__bulk and connection is not None:
+                try:
+                    connection.executescript(Indexes + "PRAGMA user_version = 0;")
+                except sqlite3.Error:
+                    pass
+        finally:
+            if connection is not None:
+                connection.close()
+
+
+# ---------------------------------
+# класс хранилища результатов: аналитические запросы
+class ResultStore:
+    def __init__(self, path: str) -> None:
+        self.__connection = connect(path)
+
+    def close(self) -> None:
+        self.__connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__connection.execute("SELECT count(*) FROM results").fetchone()[0]
+
+    # Доля побед по парам типов игроков: (игрок 1, игрок 2, размер поля, флот, партий, побед первого)
+    def win_rates(self, board_size: int = None) -> list[tuple]:
+        return self.__connection.execute(
+            "SELECT c.player1, c.player2, c.board_size, c.fleet, count(*), sum(r.winner = 1) "
+            "FROM configs c JOIN results r ON r.config = c.id "
+            "WHERE ?1 IS NULL OR c.board_size = ?1 "
+            "GROUP BY c.id ORDER BY c.board_size, c.player1, c.player2, c.fleet", (board_size,)).fetchall()
+
+    # Распределение выстрелов до победы на поле board_size (необязательно - только победы типа игрока
+    # player): [(выстрелов, партий), ...] по возрастанию выстрелов
+    def shots_distribution(self, board_size: int, player: str = None) -> list[tuple[int, int]]:
+        return self.__connection.execute(
+            f"SELECT {_Winner_Shots} AS shots, count(*) "
+            "FROM configs c JOIN results r ON r.config = c.id "
+            "WHERE c.board_size = ?1 AND (?2 IS NULL OR (r.winner = 1 AND c.player1 = ?2) "
+            "OR (r.winner = 2 AND c.player2 = ?2)) "
+            "GROUP BY shots ORDER BY shots", (board_size, player)).fetchall()
+
+    # Партии по условиям (None - любое значение): строки GameRow, не больше limit.
+    # Условия собираются только из заданных значений, чтобы планировщик SQLite мог взять индекс
+    def games(self, player1: str = None, player2: str = None, board_size: int = None, fleet: str = None,
+              seed: int = None, max_shots: int = None, limit: int = 100) -> list[GameRow]:
+        conditions = []
+        values = []
+        for column, value in (('c.player1', player1), ('c.player2', player2), ('c.board_size', board_size),
+                              ('c.fleet', fleet), ('r.seed', seed)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                values.append(value)
+        if max_shots is not None:
+            conditions.append(f"{_Winner_Shots} <= ?")
+            values.append(max_shots)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = self.__connection.execute(
+            "SELECT c.player1, c.player2, c.board_size, c.fleet, r.seed, r.winner, r.shots1, r.shots2, r.turns "
+            f"FROM configs c JOIN results r ON r.config = c.id {where}LIMIT ?", values + [limit]).fetchall()
+        return [GameRow(*row) for row in rows]
@@ -0,0 +1,306 @@
+import argparse
+import asyncio
+import random as rnd
+import struct
+
+import gameEvents
+from fleetPlacement import FleetPlacer, cell_to_xy
+from gameAsync import AsyncGame
+from gameLogic import GameEvent, Player, Point, Ship, SeaBattleGameBoard, SeaBattleGameLogic, ComputerPlayer
+from gameStrategies import DensityShots
+
+
+# ============================================
+# Сервер игры по TCP: подбор соперников, сессии SeaBattleGameLogic в одном цикле событий asyncio
+# (см. gameAsync) и компактный двоичный протокол.
+#
+# Все числа - в сетевом порядке байт. Сообщение начинается с байта типа.
+# Клиент -> сервер:
+#   Msg_Hello  '!BB' режим (Mode_Match - против другого клиента, Mode_Computer - против сервера),
+#              длина имени, затем имя в UTF-8
+#   Msg_Shot   '!BHH' номер хода из Msg_Turn, x, y - выстрел в координатах Point
+#   Msg_Quit   '!BHH' 0, 0, 0 - выход из партии
+#   Во время партии каждое сообщение клиента занимает ровно Move_Size байт.
+#   Выстрел с номером не последнего Msg_Turn сервер пропускает: это ход, опоздавший к тайм-ауту
+# Сервер -> клиент:
+#   Msg_Start   '!HBB' размер поля, ходит ли клиент первым, длина имени соперника, имя соперника,
+#               '!H' количество клеток своего флота и клетки '!H' (cell = (x - 1) * size + (y - 1))
+#   Msg_Turn    '!B' ход клиента и его номер (по кругу 0..255)
+#   Msg_Result  '!BHHB' чей выстрел (0 - свой, 1 - соперника), x, y, результат (Shot_Miss, Shot_Injured,
+#               Shot_Killed, Shot_Already или Result_Invalid для выстрела за пределы поля - только стрелявшему)
+#   Msg_Timeout клиент не успел сделать ход, ход перешел к сопернику
+#   Msg_Over    '!B' итог партии для клиента: Over_Lost, Over_Won, Over_Quit (соперник вышел)
+# После Msg_Over клиент может снова отправить Msg_Hello или закрыть соединение; опоздавший выстрел,
+# пришедший уже после конца партии, сервер тоже пропускает
+
+Msg_Hello = 1
+Msg_Shot = 2
+Msg_Quit = 3
+Msg_Start = 10
+Msg_Turn = 11
+Msg_Result = 12
+Msg_Timeout = 13
+Msg_Over = 14
+
+Mode_Match = 0
+Mode_Computer = 1
+
+Result_Invalid = 4
+
+Over_Lost = 0
+Over_Won = 1
+Over_Quit = 2
+
+Hello = struct.Struct('!BBB')
+Move = struct.Struct('!BBHH')
+Move_Size = Move.size
+Start = struct.Struct('!BHBB')
+Result = struct.Struct('!BBHHB')
+Over = struct.Struct('!BB')
+Cells = struct.Struct('!H')
+Turn = struct.Struct('!BB')
+Timeout_Message = bytes([Msg_Timeout])
+
+
+def encode_hello(mode: int, name: str) -> bytes:
+    data = name.encode()[:255]
+    return Hello.pack(Msg_Hello, mode, len(data)) + data
+
+
+# turn - номер хода из последнего Msg_Turn
+def encode_move(turn: int = 0, x: int = 0, y: int = 0, quit_game: bool = False) -> bytes:
+    return Move.pack(Msg_Quit if quit_game else Msg_Shot, turn, x, y)
+
+
+def encode_start(board_size: int, first: bool, enemy_name: str, cells: list[int]) -> bytes:
+    data = enemy_name.encode()[:255]
+    return (Start.pack(Msg_Start, board_size, first, len(data)) + data + Cells.pack(len(cells))
+            + struct.pack(f'!{len(cells)}H', *cells))
+
+
+# Чтение одного сообщения сервера: (тип, данные). Для Msg_Start данные - (размер поля, ходит ли первым,
+# имя соперника, клетки флота), для Msg_Turn - номер хода, для Msg_Result - (чей выстрел, x, y, результат),
+# для Msg_Over - итог
+async def read_server_message(reader: asyncio.StreamReader) -> tuple:
+    kind = (await reader.readexactly(1))[0]
+    if kind == Msg_Start:
+        board_size, first, length = struct.unpack('!HBB', await reader.readexactly(Start.size - 1))
+        name = (await reader.readexactly(length)).decode()
+        count, = Cells.unpack(await reader.readexactly(Cells.size))
+        cells = list(struct.unpack(f'!{count}H', await reader.readexactly(count * Cells.size)))
+        return kind, (board_size, bool(first), name, cells)
+    if kind == Msg_Result:
+        return kind, struct.unpack('!BHHB', await reader.readexactly(Result.size - 1))
+    if kind == Msg_Over or kind == Msg_Turn:
+        return kind, (await reader.readexactly(1))[0]
+    return kind, None
+
+
+# ---------------------------------
+# класс удаленного игрока: ходы приходят по сети.
+# Флот расставляется сервером случайно, как у ComputerPlayer
+class RemotePlayer(Player):
+    def __init__(self, name, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        super().__init__(name)
+        self.__reader = reader
+        self.__writer = writer
+        self.__buffer = bytearray()
+        self.__turn = 0                 # номер последнего Msg_Turn
+
+    def init_ships(self, board_size: int, ships_quantity: dict) -> list[Ship]:
+        fleet = FleetPlacer(board_size, ships_quantity, rnd).place()
+        return [Ship([Point(*cell_to_xy(c, board_size)) for c in ship.body]) for ship in fleet]
+
+    # Сообщения копятся в буфере и уходят одной записью в сокет при flush(): системный вызов send
+    # дороже всей остальной обработки выстрела
+    def send(self, data: bytes) -> None:
+        self.__buffer += data
+
+    def flush(self) -> None:
+        if self.__buffer and not self.__writer.is_closing():
+            self.__writer.write(self.__buffer)
+        self.__buffer = bytearray()
+
+    # Соединение закрыто клиентом или оборвано; определяется без чтения из потока
+    @property
+    def disconnected(self) -> bool:
+        return self.__reader.at_eof() or self.__reader.exception() is not None or self.__writer.is_closing()
+
+    def __send_turn(self) -> None:
+        self.__turn = (self.__turn + 1) & 0xFF
+        self.send(Turn.pack(Msg_Turn, self.__turn))
+        self.flush()
+
+    # Сообщение хода читается одним вызовом readexactly: если ход прерван тайм-аутом,
+    # недочитанных байтов в потоке не остается. Разрыв соединения считается выходом из игры.
+    # Выстрел за пределы поля сразу получает ответ Result_Invalid и новый Msg_Turn.
+    # Выстрел с чужим номером хода клиент отправил на прежний Msg_Turn, после тайм-аута, - он пропускается
+    async def move(self) -> GameEvent:
+        size = self.enemy.board.size
+        self.__send_turn()
+        while True:
+            try:
+                kind, turn, x, y = Move.unpack(await self.__reader.readexactly(Move_Size))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return GameEvent(GameEvent.Event_Quit, self)
+            if kind != Msg_Shot:
+                return GameEvent(GameEvent.Event_Quit, self)
+            if turn != self.__turn:
+                continue
+            if 1 <= x <= size and 1 <= y <= size:
+                return GameEvent(GameEvent.Event_Shot, self, Point(x, y))
+            self.send(Result.pack(Msg_Result, 0, x, y, Result_Invalid))
+            self.__send_turn()
+
+
+# ---------------------------------
+# класс игровой сессии: партия двух игроков, хотя бы один из которых удаленный.
+# Выстрелы обрабатывает SeaBattleGameLogic, а результат каждого выстрела сообщается обоим игрокам.
+# Стрелявший получает результат сразу после промаха, а после попадания - вместе со следующим Msg_Turn;
+# результаты выстрелов соперника приходят пачкой перед своим Msg_Turn
+class GameSession:
+    def __init__(self, board_size: int, player1: Player, player2: Player, move_timeout: float = None) -> None:
+        self.__logic = SeaBattleGameLogic(board_size, player1, player2)
+        self.__game = AsyncGame(self.__logic, move_timeout, self.__on_event, self.__process_event)
+        self.__board_size = board_size
+
+    @property
+    def logic(self) -> SeaBattleGameLogic:
+        return self.__logic
+
+    @staticmethod
+    def __send(player: Player, data: bytes, flush: bool = False) -> None:
+        if isinstance(player, RemotePlayer):
+            player.send(data)
+            if flush:
+                player.flush()
+
+    async def run(self) -> GameEvent:
+        size = self.__board_size
+        for first, player in [(True, self.__logic.player1), (False, self.__logic.player2)]:
+            board = player.board.board
+            cells = [x * size + y for x in range(size) for y in range(size)
+                     if board[x][y] == SeaBattleGameBoard.Ship_Body]
+            self.__send(player, encode_start(size, first, player.enemy.name, cells), not first)
+        return await self.__game.run()
+
+    # Повторный выстрел в SeaBattleGameLogic не попадает: игрок просто стреляет еще раз,
+    # как и в консольной игре
+    def __process_event(self, event: GameEvent) -> None:
+        shooter = event.player
+        target = shooter.enemy.board
+        shot = event.data
+        if target.enemy_shots[shot.x - 1][shot.y - 1] not in (SeaBattleGameBoard.Fog_Of_War,
+                                                              SeaBattleGameBoard.Ship_Neighbor):
+            result = SeaBattleGameBoard.Shot_Already
+        else:
+            ships = target.alive_ships_count
+            self.__logic.process_event(event)
+            if not shooter.last_shot_success:
+                result = SeaBattleGameBoard.Shot_Miss
+            elif target.alive_ships_count < ships:
+                result = SeaBattleGameBoard.Shot_Killed
+            else:
+                result = SeaBattleGameBoard.Shot_Injured
+        self.__send(shooter, Result.pack(Msg_Result, 0, shot.x, shot.y, result),
+                    result == SeaBattleGameBoard.Shot_Miss)
+        self.__send(shooter.enemy, Result.pack(Msg_Result, 1, shot.x, shot.y, result))
+
+    def __on_event(self, event: GameEvent) -> None:
+        player = event.player
+        if event.type == GameEvent.Event_Win:
+            self.__send(player, Over.pack(Msg_Over, Over_Won), True)
+            self.__send(player.enemy, Over.pack(Msg_Over, Over_Lost), True)
+        elif event.type == GameEvent.Event_Quit:
+            self.__send(player.enemy, Over.pack(Msg_Over, Over_Quit), True)
+        elif event.type == GameEvent.Event_Timeout:
+            self.__send(player, Timeout_Message, True)
+
+
+# ---------------------------------
+# класс сервера. Соединение живет в своей корутине-обработчике; партия играется в обработчике
+# того клиента, который пришел к сопернику вторым, а первый ждет ее окончания.
+# Отдельных задач, очередей и буферов на соединение сервер не заводит
+class GameServer:
+    def __init__(self, board_size: int = 10, move_timeout: float = None) -> None:
+        self.__board_size = board_size
+        self.__move_timeout = move_timeout
+        self.__waiting = None           # (игрок, future окончания партии) - ждет соперника
+        self.connections = 0
+        self.sessions = 0
+        self.games = 0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, backlog: int = 1024) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.__handle, host, port, backlog=backlog)
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    kind = (await reader.readexactly(1))[0]
+                    if kind != Msg_Hello:
+                        # выстрел, опоздавший к концу партии
+                        await reader.readexactly(Move_Size - 1)
+                        continue
+                    mode, length = struct.unpack('!BB', await reader.readexactly(Hello.size - 1))
+                    name = (await reader.readexactly(length)).decode(errors='replace')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                player = RemotePlayer(name, reader, writer)
+                if mode == Mode_Computer:
+                    await self.__play(player, ComputerPlayer("Сервер", DensityShots()))
+                elif self.__waiting is None or self.__waiting[1].done() or self.__waiting[0].disconnected:
+                    # ожидавший соперника клиент мог отключиться: его обработчик отпускается
+                    # (следующее чтение Msg_Hello увидит разрыв), а ждать соперника начинает новый клиент
+                    if self.__waiting is not None and not self.__waiting[1].done():
+                        self.__waiting[1].set_result(None)
+                    done = asyncio.get_running_loop().create_future()
+                    self.__waiting = (player, done)
+                    await done
+                else:
+                    enemy, done = self.__waiting
+                    self.__waiting = None
+                    try:
+                        await self.__play(enemy, player)
+                    finally:
+                        if not done.done():
+                            done.set_result(None)
+        except asyncio.CancelledError:
+            # сервер остановлен - соединение просто закрывается
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def __play(self, player1: Player, player2: Player) -> None:
+        self.sessions += 1
+        try:
+            await GameSession(self.__board_size, player1, player2, self.__move_timeout).run()
+        finally:
+            self.sessions -= 1
+            self.games += 1
+
+
+async def serve(host: str, port: int, board_size: int, move_timeout: float = None) -> None:
+    server = await GameServer(board_size, move_timeout).start(host, port)
+    for sock in server.sockets:
+        print("Сервер слушает {}:{}".format(*sock.getsockname()[:2]), flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сервер игры «Морской бой»")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--timeout', type=float, default=None, help="тайм-аут хода, с")
+    args = parser.parse_args()
+
+    # результаты выстрелов уходят клиентам по протоколу, а не на консоль сервера
+    gameEvents.use(gameEvents.NullSink())
+    try:
+        asyncio.run(serve(args.host, args.port, args.size, args.timeout))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,221 @@
+import random as rnd
+from collections import namedtuple
+
+from fleetPlacement import FleetPlacer, Placement
+from gameLogic import SeaBattleGameBoard, SeaBattleGameLogic
+
+
+# ============================================
+# Безголовая (без ввода/вывода) симуляция партий компьютер против компьютера.
+# Правила те же, что у SeaBattleGameLogic и ConsoleGameGui.get_event:
+# - корабли расставляются случайно (fleetPlacement.FleetPlacer), без касания сторонами
+# - попавший игрок стреляет еще раз, промахнувшийся передает ход
+# - повторный выстрел в ту же клетку не передает ход
+# Клетка кодируется одним числом, как в fleetPlacement: cell = (x - 1) * size + (y - 1)
+#
+# Скорость на поле 10x10 со случайной стрельбой - примерно 4.5-9 тыс. партий/с на одно ядро в зависимости
+# от машины (python -m benchmarks.simulation), т.е. 10 тыс. партий/с на ядро не достигается; больше дает
+# только запуск по процессам (gameTournament). Правила выстрела здесь свои, на плоских номерах клеток;
+# совпадение партий с SeaBattleGameLogic проверяет tests/test_simulation.py
+
+# компактный результат одной партии
+GameResult = namedtuple('GameResult', ['seed', 'winner', 'shots1', 'shots2', 'turns'])
+
+
+# ---------------------------------
+# класс упрощенного игрового поля для симуляции: только плоские списки чисел
+class SimBoard:
+    Shot_Miss = SeaBattleGameBoard.Shot_Miss
+    Shot_Injured = SeaBattleGameBoard.Shot_Injured
+    Shot_Killed = SeaBattleGameBoard.Shot_Killed
+    Shot_Already = SeaBattleGameBoard.Shot_Already
+
+    __slots__ = ('size', 'ship_at', 'hits_left', 'nearby', 'shots', 'alive_ships_count')
+
+    def __init__(self, size: int, ships: list[Placement]) -> None:
+        self.size = size
+        self.ship_at = [-1] * (size * size)
+        self.hits_left = []
+        self.nearby = []
+        # наблюдение противника в кодировке SeaBattleGameBoard.enemy_shots
+        self.shots = bytearray(size * size)
+        for i, ship in enumerate(ships):
+            for c in ship.body:
+                self.ship_at[c] = i
+            self.hits_left.append(len(ship.body))
+            self.nearby.append(ship.nearby)
+        self.alive_ships_count = len(ships)
+
+    def incoming_shot(self, cell: int) -> int:
+        shots = self.shots
+        mark = shots[cell]
+        if mark != SeaBattleGameBoard.Fog_Of_War and mark != SeaBattleGameBoard.Ship_Neighbor:
+            return SimBoard.Shot_Already
+
+        ship = self.ship_at[cell]
+        if ship < 0:
+            shots[cell] = SeaBattleGameBoard.Miss_Shot
+            return SimBoard.Shot_Miss
+
+        shots[cell] = SeaBattleGameBoard.Hit_Shot
+        left = self.hits_left[ship] - 1
+        self.hits_left[ship] = left
+        if left:
+            return SimBoard.Shot_Injured
+
+        self.alive_ships_count -= 1
+        for c in self.nearby[ship]:
+            if shots[c] == SeaBattleGameBoard.Fog_Of_War:
+                shots[c] = SeaBattleGameBoard.Ship_Neighbor
+        return SimBoard.Shot_Killed
+
+
+# ---------------------------------
+# Базовый класс стратегии стрельбы, предназначенный для переопределения.
+# reset() вызывается перед каждой партией и получает наблюдение (SimBoard.shots поля противника),
+# choose() возвращает клетку для выстрела, observe() получает результат выстрела.
+# take() сообщает о выстреле, который выбрала не сама стратегия (например, книга дебютов):
+# больше эту клетку стратегия выбирать не должна; результат выстрела придет в observe(), как обычно.
+# close() освобождает ресурсы стратегии (например, пул процессов MonteCarloShots) после последней партии
+class ShotStrategy:
+    def reset(self, board_size: int, ships_quantity: dict, observation: bytearray, rng) -> None:
+        pass
+
+    def choose(self) -> int:
+        pass
+
+    def observe(self, cell: int, result: int) -> None:
+        pass
+
+    def take(self, cell: int) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+# Стратегия ComputerPlayer: равновероятный выбор среди клеток, куда еще не стреляли.
+# Порядок выстрелов - случайная перестановка всех клеток, построенная одной сортировкой
+# по случайным ключам в начале партии, а не выбором с удалением на каждом ходу
+class RandomShots(ShotStrategy):
+    def __init__(self) -> None:
+        self.__order = iter(())
+
+    def reset(self, board_size: int, ships_quantity: dict, observation: bytearray, rng) -> None:
+        random = rng.random
+        order = list(range(board_size * board_size))
+        order.sort(key=lambda _: random())
+        self.__order = iter(order)
+
+    def choose(self) -> int:
+        return next(self.__order)
+
+    def take(self, cell: int) -> None:
+        self.__order = iter([c for c in self.__order if c != cell])
+
+
+# ---------------------------------
+# класс безголовой симуляции партий
+class HeadlessSimulation:
+    def __init__(self, board_size: int, strategy1: ShotStrategy = None, strategy2: ShotStrategy = None,
+                 ships_quantity: dict = None) -> None:
+        self.__board_size = board_size
+        self.__ships_quantity = ships_quantity if ships_quantity else SeaBattleGameLogic.Ships_Quantity
+        self.__strategies = [strategy1 if strategy1 else RandomShots(),
+                             strategy2 if strategy2 else RandomShots()]
+        # observe() вызывается только у стратегий, которые его переопределили
+        self.__observers = tuple(None if type(s).observe is ShotStrategy.observe else s.observe
+                                 for s in self.__strategies)
+        self.__rng = rnd.Random()
+        self.__placer = FleetPlacer(board_size, self.__ships_quantity, self.__rng)
+        self.__fleets = ([], [])
+
+    @property
+    def board_size(self) -> int:
+        return self.__board_size
+
+    @property
+    def ships_quantity(self) -> dict:
+        return self.__ships_quantity
+
+    # Расстановки флотов обоих игроков в последней сыгранной партии
+    @property
+    def fleets(self) -> tuple[list[Placement], list[Placement]]:
+        return self.__fleets
+
+    # Играет одну партию от начала до конца. Весь случайный выбор идет от генератора, заново
+    # инициализированного зерном seed, поэтому партия полностью воспроизводима.
+    # Обработка выстрела повторяет SimBoard.incoming_shot, но развернута прямо в цикле:
+    # это самое горячее место симуляции (вызов incoming_shot на каждый выстрел медленнее на 20-25%)
+    def play(self, seed: int) -> GameResult:
+        rng = self.__rng
+        rng.seed(seed)
+        size = self.__board_size
+        fleet = self.__ships_quantity
+        self.__fleets = (self.__placer.place(), self.__placer.place())
+        boards = (SimBoard(size, self.__fleets[0]), SimBoard(size, self.__fleets[1]))
+        strategies = self.__strategies
+        # игрок стреляет по полю противника, поэтому наблюдение берется с чужого поля
+        strategies[0].reset(size, fleet, boards[1].shots, rng)
+        strategies[1].reset(size, fleet, boards[0].shots, rng)
+        choosers = (strategies[0].choose, strategies[1].choose)
+        observers = self.__observers
+
+        fog = SeaBattleGameBoard.Fog_Of_War
+        neighbor = SeaBattleGameBoard.Ship_Neighbor
+        shots = [0, 0]
+        turns = 1
+        current = 0
+        while True:
+            choose = choosers[current]
+            observe = observers[current]
+            target = boards[current ^ 1]
+            ship_at = target.ship_at
+            marks = target.shots
+            hits_left = target.hits_left
+            fired = 0
+            while True:
+                cell = choose()
+                fired += 1
+                mark = marks[cell]
+                if mark != fog and mark != neighbor:
+                    result = SimBoard.Shot_Already
+                else:
+                    ship = ship_at[cell]
+                    if ship < 0:
+                        marks[cell] = SeaBattleGameBoard.Miss_Shot
+                        if observe:
+                            observe(cell, SimBoard.Shot_Miss)
+                        break
+                    marks[cell] = SeaBattleGameBoard.Hit_Shot
+                    left = hits_left[ship] - 1
+                    hits_left[ship] = left
+                    if left:
+                        result = SimBoard.Shot_Injured
+                    else:
+                        result = SimBoard.Shot_Killed
+                        target.alive_ships_count -= 1
+                        for c in target.nearby[ship]:
+                            if marks[c] == fog:
+                                marks[c] = neighbor
+                        if not target.alive_ships_count:
+                            shots[current] += fired
+                            if observe:
+                                observe(cell, result)
+                            return GameResult(seed, current + 1, shots[0], shots[1], turns)
+                if observe:
+                    observe(cell, result)
+            shots[current] += fired
+            current ^= 1
+            turns += 1
+
+    # Генератор результатов games партий; партия i играется с зерном base_seed + i
+    def run(self, games: int, base_seed: int = 0):
+        play = self.play
+        for i in range(games):
+            yield play(base_seed + i)
+
+
+def simulate(games: int, board_size: int, base_seed: int = 0, strategy1: ShotStrategy = None,
+             strategy2: ShotStrategy = None, ships_quantity: dict = None) -> list[GameResult]:
+    return list(HeadlessSimulation(board_size, strategy1, strategy2, ships_quantity).run(games, base_seed))
@@ -0,0 +1,249 @@
+from collections import namedtuple
+from weakref import WeakKeyDictionary
+
+from fleetPlacement import cell_neighbors
+from gameLogic import SeaBattleGameBoard, SeaBattleGameLogic, print_error
+
+
+# ============================================
+# Снимки состояния партии для поиска хода (например, розыгрышей Монте-Карло) вместо copy.deepcopy
+# всего графа SeaBattleGameLogic -> Player -> SeaBattleGameBoard -> Ship -> Point.
+#
+# Снимок GameState - неизменяемое значение: расстановки обоих флотов (Layout, общие для всех снимков
+# одной партии), по три битовые маски на поле (промахи, попадания, соседи убитых кораблей),
+# количество живых кораблей на каждом поле и номер игрока, чей ход. Клетка (x, y) - бит номер
+# cell = (x - 1) * size + (y - 1), как в bitBoard. Поле с индексом i принадлежит игроку i + 1,
+# т.е. игрок current стреляет по полю current ^ 1.
+#
+# snapshot(logic) снимает состояние с SeaBattleGameLogic (с любой реализацией поля),
+# restore(logic, state) возвращает его на поля и игрокам. Собственная память игроков (пул ходов
+# ComputerPlayer, состояние стратегий) в снимок не входит.
+# state.fork() дает изменяемую ветку GameFork для розыгрыша: ветка ссылается на снимок и копирует
+# его маски к себе только при первом выстреле (копирование при записи), так что ветка
+# без выстрелов ничего не стоит, а сам снимок не меняется никогда
+
+# расстановка флота на одном поле: маска всех кораблей, маски кораблей и их соседей,
+# ship_at - номер клетки -> индекс корабля
+Layout = namedtuple('Layout', ['body', 'ship_masks', 'nearby_masks', 'ship_at'])
+
+_layouts = WeakKeyDictionary()      # поле -> Layout; расстановка на поле не меняется всю партию
+
+
+# Корабли поля - связные по сторонам группы клеток Ship_Body, каждый - отсортированный кортеж клеток
+def board_fleet(board) -> list[tuple]:
+    size = board.size
+    grid = board.board
+    body = {x * size + y for x in range(size) for y in range(size)
+            if grid[x][y] == SeaBattleGameBoard.Ship_Body}
+    fleet = []
+    while body:
+        ship = {body.pop()}
+        stack = list(ship)
+        while stack:
+            for c in cell_neighbors(stack.pop(), size):
+                if c in body:
+                    body.remove(c)
+                    ship.add(c)
+                    stack.append(c)
+        fleet.append(tuple(sorted(ship)))
+    fleet.sort()
+    return fleet
+
+
+def make_layout(fleet: list[tuple], board_size: int) -> Layout:
+    body = 0
+    ship_masks = []
+    nearby_masks = []
+    ship_at = {}
+    for index, ship in enumerate(fleet):
+        mask = 0
+        nearby = 0
+        for c in ship:
+            mask |= 1 << c
+            ship_at[c] = index
+            for n in cell_neighbors(c, board_size):
+                nearby |= 1 << n
+        body |= mask
+        ship_masks.append(mask)
+        nearby_masks.append(nearby & ~mask)
+    return Layout(body, tuple(ship_masks), tuple(nearby_masks), ship_at)
+
+
+def board_layout(board) -> Layout:
+    layout = _layouts.get(board)
+    if layout is None:
+        layout = _layouts[board] = make_layout(board_fleet(board), board.size)
+    return layout
+
+
+# ---------------------------------
+# класс снимка партии
+class GameState(namedtuple('GameState', ['board_size', 'layouts', 'misses', 'hits', 'neighbors', 'alive',
+                                         'current'])):
+    __slots__ = ()
+
+    # 0 - партия не закончена, иначе номер победившего игрока
+    @property
+    def winner(self) -> int:
+        return 1 if not self.alive[1] else 2 if not self.alive[0] else 0
+
+    # Клетки поля board, куда еще можно стрелять, - маска
+    def open_cells(self, board: int) -> int:
+        return ((1 << self.board_size * self.board_size) - 1) & ~(self.misses[board] | self.hits[board])
+
+    # Отметки поля board в формате SeaBattleGameBoard.enemy_shots
+    def enemy_shots(self, board: int) -> list[list[int]]:
+        size = self.board_size
+        grid = [[SeaBattleGameBoard.Fog_Of_War] * size for _ in range(size)]
+        for mask, value in ((self.neighbors[board], SeaBattleGameBoard.Ship_Neighbor),
+                            (self.misses[board], SeaBattleGameBoard.Miss_Shot),
+                            (self.hits[board], SeaBattleGameBoard.Hit_Shot)):
+            while mask:
+                low = mask & -mask
+                x, y = divmod(low.bit_length() - 1, size)
+                grid[x][y] = value
+                mask ^= low
+        return grid
+
+    def fork(self):
+        return GameFork(self)
+
+
+def board_masks(board) -> tuple[int, int, int]:
+    size = board.size
+    misses = hits = neighbors = 0
+    for x, row in enumerate(board.enemy_shots):
+        for y, mark in enumerate(row):
+            if mark == SeaBattleGameBoard.Miss_Shot:
+                misses |= 1 << (x * size + y)
+            elif mark == SeaBattleGameBoard.Hit_Shot:
+                hits |= 1 << (x * size + y)
+            elif mark == SeaBattleGameBoard.Ship_Neighbor:
+                neighbors |= 1 << (x * size + y)
+    return misses, hits, neighbors
+
+
+def snapshot(logic: SeaBattleGameLogic) -> GameState:
+    boards = (logic.player1.board, logic.player2.board)
+    masks = tuple(zip(*(board_masks(board) for board in boards)))
+    return GameState(boards[0].size, tuple(board_layout(board) for board in boards), *masks,
+                     tuple(board.alive_ships_count for board in boards),
+                     0 if logic.player1.last_shot_success else 1)
+
+
+# Возвращает партию logic в состояние state. Снимок должен быть сделан с этой же партии
+# (с теми же расстановками флотов), иначе - ValueError
+def restore(logic: SeaBattleGameLogic, state: GameState) -> None:
+    players = (logic.player1, logic.player2)
+    for i, player in enumerate(players):
+        if player.board.size != state.board_size or board_layout(player.board) != state.layouts[i]:
+            error = f"{player.name}: снимок сделан с другой расстановкой флота"
+            print_error(error)
+            raise ValueError(error)
+    for i, player in enumerate(players):
+        player.board.load_shots(state.enemy_shots(i))
+    # в начале партии оба признака установлены; для очередности хода важен только признак первого игрока
+    players[state.current].last_shot_success = True
+    if state.current:
+        players[0].last_shot_success = False
+
+
+# ---------------------------------
+# класс ветки снимка для розыгрыша: выстрелы по правилам SeaBattleGameLogic
+# (попавший стреляет еще раз, повторный выстрел хода не передает) без объектов Point и Ship
+class GameFork:
+    __slots__ = ('__base', '__size', '__layouts', '__misses', '__hits', '__neighbors', '__alive', '__current')
+
+    def __init__(self, state: GameState) -> None:
+        self.__base = state
+        self.__size = state.board_size
+        self.__layouts = state.layouts
+        self.__current = state.current
+
+    # копирование при записи: до первого выстрела ветка читает маски прямо из снимка
+    def __own(self) -> None:
+        base = self.__base
+        self.__misses = list(base.misses)
+        self.__hits = list(base.hits)
+        self.__neighbors = list(base.neighbors)
+        self.__alive = list(base.alive)
+        self.__base = None
+
+    @property
+    def current(self) -> int:
+        return self.__current
+
+    @property
+    def winner(self) -> int:
+        alive = self.__base.alive if self.__base is not None else self.__alive
+        return 1 if not alive[1] else 2 if not alive[0] else 0
+
+    # Выстрел текущего игрока в клетку cell; результат - SeaBattleGameBoard.Shot_*
+    def shoot(self, cell: int) -> int:
+        if self.__base is not None:
+            self.__own()
+        target = self.__current ^ 1
+        bit = 1 << cell
+        hits = self.__hits[target]
+        if (self.__misses[target] | hits) & bit:
+            return SeaBattleGameBoard.Shot_Already
+        layout = self.__layouts[target]
+        if not layout.body & bit:
+            self.__misses[target] |= bit
+            self.__current = target
+            return SeaBattleGameBoard.Shot_Miss
+        hits |= bit
+        self.__hits[target] = hits
+        index = layout.ship_at[cell]
+        if layout.ship_masks[index] & ~hits:
+            return SeaBattleGameBoard.Shot_Injured
+        self.__alive[target] -= 1
+        self.__neighbors[target] |= layout.nearby_masks[index] & ~(self.__misses[target] | hits)
+        return SeaBattleGameBoard.Shot_Killed
+
+    # Доигрывает партию случайными выстрелами обоих игроков (как RandomShots: равновероятно
+    # по клеткам, куда еще не стреляли) и возвращает номер победителя
+    def rollout(self, rng) -> int:
+        if self.__base is not None:
+            self.__own()
+        size = self.__size
+        random = rng.random
+        # клетки для выстрелов по каждому полю; случайная клетка берется с удалением за O(1)
+        # (перестановкой на место последней), поэтому тасовать весь список заранее не нужно
+        orders = []
+        for target in (0, 1):
+            free = ((1 << size * size) - 1) & ~(self.__misses[target] | self.__hits[target])
+            orders.append([c for c in range(size * size) if free >> c & 1])
+        misses, hits, neighbors, alive = self.__misses, self.__hits, self.__neighbors, self.__alive
+        current = self.__current
+        while alive[0] and alive[1]:
+            target = current ^ 1
+            layout = self.__layouts[target]
+            body, ship_at, ship_masks = layout.body, layout.ship_at, layout.ship_masks
+            order = orders[target]
+            while True:
+                i = int(random() * len(order))
+                cell = order[i]
+                order[i] = order[-1]
+                order.pop()
+                bit = 1 << cell
+                if not body & bit:
+                    misses[target] |= bit
+                    current = target
+                    break
+                hits[target] |= bit
+                index = ship_at[cell]
+                if not ship_masks[index] & ~hits[target]:
+                    alive[target] -= 1
+                    neighbors[target] |= layout.nearby_masks[index] & ~(misses[target] | hits[target])
+                    if not alive[target]:
+                        break
+        self.__current = current
+        return self.winner
+
+    # Неизменяемый снимок текущего состояния ветки
+    def state(self) -> GameState:
+        if self.__base is not None:
+            return self.__base
+        return GameState(self.__size, self.__layouts, tuple(self.__misses), tuple(self.__hits),
+                         tuple(self.__neighbors), tuple(self.__alive), self.__current)
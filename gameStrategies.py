@@ -0,0 +1,504 @@
+import random as rnd
+import time
+import weakref
+
+from fleetPlacement import ship_placements, cell_neighbors
+from gameLogic import SeaBattleGameBoard
+from gameSimulation import ShotStrategy
+
+
+# ============================================
+# Стратегии стрельбы компьютерного игрока (интерфейс gameSimulation.ShotStrategy).
+# Подключаются и к HeadlessSimulation, и к ComputerPlayer(name, strategy=...)
+
+# ---------------------------------
+# Общие для всех партий таблицы положений кораблей флота на поле заданного размера:
+# размер корабля каждого положения, его клетки, а также для каждой клетки - какие положения ее
+# накрывают (cover) и у каких положений она соседняя (adjacent)
+_density_tables_cache = {}
+
+
+def density_tables(board_size: int, ship_sizes: tuple) -> tuple:
+    key = (board_size, ship_sizes)
+    if key in _density_tables_cache:
+        return _density_tables_cache[key]
+
+    sizes = []
+    bodies = []
+    by_size = {}
+    cover = [[] for _ in range(board_size * board_size)]
+    adjacent = [[] for _ in range(board_size * board_size)]
+    for ship_size in ship_sizes:
+        by_size[ship_size] = []
+        for body, nearby, _, _ in ship_placements(board_size, ship_size):
+            pid = len(bodies)
+            sizes.append(ship_size)
+            bodies.append(body)
+            by_size[ship_size].append(pid)
+            for c in body:
+                cover[c].append(pid)
+            for c in nearby:
+                adjacent[c].append(pid)
+
+    _density_tables_cache[key] = (sizes, bodies, by_size, cover, adjacent)
+    return _density_tables_cache[key]
+
+
+# ---------------------------------
+# Стратегия "карта плотности": для каждой клетки считается, сколько допустимых положений
+# оставшихся кораблей ее накрывают. Положения, накрывающие попадания по раненому кораблю,
+# получают вес Hit_Weight за каждое попадание - так стратегия сама переходит в режим добивания.
+# Карта не пересчитывается заново: каждый выстрел убирает или перевзвешивает только те
+# положения, которых он касается
+class DensityShots(ShotStrategy):
+    Hit_Weight = 50
+
+    def __init__(self) -> None:
+        self.__observation = None
+        self.__rng = None
+        self.__remaining = {}
+        self.__density = []
+        self.__open = []
+        self.__open_index = []
+
+    def reset(self, board_size: int, ships_quantity: dict, observation, rng) -> None:
+        self.__board_size = board_size
+        self.__observation = observation
+        self.__rng = rng
+        self.__remaining = dict(ships_quantity)
+        self.__sizes, self.__bodies, self.__by_size, self.__cover, self.__adjacent = \
+            density_tables(board_size, tuple(sorted(ships_quantity)))
+        self.__valid = bytearray(b'\x01') * len(self.__bodies)
+        self.__weight = [1] * len(self.__bodies)
+        self.__hits = [0] * len(self.__bodies)
+
+        density = [0] * (board_size * board_size)
+        for pid, body in enumerate(self.__bodies):
+            amount = self.__remaining[self.__sizes[pid]]
+            for c in body:
+                density[c] += amount
+        self.__density = density
+        self.__open = list(range(board_size * board_size))
+        self.__open_index = list(range(board_size * board_size))
+
+    @property
+    def density(self) -> list[int]:
+        return self.__density
+
+    def choose(self) -> int:
+        density = self.__density
+        best = max(map(density.__getitem__, self.__open))
+        candidates = [c for c in self.__open if density[c] == best]
+        cell = candidates[0] if len(candidates) == 1 else self.__rng.choice(candidates)
+        self.__close(cell)
+        return cell
+
+    def take(self, cell: int) -> None:
+        self.__close(cell)
+
+    def observe(self, cell: int, result: int) -> None:
+        if result == SeaBattleGameBoard.Shot_Miss:
+            self.__invalidate_cell(cell)
+        elif result == SeaBattleGameBoard.Shot_Injured:
+            self.__hit(cell)
+        elif result == SeaBattleGameBoard.Shot_Killed:
+            self.__kill(cell)
+
+    # убирает клетку из кандидатов на выстрел обменом с последней - O(1)
+    def __close(self, cell: int) -> None:
+        i = self.__open_index[cell]
+        if i < 0:
+            return
+        last = self.__open.pop()
+        if last != cell:
+            self.__open[i] = last
+            self.__open_index[last] = i
+        self.__open_index[cell] = -1
+
+    def __invalidate(self, pid: int) -> None:
+        if not self.__valid[pid]:
+            return
+        self.__valid[pid] = 0
+        amount = self.__remaining[self.__sizes[pid]] * self.__weight[pid]
+        if amount:
+            density = self.__density
+            for c in self.__bodies[pid]:
+                density[c] -= amount
+
+    def __invalidate_cell(self, cell: int) -> None:
+        for pid in self.__cover[cell]:
+            self.__invalidate(pid)
+
+    # Попадание без потопления: корабль не может касаться этой клетки сбоку,
+    # а положения, накрывающие ее, становятся вероятнее
+    def __hit(self, cell: int) -> None:
+        for pid in self.__adjacent[cell]:
+            self.__invalidate(pid)
+        density = self.__density
+        for pid in self.__cover[cell]:
+            if not self.__valid[pid]:
+                continue
+            hits = self.__hits[pid] + 1
+            self.__hits[pid] = hits
+            if hits == self.__sizes[pid]:
+                # все клетки положения подбиты, но корабль не утонул - значит, он длиннее
+                self.__invalidate(pid)
+                continue
+            old = self.__weight[pid]
+            self.__weight[pid] = old * self.Hit_Weight
+            amount = (self.__weight[pid] - old) * self.__remaining[self.__sizes[pid]]
+            for c in self.__bodies[pid]:
+                density[c] += amount
+
+    # Потопление: корабль - это связная по сторонам группа попаданий вокруг клетки.
+    # Его клетки и соседи (отметки Ship_Neighbor в наблюдении) больше не участвуют в расчете
+    def __kill(self, cell: int) -> None:
+        observation = self.__observation
+        size = self.__board_size
+        ship = {cell}
+        stack = [cell]
+        while stack:
+            for c in cell_neighbors(stack.pop(), size):
+                if c not in ship and observation[c] == SeaBattleGameBoard.Hit_Shot:
+                    ship.add(c)
+                    stack.append(c)
+
+        for c in ship:
+            for pid in self.__adjacent[c]:
+                self.__invalidate(pid)
+            self.__invalidate_cell(c)
+
+        ship_size = len(ship)
+        if self.__remaining.get(ship_size):
+            self.__remaining[ship_size] -= 1
+            density = self.__density
+            for pid in self.__by_size.get(ship_size, ()):
+                if self.__valid[pid]:
+                    for c in self.__bodies[pid]:
+                        density[c] -= self.__weight[pid]
+
+        for c in ship:
+            for n in cell_neighbors(c, size):
+                if observation[n] == SeaBattleGameBoard.Ship_Neighbor and self.__open_index[n] >= 0:
+                    self.__invalidate_cell(n)
+                    self.__close(n)
+
+
+# ---------------------------------
+# Клетки тумана войны с наибольшей положительной вероятностью корабля, по возрастанию номера
+def best_cells(probabilities, observation: bytes) -> list[int]:
+    best = 0
+    ret = []
+    for c, p in enumerate(probabilities):
+        if observation[c] == SeaBattleGameBoard.Fog_Of_War and p > 0 and p >= best:
+            if p > best:
+                best = p
+                ret = []
+            ret.append(c)
+    return ret
+
+
+# Лучший выстрел по точным вероятностям: клетка тумана войны с наибольшей вероятностью корабля
+# (при равенстве - с меньшим номером). None - совместимых с наблюдением расстановок нет
+# или кораблей не осталось
+def best_shot(counter, observation: bytes):
+    cells = best_cells(counter.probabilities(observation), observation)
+    return cells[0] if cells else None
+
+
+# Стратегия по точным вероятностям placementCount.PlacementCounter: каждый ход - best_shot().
+# Самая сильная и самая медленная из стратегий (десятые доли секунды на ход на поле 10x10),
+# поэтому обычно подключается через книгу дебютов (openingBook.BookShots). cache_size - размер
+# LRU-кэша вероятностей по наблюдениям (см. PlacementCounter). Нужен numpy.
+# shared - общий кэш boardSymmetry.SymmetryCache: вероятности ищутся в нем с точностью до поворотов
+# и отражений поля, и его можно отдать нескольким стратегиям сразу. С общим кэшем собственный кэш
+# PlacementCounter не используется (cache_size не учитывается): промах общего кэша все равно
+# считается заново, а результат хранится только в общем кэше
+# random_ties - из равных по вероятности клеток выбирать случайную (как DensityShots), а не первую
+class ExactShots(ShotStrategy):
+    def __init__(self, cache_size: int = 256, shared=None, random_ties: bool = False) -> None:
+        self.__cache_size = cache_size
+        self.__shared = shared
+        self.__random_ties = random_ties
+        self.__counter = None
+        self.__quantity = None
+        self.__fleet = None
+        self.__observation = None
+
+    def reset(self, board_size: int, ships_quantity: dict, observation, rng) -> None:
+        counter = self.__counter
+        if counter is None or counter.board_size != board_size or self.__quantity != ships_quantity:
+            # placementCount (и numpy) загружается только при первом расчете
+            try:
+                from placementCount import PlacementCounter
+            except ImportError:
+                raise ImportError("Для ExactShots нужен пакет numpy")
+            self.__counter = PlacementCounter(board_size, ships_quantity,
+                                              0 if self.__shared is not None else self.__cache_size)
+            self.__quantity = dict(ships_quantity)
+            self.__fleet = tuple(sorted((s, q) for s, q in ships_quantity.items() if q))
+        self.__observation = observation
+        self.__rng = rng
+
+    @property
+    def counter(self):
+        return self.__counter
+
+    def choose(self) -> int:
+        counter = self.__counter
+        observation = counter.normalize(self.__observation)
+        if self.__shared is not None:
+            probabilities = self.__shared.values(observation, self.__fleet, counter.probabilities)
+        else:
+            probabilities = counter.probabilities(observation)
+        cells = best_cells(probabilities, observation)
+        if not cells:
+            # наблюдение противоречиво (так бывает, только если стратегию кормят чужими выстрелами)
+            return self.__rng.choice([c for c, mark in enumerate(observation)
+                                      if mark == SeaBattleGameBoard.Fog_Of_War])
+        return cells[0] if len(cells) == 1 or not self.__random_ties else self.__rng.choice(cells)
+
+
+# ---------------------------------
+# Случайные расстановки оставшихся кораблей противника, согласованные с наблюдением:
+#   - blocked - клетки, где корабля быть не может (промахи, убитые корабли и их соседи)
+#   - hits - попадания по еще не убитым кораблям: каждое накрыто кораблем, корабли не касаются
+#     чужих попаданий сторонами и не состоят из одних попаданий (такой корабль был бы убит)
+# Сначала ставятся корабли через непокрытые попадания (среди всех подходящих положений всех оставшихся
+# длин), затем остальные, от длинных к коротким, - среди всех свободных положений.
+# Последовательная расстановка сама по себе не равновероятна (поздним кораблям достается меньше
+# места), поэтому у каждой расстановки есть вес - величина, обратная вероятности ее получить:
+# произведение количеств вариантов на каждом шаге, деленное на количество порядков постановки
+# одинаковых кораблей. Частоты, взвешенные так, сходятся к вероятностям при равновероятных
+# согласованных расстановках (как в placementCount).
+# Расстановка - кортеж пар (длина корабля, индекс положения в ship_placements)
+_cover_cache = {}
+_body_masks_cache = {}
+
+
+# Для каждой клетки - индексы положений корабля длины ship_size, накрывающих ее
+def cover_table(board_size: int, ship_size: int) -> list[list[int]]:
+    key = (board_size, ship_size)
+    if key not in _cover_cache:
+        cover = [[] for _ in range(board_size * board_size)]
+        for i, placement in enumerate(ship_placements(board_size, ship_size)):
+            for c in placement.body:
+                cover[c].append(i)
+        _cover_cache[key] = cover
+    return _cover_cache[key]
+
+
+def body_masks(board_size: int, ship_size: int) -> list[int]:
+    key = (board_size, ship_size)
+    if key not in _body_masks_cache:
+        _body_masks_cache[key] = [placement.body_mask for placement in ship_placements(board_size, ship_size)]
+    return _body_masks_cache[key]
+
+
+# Возвращает (расстановка, вес) или None, если расстановку не удалось достроить
+def sample_fleet(board_size: int, sizes: tuple, blocked: int, hits: int, random):
+    fleet = []
+    weight = 1.0
+    occupied = blocked
+    uncovered = hits
+    pending = list(sizes)
+    while uncovered:
+        cell = (uncovered & -uncovered).bit_length() - 1
+        candidates = []
+        for ship_size in sorted(set(pending)):
+            table = ship_placements(board_size, ship_size)
+            for i in cover_table(board_size, ship_size)[cell]:
+                body_mask = table[i].body_mask
+                if not body_mask & occupied and not table[i].mask & ~body_mask & hits and body_mask & ~hits:
+                    candidates.append((ship_size, i))
+        if not candidates:
+            return None
+        weight *= len(candidates)
+        ship_size, i = candidates[int(random() * len(candidates))]
+        placement = ship_placements(board_size, ship_size)[i]
+        fleet.append((ship_size, i))
+        pending.remove(ship_size)
+        occupied |= placement.mask
+        uncovered &= ~placement.body_mask
+
+    pending.sort(reverse=True)
+    for k, ship_size in enumerate(pending):
+        masks = body_masks(board_size, ship_size)
+        free = [i for i, mask in enumerate(masks) if not mask & occupied]
+        if not free:
+            return None
+        weight *= len(free)
+        if k and pending[k - 1] == ship_size:
+            # одинаковые корабли можно было поставить в любом порядке
+            same = 2
+            while k >= same and pending[k - same] == ship_size:
+                same += 1
+            weight /= same
+        i = free[int(random() * len(free))]
+        fleet.append((ship_size, i))
+        occupied |= ship_placements(board_size, ship_size)[i].mask
+    return tuple(fleet), weight
+
+
+# Выполняется в процессе-воркере (или в самом игроке при workers=0): до count расстановок
+# с весами, но не дольше budget секунд. budget=None - без ограничения времени, но не больше
+# Max_Attempts попыток на расстановку (результат зависит только от seed)
+Max_Attempts = 100
+
+
+def _sample_task(task: tuple) -> list[tuple]:
+    board_size, sizes, blocked, hits, count, seed, budget = task
+    random = rnd.Random(seed).random
+    deadline = time.perf_counter() + budget if budget is not None else None
+    attempts = count * Max_Attempts
+    samples = []
+    while len(samples) < count and (time.perf_counter() < deadline if deadline is not None else attempts > 0):
+        attempts -= 1
+        sample = sample_fleet(board_size, sizes, blocked, hits, random)
+        if sample is not None:
+            samples.append(sample)
+    return samples
+
+
+def _close_pool(pool) -> None:
+    pool.close()
+    pool.join()
+
+
+# ---------------------------------
+# Стратегия Монте-Карло: держит пул из samples случайных расстановок оставшихся кораблей,
+# согласованных с наблюдением, и стреляет в открытую клетку, чаще всего (с учетом весов,
+# см. sample_fleet) занятую кораблем в этих расстановках. Пул живет всю партию: после выстрела из него
+# убираются только расстановки, которые результат выстрела опроверг (промах по кораблю расстановки,
+# попадание мимо ее кораблей, убитый корабль не совпал ни с одним из них), а перед следующим ходом
+# пул пополняется новыми.
+# Пополнение ограничено временем move_time на ход; при workers > 0 расстановки строятся параллельно
+# в пуле процессов: он создается при первом ходе и переживает партии (reset), а закрывается close(),
+# выходом из with или, если стратегию никто не закрыл, когда ее соберет сборщик мусора или при выходе
+# из интерпретатора (weakref.finalize). Из-за ограничения по времени
+# партии со стратегией не полностью воспроизводимы по зерну; с move_time=None пул всегда пополняется
+# до samples расстановок, и партия определяется только зерном
+class MonteCarloShots(ShotStrategy):
+    def __init__(self, samples: int = 400, move_time: float | None = 0.05, workers: int = 0) -> None:
+        self.__samples_target = samples
+        self.__move_time = move_time
+        self.__workers = workers
+        self.__pool = None
+        self.__finalizer = None
+        self.__samples = []             # (маска клеток кораблей, кортеж Placement, вес)
+
+    def reset(self, board_size: int, ships_quantity: dict, observation, rng) -> None:
+        self.__board_size = board_size
+        self.__rng = rng
+        self.__remaining = dict(ships_quantity)
+        self.__blocked = 0
+        self.__hits = 0
+        self.__open = (1 << board_size * board_size) - 1
+        self.__samples = []
+
+    @property
+    def samples(self) -> int:
+        return len(self.__samples)
+
+    def close(self) -> None:
+        if self.__pool is not None:
+            self.__finalizer()
+            self.__pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __refill(self) -> None:
+        need = self.__samples_target - len(self.__samples)
+        if need <= 0:
+            return
+        sizes = tuple(ship_size for ship_size, n in self.__remaining.items() for _ in range(n))
+        task = (self.__board_size, sizes, self.__blocked, self.__hits)
+        if self.__workers > 0:
+            if self.__pool is None:
+                import multiprocessing
+                self.__pool = multiprocessing.Pool(self.__workers)
+                self.__finalizer = weakref.finalize(self, _close_pool, self.__pool)
+            share = -(-need // self.__workers)
+            tasks = [task + (share, self.__rng.getrandbits(64), self.__move_time) for _ in range(self.__workers)]
+            fleets = [fleet for part in self.__pool.map(_sample_task, tasks) for fleet in part]
+        else:
+            fleets = _sample_task(task + (need, self.__rng.getrandbits(64), self.__move_time))
+        fleets = fleets[:need]
+        if not fleets:
+            return
+        # веса нормируются по каждому пополнению: расстановки, построенные при разных наблюдениях,
+        # получены разными распределениями, и их веса напрямую не сравнимы
+        scale = len(fleets) / sum(weight for _, weight in fleets)
+        for fleet, weight in fleets:
+            ships = tuple(ship_placements(self.__board_size, ship_size)[i] for ship_size, i in fleet)
+            mask = 0
+            for ship in ships:
+                mask |= ship.body_mask
+            self.__samples.append((mask, ships, weight * scale))
+
+    def choose(self) -> int:
+        self.__refill()
+        candidates = self.__open & ~self.__blocked
+        if not candidates:
+            candidates = self.__open
+        counts = [0] * (self.__board_size * self.__board_size)
+        for _, ships, weight in self.__samples:
+            for ship in ships:
+                for c in ship.body:
+                    counts[c] += weight
+        cells = [c for c in range(len(counts)) if candidates >> c & 1]
+        best = max(counts[c] for c in cells)
+        cells = [c for c in cells if counts[c] == best]
+        cell = cells[0] if len(cells) == 1 else self.__rng.choice(cells)
+        self.__open &= ~(1 << cell)
+        return cell
+
+    def take(self, cell: int) -> None:
+        self.__open &= ~(1 << cell)
+
+    def observe(self, cell: int, result: int) -> None:
+        bit = 1 << cell
+        if result == SeaBattleGameBoard.Shot_Miss:
+            self.__blocked |= bit
+            self.__samples = [sample for sample in self.__samples if not sample[0] & bit]
+        elif result == SeaBattleGameBoard.Shot_Injured:
+            self.__hits |= bit
+            hits = self.__hits
+            self.__samples = [sample for sample in self.__samples if sample[0] & bit and
+                              all(ship.body_mask & ~hits for ship in sample[1] if ship.body_mask & bit)]
+        elif result == SeaBattleGameBoard.Shot_Killed:
+            self.__kill(cell)
+
+    # Потопление: корабль - связная по сторонам группа попаданий вокруг клетки. В расстановках пула
+    # он должен совпасть с одним из кораблей; этот корабль убирается из расстановки
+    def __kill(self, cell: int) -> None:
+        size = self.__board_size
+        hits = self.__hits | 1 << cell
+        ship = {cell}
+        stack = [cell]
+        while stack:
+            for c in cell_neighbors(stack.pop(), size):
+                if hits >> c & 1 and c not in ship:
+                    ship.add(c)
+                    stack.append(c)
+        ship_mask = 0
+        for c in ship:
+            ship_mask |= 1 << c
+            for n in cell_neighbors(c, size):
+                self.__blocked |= 1 << n
+        self.__blocked |= ship_mask
+        self.__hits = hits & ~ship_mask
+        if self.__remaining.get(len(ship)):
+            self.__remaining[len(ship)] -= 1
+
+        samples = []
+        for mask, ships, weight in self.__samples:
+            for i, ship in enumerate(ships):
+                if ship.body_mask == ship_mask:
+                    samples.append((mask & ~ship_mask, ships[:i] + ships[i + 1:], weight))
+                    break
+        self.__samples = samples
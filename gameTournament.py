@@ -0,0 +1,153 @@
+import argparse
+import functools
+import itertools
+import multiprocessing
+import time
+from collections import Counter
+
+from gameSimulation import HeadlessSimulation, RandomShots, GameResult
+from gameStrategies import DensityShots, MonteCarloShots
+from gameLogic import SeaBattleGameLogic
+
+
+# ============================================
+# Турнир: миллионы безголовых партий на всех ядрах.
+# Партии каждой пары стратегий делятся на шарды фиксированного размера; партия с номером i
+# всегда играется с зерном base_seed + i, поэтому любую партию можно переиграть через replay().
+# Воркеры возвращают не результаты партий, а уже агрегированную статистику шарда,
+# так что память главного процесса не растет с количеством партий
+
+# стратегии, доступные в турнире, по именам. Монте-Карло - без ограничения времени на ход
+# (только по количеству расстановок): иначе партию нельзя переиграть по зерну
+Strategies = {
+    'random': RandomShots,
+    'density': DensityShots,
+    'montecarlo': functools.partial(MonteCarloShots, move_time=None),
+}
+
+
+# ---------------------------------
+# класс агрегированной статистики одной пары стратегий
+class PairStats:
+    def __init__(self) -> None:
+        self.games = 0
+        self.wins = [0, 0]
+        self.turns = 0
+        # гистограммы: количество выстрелов победителя -> количество партий
+        self.shots_to_win = [Counter(), Counter()]
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        self.turns += result.turns
+        winner = result.winner - 1
+        self.wins[winner] += 1
+        self.shots_to_win[winner][result.shots2 if winner else result.shots1] += 1
+
+    def merge(self, other) -> None:
+        self.games += other.games
+        self.turns += other.turns
+        for i in range(2):
+            self.wins[i] += other.wins[i]
+            self.shots_to_win[i].update(other.shots_to_win[i])
+
+    def win_rate(self, player: int) -> float:
+        return self.wins[player - 1] / self.games if self.games else 0.0
+
+    def mean_shots_to_win(self) -> float:
+        total = sum(shots * n for histogram in self.shots_to_win for shots, n in histogram.items())
+        return total / self.games if self.games else 0.0
+
+    def __str__(self) -> str:
+        return (f"партий: {self.games}, победы: {self.win_rate(1):.3f} / {self.win_rate(2):.3f}, "
+                f"выстрелов до победы: {self.mean_shots_to_win():.1f}, "
+                f"ходов: {self.turns / self.games if self.games else 0:.1f}")
+
+
+# Шард - непрерывный диапазон номеров партий одной пары стратегий
+def make_shards(games: int, shard_size: int) -> list[tuple[int, int]]:
+    return [(start, min(shard_size, games - start)) for start in range(0, games, shard_size)]
+
+
+# Выполняется в процессе-воркере: играет шард и возвращает его статистику.
+# Стратегии шарда закрываются в конце (например, пул процессов MonteCarloShots с workers > 0)
+def _play_shard(task: tuple) -> tuple:
+    pair, start, count, base_seed, board_size, ships_quantity = task
+    strategies = [Strategies[name]() for name in pair]
+    try:
+        sim = HeadlessSimulation(board_size, *strategies, ships_quantity)
+        stats = PairStats()
+        for result in sim.run(count, base_seed + start):
+            stats.add(result)
+    finally:
+        for strategy in strategies:
+            strategy.close()
+    return pair, stats
+
+
+# ---------------------------------
+# класс турнира между стратегиями
+class Tournament:
+    Default_Shard_Size = 2000
+
+    def __init__(self, board_size: int, strategies: list[str], ships_quantity: dict = None,
+                 base_seed: int = 0) -> None:
+        for name in strategies:
+            if name not in Strategies:
+                raise ValueError(f"Неизвестная стратегия '{name}'")
+        self.__board_size = board_size
+        self.__ships_quantity = dict(ships_quantity if ships_quantity else SeaBattleGameLogic.Ships_Quantity)
+        self.__base_seed = base_seed
+        # каждая стратегия играет с каждой, включая саму себя, и первой, и второй
+        self.__pairs = list(itertools.product(strategies, repeat=2))
+
+    @property
+    def pairs(self) -> list[tuple[str, str]]:
+        return self.__pairs
+
+    def tasks(self, games: int, shard_size: int):
+        for pair in self.__pairs:
+            for start, count in make_shards(games, shard_size):
+                yield pair, start, count, self.__base_seed, self.__board_size, self.__ships_quantity
+
+    # Играет games партий для каждой пары стратегий на workers процессах (по умолчанию - все ядра)
+    def run(self, games: int, workers: int = None, shard_size: int = Default_Shard_Size) -> dict:
+        stats = {pair: PairStats() for pair in self.__pairs}
+        tasks = self.tasks(games, shard_size)
+        if workers == 1:
+            for pair, shard_stats in map(_play_shard, tasks):
+                stats[pair].merge(shard_stats)
+            return stats
+
+        with multiprocessing.Pool(workers) as pool:
+            for pair, shard_stats in pool.imap_unordered(_play_shard, tasks):
+                stats[pair].merge(shard_stats)
+        return stats
+
+    # Переигрывает партию номер game_index пары pair точно так же, как она была сыграна в турнире
+    def replay(self, pair: tuple[str, str], game_index: int) -> GameResult:
+        strategies = [Strategies[name]() for name in pair]
+        try:
+            sim = HeadlessSimulation(self.__board_size, *strategies, self.__ships_quantity)
+            return sim.play(self.__base_seed + game_index)
+        finally:
+            for strategy in strategies:
+                strategy.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Турнир стратегий компьютерного игрока")
+    parser.add_argument('strategies', nargs='*', default=['random'],
+                        help="стратегии: " + ", ".join(sorted(Strategies)))
+    parser.add_argument('--games', type=int, default=100000, help="партий на каждую пару стратегий")
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    tournament = Tournament(args.size, args.strategies, base_seed=args.seed)
+    start_time = time.perf_counter()
+    results = tournament.run(args.games, args.workers)
+    elapsed = time.perf_counter() - start_time
+    for (first, second), pair_stats in results.items():
+        print(f"{first} - {second}: {pair_stats}")
+    print(f"Время: {elapsed:.2f} с")
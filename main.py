@@ -1,13 +1,42 @@
-from gameLogic import GameEvent, SeaBattleGameBoard, SeaBattleGameLogic, HumanPlayer, ComputerPlayer
+import argparse
+import sys
+
+import gameConfig
+import gameEvents
+import gameMetrics
+from fleetPlacement import cell_neighbors
+from gameLogic import GameEvent, Point, SeaBattleGameBoard, SeaBattleGameLogic, HumanPlayer, ComputerPlayer
+
+
+# Необязательные подсистемы (asyncio, cProfile, shutil) загружаются только при использовании:
+# ConsoleGameGui импортируется и из play.py, короткие запуски которого должны стартовать быстро
+def _terminal_lines() -> int:
+    import shutil
+    return shutil.get_terminal_size().lines
 
 
 # -----------------------------------------
+# Консольный интерфейс. Кадр (оба поля с заголовком) строится один раз за партию и хранится
+# в буфере; после каждого выстрела в буфере меняются только затронутые клетки: клетка выстрела,
+# а при потоплении - весь корабль и его соседи. Кадр выводится одной записью.
+# С in_place=True кадр закрепляется вверху экрана, и перерисовываются только изменившиеся клетки
+# (ANSI-последовательности перемещения курсора); остальной вывод прокручивается под ним
 class ConsoleGameGui:
     Visual = ['○', '◌', '■', '◦', '▪', 'X']
+    Ships_Line = 2              # номер строки кадра с количеством живых кораблей
+    Header_Lines = 4            # пустая строка, имена, количество кораблей, номера столбцов
 
-    def __init__(self, size, logic) -> None:
+    def __init__(self, size, logic, in_place: bool = False, out=None) -> None:
         self.__board_size = size
         self.logic = logic
+        self.__in_place = in_place
+        self.__out = out                # по умолчанию - sys.stdout на момент вывода
+        self.__players = None
+        self.__covered = None
+        self.__cells = None
+        self.__lines = None
+        self.__changed = set()          # (индекс игрока, x, y) клеток, изменившихся после прошлого кадра
+        self.__ships_changed = False
 
     # Генератор потока событий GameEvent для основноего цикла игры
     def get_event(self) -> list[GameEvent]:
@@ -23,69 +52,240 @@ class ConsoleGameGui:
                         yield GameEvent(GameEvent.Event_Win, player)
 
     def process_event(self, event):
+        if event.type != GameEvent.Event_Shot or self.__lines is None:
+            self.logic.process_event(event)
+            return
+        target = event.player.enemy
+        ships = target.board.alive_ships_count
         self.logic.process_event(event)
+        self.__touch(self.__players.index(target), event.data, ships)
+
+    # Отмечает клетки, которые мог изменить выстрел shot по полю игрока с индексом i
+    def __touch(self, i: int, shot: Point, ships: int) -> None:
+        board = self.__players[i].board
+        size = self.board_size
+        cell = (shot.x - 1) * size + (shot.y - 1)
+        self.__changed.add((i, shot.x - 1, shot.y - 1))
+        if board.alive_ships_count == ships:
+            return
+
+        # корабль потоплен: его клетки - связная по сторонам группа попаданий вокруг выстрела
+        self.__ships_changed = True
+        enemy_shots = board.enemy_shots
+        ship = {cell}
+        stack = [cell]
+        while stack:
+            for c in cell_neighbors(stack.pop(), size):
+                if c not in ship and enemy_shots[c // size][c % size] == SeaBattleGameBoard.Hit_Shot:
+                    ship.add(c)
+                    stack.append(c)
+        for c in ship:
+            for n in cell_neighbors(c, size):
+                self.__changed.add((i, n // size, n % size))
+
+    # Правило видимости вычисляется один раз за партию: поле, по которому стреляет компьютер,
+    # показывается вместе с кораблями, остальные поля - только с отметками выстрелов.
+    # covered[i][x][y] - что показать в нетронутой клетке поля игрока i (None - только отметки)
+    def __render(self) -> None:
+        self.__players = [self.logic.player1, self.logic.player2]
+        self.__covered = []
+        for player in self.__players:
+            if isinstance(player.enemy, ComputerPlayer) and isinstance(player, (HumanPlayer, ComputerPlayer)):
+                board = player.board.board
+                self.__covered.append([[self.Visual[board[x][y]] for y in range(self.board_size)]
+                                       for x in range(self.board_size)])
+            else:
+                self.__covered.append(None)
+
+        self.__cells = [[[self.__glyph(i, x, y) for x in range(self.board_size)] for y in range(self.board_size)]
+                        for i in range(2)]
+        row = ' ' + ''.join(' ' + str(x + 1) for x in range(self.board_size))
+        self.__lines = ['',
+                        "{:<15}  :  {:>15}".format(self.logic.player1.name, self.logic.player2.name),
+                        self.__ships_line(),
+                        "{:<15}     {:>15}".format(row, row)]
+        self.__lines.extend(self.__row_line(y) for y in range(self.board_size))
+        self.__changed.clear()
+        self.__ships_changed = False
+
+    def __glyph(self, i: int, x: int, y: int) -> str:
+        mark = self.__players[i].board.enemy_shots[x][y]
+        covered = self.__covered[i]
+        if covered is not None and mark in (SeaBattleGameBoard.Fog_Of_War, SeaBattleGameBoard.Ship_Neighbor):
+            return covered[x][y]
+        return self.Visual[mark]
+
+    def __ships_line(self) -> str:
+        return "{:<15}  :  {:>15}".format("Кораблей: " + str(self.logic.player1.board.alive_ships_count),
+                                          "Кораблей: " + str(self.logic.player2.board.alive_ships_count))
+
+    # Строка y обоих полей с номером строки в начале.
+    # Левое поле - поле игрока player1, правое поле - поле игрока player2
+    def __row_line(self, y: int) -> str:
+        return "{:<15}     {:>15}".format(str(y + 1) + ''.join(' ' + g for g in self.__cells[0][y]),
+                                         str(y + 1) + ''.join(' ' + g for g in self.__cells[1][y]))
+
+    # Позиция клетки на экране (строка, столбец, считая с 1) для режима in_place
+    def __position(self, i: int, x: int, y: int) -> tuple[int, int]:
+        prefix = len(str(y + 1))
+        width = prefix + 2 * self.board_size
+        column = prefix + 1 + 2 * x
+        if i:
+            column += max(15, width) + 5 + max(0, 15 - width)
+        return self.Header_Lines + y + 1, column + 1
+
+    # Перед кадром выводятся накопленные сообщения шины событий, чтобы сохранить порядок вывода
+    def __write(self, text: str) -> None:
+        gameEvents.flush()
+        out = self.__out if self.__out is not None else sys.stdout
+        out.write(text)
+        if self.__in_place:
+            out.flush()
 
     def draw(self):
-        # Вывод заголовка с (1) именами игроков, (2) количеством живых кораблей и (3) номерами столбцов
-        print()
-        print("{:<15}  :  {:>15}".format(self.logic.player1.name, self.logic.player2.name))
-        print("{:<15}  :  {:>15}".format("Кораблей: " + str(self.logic.player1.board.alive_ships_count),
-                                         "Кораблей: " + str(self.logic.player2.board.alive_ships_count)))
-        row = ' '
-        for x in range(self.board_size):
-            row = row + ' ' + str(x + 1)
-        print("{:<15}     {:>15}".format(row, row))
-
-        # Построчный вывод на консоль двух полей с номерами строк (координата y) в начале каждой строки
-        # Левое поле - поле игрока player1
-        # Правое поле - поле игрока player2
-        # ToDo: оптимизировать, упростить
-        for y in range(self.board_size):
-            rows = []
-            for player in [self.logic.player1, self.logic.player2]:
-                row = str(y + 1)
-                for x in range(self.board_size):
-                    if player.__class__.__name__ == player.enemy.__class__.__name__ == 'HumanPlayer':
-                        row = row + ' ' + self.Visual[player.board.enemy_shots[x][y]]
-                    elif player.__class__.__name__ == player.enemy.__class__.__name__ == 'ComputerPlayer':
-                        if (player.board.enemy_shots[x][y] in
-                                [SeaBattleGameBoard.Fog_Of_War, SeaBattleGameBoard.Ship_Neighbor]):
-                            row = row + ' ' + self.Visual[player.board.board[x][y]]
-                        else:
-                            row = row + ' ' + self.Visual[player.board.enemy_shots[x][y]]
-                    elif player.__class__.__name__ == 'HumanPlayer' and player.enemy.__class__.__name__ == 'ComputerPlayer':
-                        if (player.board.enemy_shots[x][y] in
-                                [SeaBattleGameBoard.Fog_Of_War, SeaBattleGameBoard.Ship_Neighbor]):
-                            row = row + ' ' + self.Visual[player.board.board[x][y]]
-                        else:
-                            row = row + ' ' + self.Visual[player.board.enemy_shots[x][y]]
-                    else:
-                        row = row + ' ' + self.Visual[player.board.enemy_shots[x][y]]
-                rows.append(row)
-            print("{:<15}     {:>15}".format(rows[0], rows[1]))
+        if self.__lines is None:
+            self.__render()
+            frame = '\n'.join(self.__lines) + '\n'
+            if self.__in_place:
+                # поле - вверху экрана, все остальное прокручивается в области под ним
+                top = len(self.__lines) + 1
+                frame = f"\x1b[2J\x1b[H{frame}\x1b[{top};{_terminal_lines()}r\x1b[{top};1H"
+            self.__write(frame)
+            return
+
+        updates = []
+        rows = set()
+        for i, x, y in self.__changed:
+            glyph = self.__glyph(i, x, y)
+            if self.__cells[i][y][x] != glyph:
+                self.__cells[i][y][x] = glyph
+                rows.add(y)
+                updates.append((i, x, y, glyph))
+        self.__changed.clear()
+        for y in rows:
+            self.__lines[self.Header_Lines + y] = self.__row_line(y)
+        ships_changed = self.__ships_changed
+        if ships_changed:
+            self.__ships_changed = False
+            self.__lines[self.Ships_Line] = self.__ships_line()
+
+        if not self.__in_place:
+            self.__write('\n'.join(self.__lines) + '\n')
+            return
+        text = ''.join("\x1b[{};{}H{}".format(*self.__position(i, x, y), glyph) for i, x, y, glyph in updates)
+        if ships_changed:
+            text += f"\x1b[{self.Ships_Line + 1};1H\x1b[2K{self.__lines[self.Ships_Line]}"
+        if text:
+            self.__write(f"\x1b7{text}\x1b8")
+
+    # Возвращает терминалу обычную прокрутку после игры в режиме in_place
+    def close(self) -> None:
+        if self.__in_place and self.__lines is not None:
+            self.__write(f"\x1b[r\x1b[{_terminal_lines()};1H")
 
     def run(self):
         for event in self.get_event():
             if event.type == GameEvent.Event_Quit:
-                print("Bye-bye!")
+                gameEvents.emit(gameEvents.Msg_Info, "Bye-bye!")
                 break
             elif event.type == GameEvent.Event_Win:
-                print()
-                print(event.player.congrats())
+                gameEvents.emit(gameEvents.Msg_Info, f"\n{event.player.congrats()}")
                 break
             else:
                 self.process_event(event)
 
             self.draw()
+        self.close()
+        gameEvents.flush()
+
+    # То же, что run(), но в асинхронном цикле игры (см. gameAsync) с необязательным тайм-аутом хода
+    async def run_async(self, move_timeout: float = None) -> None:
+        from gameAsync import AsyncGame
+        await AsyncGame(self.logic, move_timeout, self.__show_event, self.process_event).run()
+        self.close()
+        gameEvents.flush()
+
+    def __show_event(self, event: GameEvent) -> None:
+        if event.type == GameEvent.Event_Quit:
+            gameEvents.emit(gameEvents.Msg_Info, "Bye-bye!")
+        elif event.type == GameEvent.Event_Win:
+            gameEvents.emit(gameEvents.Msg_Info, f"\n{event.player.congrats()}")
+        else:
+            if event.type == GameEvent.Event_Timeout:
+                gameEvents.emit(gameEvents.Msg_Info, f"Время хода игрока '{event.player.name}' истекло")
+            self.draw()
 
     @property
     def board_size(self) -> int:
         return self.__board_size
 
 
+gameMetrics.instrument(ConsoleGameGui, 'draw')
+
+
+# Режим --profile: games партий компьютер против компьютера через ConsoleGameGui под cProfile
+# с включенными замерами gameMetrics. Компьютер ходит без ожидания [Enter], вывод партий отбрасывается;
+# на консоль выводятся отчет cProfile и снимок замеров
+def profile_games(games: int, board_size: int, sort: str = 'cumulative', top: int = 25,
+                  metrics_format: str = 'prometheus', fleet: dict = None) -> None:
+    import contextlib
+    import cProfile
+    import io
+    import pstats
+    gameMetrics.reset()
+    gameMetrics.enable()
+    profiler = cProfile.Profile()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            profiler.enable()
+            for i in range(games):
+                players = [ComputerPlayer(f"Комп {i}{side}", pause=False) for side in 'ab']
+                logic = SeaBattleGameLogic(board_size, *players, ships_quantity=fleet)
+                gui = ConsoleGameGui(board_size, logic, out=io.StringIO())
+                gui.draw()
+                gui.run()
+            profiler.disable()
+    finally:
+        gameMetrics.disable()
+
+    print(f"Профиль {games} партий {board_size}x{board_size}:")
+    pstats.Stats(profiler).strip_dirs().sort_stats(sort).print_stats(top)
+    print(gameMetrics.to_json() if metrics_format == 'json' else gameMetrics.to_prometheus())
+
+
 # --------------------------------------------
 if __name__ == "__main__":
-    board_size = 6
+    parser = argparse.ArgumentParser(description="Игра «Морской бой»")
+    parser.add_argument('--profile', type=int, metavar='GAMES', default=0,
+                        help="сыграть GAMES партий компьютер против компьютера и вывести профиль и замеры")
+    parser.add_argument('--size', type=int, default=6, help=f"размер поля, до {gameConfig.Max_Board_Size}")
+    parser.add_argument('--fleet', default=None, help="флот 'длина:количество,...', например 4:1,3:2,2:3,1:4")
+    parser.add_argument('--config', default=None, help="файл JSON с board_size и fleet (см. gameConfig)")
+    parser.add_argument('--sort', default='cumulative', help="сортировка отчета cProfile")
+    parser.add_argument('--metrics', choices=['prometheus', 'json'], default='prometheus')
+    parser.add_argument('--in-place', action='store_true',
+                        help="закрепить поля вверху экрана и перерисовывать только изменившиеся клетки (ANSI)")
+    parser.add_argument('--move-timeout', type=float, metavar='SECONDS', default=None,
+                        help="играть в асинхронном цикле (см. gameAsync); не успевший за SECONDS секунд "
+                             "игрок пропускает ход")
+    args = parser.parse_args()
+    if args.move_timeout is not None and args.move_timeout <= 0:
+        parser.error("--move-timeout должен быть больше нуля")
+
+    try:
+        fleet = gameConfig.parse_fleet(args.fleet) if args.fleet else dict(SeaBattleGameLogic.Ships_Quantity)
+        if args.config:
+            board_size, fleet = gameConfig.load_config(args.config, args.size, fleet)
+        else:
+            board_size = args.size
+            gameConfig.check_config(board_size, fleet)
+    except ValueError:
+        sys.exit(1)
+
+    if args.profile:
+        profile_games(args.profile, board_size, args.sort, metrics_format=args.metrics, fleet=fleet)
+        sys.exit()
+
     print("\nДобро пожаловать в игру «Морской бой»!\n")
     str_ = input("Назовите имя первого игрока (оставьте имя пустым, если играть будет Компьютер): ")
     player1 = HumanPlayer(str_) if str_ else ComputerPlayer("Комп 1")
@@ -95,6 +295,11 @@ if __name__ == "__main__":
     if player1.__class__.__name__ == 'ComputerPlayer' and player2.__class__.__name__ == 'ComputerPlayer':
         player2.name = "Комп 2"
 
-    gui = ConsoleGameGui(board_size, SeaBattleGameLogic(board_size, player1, player2))
+    gui = ConsoleGameGui(board_size, SeaBattleGameLogic(board_size, player1, player2, ships_quantity=fleet),
+                         in_place=args.in_place)
     gui.draw()
-    gui.run()
+    if args.move_timeout is not None:
+        import asyncio
+        asyncio.run(gui.run_async(args.move_timeout))
+    else:
+        gui.run()
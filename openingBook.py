@@ -0,0 +1,255 @@
+import argparse
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+
+from fleetPlacement import cell_neighbors
+from gameConfig import check_config, parse_fleet
+from gameLogic import SeaBattleGameBoard, SeaBattleGameLogic
+from gameRecord import cell_format, no_shot
+from gameSimulation import ShotStrategy
+from gameStrategies import ExactShots, best_shot
+
+try:
+    from placementCount import PlacementCounter
+except ImportError:
+    PlacementCounter = None
+
+
+# ============================================
+# Книга дебютов: лучшие первые Depth выстрелов для поля и флота, посчитанные заранее.
+#
+# Начало партии одинаково для всех партий с тем же размером поля и флотом, поэтому ходы ExactShots
+# (лучший выстрел по точным вероятностям placementCount) для каждой возможной последовательности
+# результатов первых выстрелов считаются один раз и кладутся в файл. Игрок (BookShots) берет ход
+# из книги по номеру узла за O(1) и переходит к живому расчету своей стратегии, как только
+# партия вышла за пределы книги.
+#
+# Узлы - полное троичное дерево результатов выстрелов: корень 0 - пустое поле, у узла n после
+# результата r (SeaBattleGameBoard.Shot_Miss, Shot_Injured, Shot_Killed) - потомок 3 * n + 1 + r.
+# Узлов глубиной меньше Depth - (3 ** Depth - 1) // 2.
+#
+# Файл (little-endian): Header '<4sHBB' - File_Magic, размер поля, Depth, количество длин кораблей;
+# затем пары Fleet_Item '<HI' (длина, количество); с выравниванием на 8 байт - таблица клеток
+# выстрела по номерам узлов шириной gameRecord.cell_format(size). No_Shot (gameRecord.no_shot) -
+# узла нет: такая последовательность результатов невозможна. Таблица читается через mmap
+
+File_Magic = b'SBB1'
+Header = struct.Struct('<4sHBB')
+Fleet_Item = struct.Struct('<HI')
+
+
+def child(node: int, result: int) -> int:
+    return 3 * node + 1 + result
+
+
+def nodes_count(depth: int) -> int:
+    return (3 ** depth - 1) // 2
+
+
+# Имя файла книги по умолчанию: book_<размер>_<длина>x<количество>_....sbb
+def book_name(board_size: int, ships_quantity: dict) -> str:
+    fleet = '_'.join(f"{ship_size}x{n}" for ship_size, n in sorted(ships_quantity.items(), reverse=True) if n)
+    return f"book_{board_size}_{fleet}.sbb"
+
+
+# Наблюдение (плоское, в кодировке SeaBattleGameBoard.enemy_shots) после выстрела в cell с результатом result.
+# Убитый корабль - связная по сторонам группа попаданий; его соседи помечаются, как на поле
+def apply_shot(observation: bytes, board_size: int, cell: int, result: int) -> bytes:
+    ret = bytearray(observation)
+    if result == SeaBattleGameBoard.Shot_Miss:
+        ret[cell] = SeaBattleGameBoard.Miss_Shot
+        return bytes(ret)
+    ret[cell] = SeaBattleGameBoard.Hit_Shot
+    if result == SeaBattleGameBoard.Shot_Killed:
+        ship = {cell}
+        stack = [cell]
+        while stack:
+            for c in cell_neighbors(stack.pop(), board_size):
+                if ret[c] == SeaBattleGameBoard.Hit_Shot and c not in ship:
+                    ship.add(c)
+                    stack.append(c)
+                elif ret[c] == SeaBattleGameBoard.Fog_Of_War:
+                    ret[c] = SeaBattleGameBoard.Ship_Neighbor
+    return bytes(ret)
+
+
+# ---------------------------------
+# Построение книги. Узлы одной глубины независимы и считаются параллельно в пуле процессов;
+# у каждого процесса свой PlacementCounter (граф переходов строится один раз на процесс).
+# workers <= 1 - без пула, в текущем процессе (как workers=0 у MonteCarloShots); None - по числу ядер
+_counter = None
+
+
+def _init_worker(board_size: int, ships_quantity: dict) -> None:
+    global _counter
+    _counter = PlacementCounter(board_size, ships_quantity)
+
+
+def _best_shot(observation: bytes):
+    return best_shot(_counter, observation)
+
+
+def build(board_size: int, ships_quantity: dict, depth: int, workers: int = None) -> list:
+    if PlacementCounter is None:
+        raise ImportError("Для построения книги дебютов нужен пакет numpy")
+    table = [None] * nodes_count(depth)
+    level = [(0, bytes(board_size * board_size))]
+    pool = None
+    if workers is not None and workers <= 1:
+        _init_worker(board_size, ships_quantity)
+        evaluate = map
+    else:
+        pool = multiprocessing.Pool(workers, _init_worker, (board_size, ships_quantity))
+        evaluate = pool.map
+    try:
+        for d in range(depth):
+            cells = list(evaluate(_best_shot, [observation for _, observation in level]))
+            next_level = []
+            for (node, observation), cell in zip(level, cells):
+                table[node] = cell
+                if cell is None or d + 1 == depth:
+                    continue
+                for result in (SeaBattleGameBoard.Shot_Miss, SeaBattleGameBoard.Shot_Injured,
+                               SeaBattleGameBoard.Shot_Killed):
+                    next_level.append((child(node, result), apply_shot(observation, board_size, cell, result)))
+            level = next_level
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return table
+
+
+def write_book(path: str, board_size: int, ships_quantity: dict, depth: int, table: list) -> None:
+    fleet = [(ship_size, n) for ship_size, n in sorted(ships_quantity.items()) if n]
+    head = Header.pack(File_Magic, board_size, depth, len(fleet))
+    for item in fleet:
+        head += Fleet_Item.pack(*item)
+    head += bytes(-len(head) % 8)
+    empty = no_shot(board_size)
+    cells = [empty if cell is None else cell for cell in table]
+    with open(path, 'wb') as f:
+        f.write(head)
+        f.write(struct.pack(f'<{len(cells)}{cell_format(board_size)}', *cells))
+
+
+# ---------------------------------
+# класс книги дебютов, прочитанной через mmap
+class OpeningBook:
+    def __init__(self, path: str) -> None:
+        self.__file = open(path, 'rb')
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.__board_size, self.__depth, kinds = Header.unpack_from(self.__data)
+        if magic != File_Magic:
+            self.__data.close()
+            self.__file.close()
+            raise ValueError(f"'{path}' - не файл книги дебютов")
+        self.__ships_quantity = dict(Fleet_Item.unpack_from(self.__data, Header.size + i * Fleet_Item.size)
+                                     for i in range(kinds))
+        start = Header.size + kinds * Fleet_Item.size
+        start += -start % 8
+        self.__table = memoryview(self.__data)[start:].cast(cell_format(self.__board_size))
+        self.__no_shot = no_shot(self.__board_size)
+
+    @property
+    def board_size(self) -> int:
+        return self.__board_size
+
+    @property
+    def ships_quantity(self) -> dict:
+        return self.__ships_quantity
+
+    @property
+    def depth(self) -> int:
+        return self.__depth
+
+    def __len__(self) -> int:
+        return len(self.__table)
+
+    # Подходит ли книга для партии с этим полем и флотом
+    def matches(self, board_size: int, ships_quantity: dict) -> bool:
+        return board_size == self.__board_size and \
+            {s: n for s, n in ships_quantity.items() if n} == self.__ships_quantity
+
+    # Клетка выстрела в узле node или None, если узла в книге нет
+    def shot(self, node: int):
+        if node >= len(self.__table):
+            return None
+        cell = self.__table[node]
+        return None if cell == self.__no_shot else cell
+
+    def close(self) -> None:
+        self.__table.release()
+        self.__data.close()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+# ---------------------------------
+# Стратегия с книгой дебютов: пока партия идет по книге, ход берется из нее, а стратегии strategy
+# сообщается о нем через take() и observe(); после выхода из книги (или если книга не для этого
+# поля и флота) ходы выбирает strategy
+class BookShots(ShotStrategy):
+    def __init__(self, strategy: ShotStrategy = None, book: OpeningBook = None) -> None:
+        self.__strategy = strategy if strategy else ExactShots()
+        self.__book = book
+        self.__node = None
+        self.__from_book = False
+
+    def reset(self, board_size: int, ships_quantity: dict, observation, rng) -> None:
+        self.__strategy.reset(board_size, ships_quantity, observation, rng)
+        self.__node = 0 if self.__book is not None and self.__book.matches(board_size, ships_quantity) else None
+        self.__from_book = False
+
+    @property
+    def in_book(self) -> bool:
+        return self.__node is not None
+
+    def choose(self) -> int:
+        if self.__node is not None:
+            cell = self.__book.shot(self.__node)
+            if cell is not None:
+                self.__strategy.take(cell)
+                self.__from_book = True
+                return cell
+            self.__node = None
+        self.__from_book = False
+        return self.__strategy.choose()
+
+    def observe(self, cell: int, result: int) -> None:
+        self.__strategy.observe(cell, result)
+        if self.__from_book and result != SeaBattleGameBoard.Shot_Already:
+            self.__node = child(self.__node, result)
+        else:
+            self.__node = None
+
+    def take(self, cell: int) -> None:
+        self.__node = None
+        self.__strategy.take(cell)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Построение книги дебютов")
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--fleet', type=str, default=None, help="флот, например 4:1,3:2,2:3,1:4")
+    parser.add_argument('--depth', type=int, default=5, help="количество первых выстрелов в книге")
+    parser.add_argument('--workers', type=int, default=None, help="процессов; 0 или 1 - без пула")
+    parser.add_argument('--out', type=str, default=None, help="файл книги")
+    args = parser.parse_args()
+
+    fleet = parse_fleet(args.fleet) if args.fleet else dict(SeaBattleGameLogic.Ships_Quantity)
+    check_config(args.size, fleet)
+    path = args.out if args.out else book_name(args.size, fleet)
+    start_time = time.perf_counter()
+    book_table = build(args.size, fleet, args.depth, args.workers)
+    write_book(path, args.size, fleet, args.depth, book_table)
+    print(f"{path}: {sum(cell is not None for cell in book_table)} узлов из {len(book_table)}, "
+          f"{os.path.getsize(path)} байт, {time.perf_counter() - start_time:.1f} с")
@@ -0,0 +1,399 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from gameLogic import SeaBattleGameBoard, SeaBattleGameLogic
+
+
+# ============================================
+# Точный подсчет количества допустимых расстановок флота и вероятностей занятости клеток
+# динамическим программированием по изломанному профилю (без перебора расстановок).
+#
+# Расстановка - это множество занятых клеток, у которого каждая связная по сторонам компонента -
+# прямой отрезок (корабль), а количество отрезков каждой длины в точности совпадает с флотом.
+# Клетки обходятся в порядке cell = (x - 1) * size + (y - 1); "строка" профиля - одно значение x.
+#
+# Состояние перед обработкой клетки - пара (profile, left):
+#   profile[y] - последняя обработанная клетка столбца y: Empty, Blocked (клетка горизонтального
+#                корабля, под ней должно быть пусто) или run(k) - незаконченный отрезок длины k,
+#                который может продолжиться вниз
+#   left       - клетка слева: Empty, Blocked (слева вертикальный корабль) или run(k) горизонтального отрезка
+# Граф переходов между состояниями зависит только от размера поля и флота, поэтому строится один раз.
+# Количество уже поставленных кораблей каждой длины не входит в состояние: для каждого состояния
+# хранится массив numpy по всем комбинациям этих количеств (ось на каждую длину корабля),
+# постановка корабля - сдвиг вдоль его оси, и переходы обрабатываются сразу для всех состояний
+# столбца операциями с массивами.
+#
+# Наблюдение (как SeaBattleGameBoard.enemy_shots): Miss_Shot и Ship_Neighbor - клетка пуста,
+# Hit_Shot - клетка занята. Раненый (еще не потопленный) корабль не может целиком состоять из
+# уже подбитых клеток - иначе его бы потопили. Это условие учитывается формулой включений-исключений
+# по группам попаданий, рядом с которыми остался туман войны
+
+Empty = 0
+Blocked = 1
+
+
+def run(k: int) -> int:
+    return k + 1
+
+
+# Разбивает ребра на части, внутри каждой из которых ключи не повторяются: тогда вклады части
+# можно прибавить одной операцией new[keys] += ... без потери повторных слагаемых.
+# Возвращает список пар (ключи, значения)
+def _unique_parts(keys, values) -> list:
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    values = values[order]
+    index = np.arange(len(keys))
+    first = np.maximum.accumulate(np.where(np.r_[True, keys[1:] != keys[:-1]], index, 0))
+    rank = index - first
+    return [(keys[rank == r], values[rank == r]) for r in range(int(rank.max()) + 1)]
+
+
+# Графы переходов и типы счетчиков по (размер поля, длины кораблей, количества кораблей)
+_graph_cache = {}
+
+
+# ---------------------------------
+# класс счетчика расстановок для заданного поля и флота.
+# Результаты кэшируются по наблюдению с вытеснением давно не использованных (LRU)
+class PlacementCounter:
+    # предел значений для счетчиков int64 с запасом на сложение; если задача без ограничений
+    # его превышает, счет идет в целых числах Python (dtype=object) - медленнее, но точно
+    Int_Limit = 2 ** 62
+
+    def __init__(self, board_size: int, ships_quantity: dict = None, maxsize: int = 256) -> None:
+        quantity = ships_quantity if ships_quantity else SeaBattleGameLogic.Ships_Quantity
+        self.__board_size = board_size
+        self.__sizes = tuple(sorted(s for s, q in quantity.items() if q))
+        self.__fleet = tuple(quantity[s] for s in self.__sizes)
+        self.__max_size = self.__sizes[-1] if self.__sizes else 0
+        self.__dims = tuple(q + 1 for q in self.__fleet)
+        self.__maxsize = maxsize
+        self.__cache = OrderedDict()
+        self.__graph = None
+        self.__dtype = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def board_size(self) -> int:
+        return self.__board_size
+
+    # Наблюдение можно передать как SeaBattleGameBoard.enemy_shots (список списков) или плоско
+    def normalize(self, observation=None) -> bytes:
+        size = self.__board_size
+        if observation is None:
+            return bytes(size * size)
+        if len(observation) == size and size > 1 and not isinstance(observation, (bytes, bytearray)):
+            return bytes(int(observation[x][y]) for x in range(size) for y in range(size))
+        return bytes(int(v) for v in observation)
+
+    def count(self, observation=None) -> int:
+        return self.__solve(self.normalize(observation), False)[0]
+
+    # Вероятность того, что в клетке стоит корабль, по всем расстановкам, совместимым с наблюдением.
+    # Возвращает плоский список; если совместимых расстановок нет - список нулей
+    def probabilities(self, observation=None) -> list[float]:
+        total, occupied = self.__solve(self.normalize(observation), True)
+        if not total:
+            return [0.0] * len(occupied)
+        return [n / total for n in occupied]
+
+    # Для count() достаточно прямого прохода; вероятностям нужен еще и обратный.
+    # В кэше хранится (total, occupied), где occupied = None, если считался только прямой проход
+    def __solve(self, observation: bytes, with_occupied: bool) -> tuple:
+        ret = self.__cache.get(observation)
+        if ret is not None and (ret[1] is not None or not with_occupied):
+            self.hits += 1
+            self.__cache.move_to_end(observation)
+            return ret
+        self.misses += 1
+        ret = self.__count(observation, with_occupied)
+        self.__cache[observation] = ret
+        self.__cache.move_to_end(observation)
+        if len(self.__cache) > self.__maxsize:
+            self.__cache.popitem(last=False)
+        return ret
+
+    # ---------------------------------
+    # Построение графа переходов
+
+    # Локальные переходы клетки по значениям сверху (up) и слева (left): список (занята ли клетка,
+    # законченные корабли, новое значение столбца, новое left, становится ли клетка слева Blocked).
+    # last - клетка в последнем столбце, где горизонтальный отрезок длиннее 1 заканчивается
+    def __moves(self, up: int, left: int, last: bool) -> list:
+        ret = []
+
+        # клетка пуста: заканчиваются отрезок сверху и горизонтальный отрезок слева длиннее 1
+        finished = []
+        if up >= run(1):
+            finished.append(up - 1)
+        if left >= run(2):
+            finished.append(left - 1)
+        ret.append((False, finished, Empty, Empty, False))
+
+        # клетка занята
+        if up >= run(1):
+            # продолжение вертикального отрезка сверху; слева должно быть пусто
+            if left == Empty and up - 1 < self.__max_size:
+                ret.append((True, [], up + 1, Blocked, False))
+        elif up == Empty:
+            if left == Empty:
+                ret.append((True, [], run(1), run(1), False))
+            elif left >= run(1) and left - 1 < self.__max_size:
+                # продолжение горизонтального отрезка слева
+                ret.append((True, [], Blocked, left + 1, left == run(1)))
+
+        if last:
+            for i, (occupied, finished, new_up, new_left, block_left) in enumerate(ret):
+                if new_left >= run(2):
+                    finished = finished + [new_left - 1]
+                ret[i] = (occupied, finished, new_up, Empty, block_left)
+
+        return [(occupied, tuple(sorted(finished)), new_up, new_left, block_left)
+                for occupied, finished, new_up, new_left, block_left in ret
+                if all(k in self.__sizes for k in finished)]
+
+    # Сдвиг по осям количеств при постановке законченных кораблей: срезы "откуда" и "куда".
+    # None, если кораблей какой-то длины закончено больше, чем есть во флоте
+    def __shift_slices(self, finished: tuple):
+        lo = []
+        hi = []
+        for k, dim in zip(self.__sizes, self.__dims):
+            n = finished.count(k)
+            if n >= dim:
+                return None
+            lo.append(slice(0, dim - n))
+            hi.append(slice(n, dim))
+        return tuple(lo), tuple(hi)
+
+    # Граф: для каждого столбца y - количество состояний и группы переходов с одинаковыми
+    # (занята ли клетка, законченные корабли). Группа - (occupied, lo, hi, части для прямого прохода,
+    # части для обратного прохода, все ребра)
+    def __build_graph(self) -> tuple:
+        size = self.__board_size
+        states = [{} for _ in range(size)]
+        edges = [{} for _ in range(size)]
+        initial = ((Empty,) * size, Empty)
+        states[0][initial] = 0
+        queue = [(0, initial)]
+        moves = {}
+        while queue:
+            y, state = queue.pop()
+            profile, left = state
+            src = states[y][state]
+            next_y = (y + 1) % size
+            next_states = states[next_y]
+            key = (profile[y], left, next_y == 0)
+            if key not in moves:
+                moves[key] = self.__moves(*key)
+            for occupied, finished, new_up, new_left, block_left in moves[key]:
+                if block_left:
+                    new_state = (profile[:y - 1] + (Blocked, new_up) + profile[y + 1:], new_left)
+                else:
+                    new_state = (profile[:y] + (new_up,) + profile[y + 1:], new_left)
+                dst = next_states.get(new_state)
+                if dst is None:
+                    dst = next_states[new_state] = len(next_states)
+                    queue.append((next_y, new_state))
+                edges[y].setdefault((occupied, finished), []).append((src, dst))
+
+        groups = []
+        for y in range(size):
+            column = []
+            for (occupied, finished), pairs in edges[y].items():
+                slices = self.__shift_slices(finished)
+                if slices is None:
+                    continue
+                src, dst = np.array(pairs, dtype=np.intp).T
+                column.append((occupied, slices[0], slices[1],
+                               _unique_parts(dst, src), _unique_parts(src, dst), (src, dst)))
+            groups.append(column)
+
+        # в конце поля заканчиваются все отрезки профиля
+        final = []
+        for profile, _ in states[0]:
+            finished = tuple(code - 1 for code in profile if code >= run(1))
+            placed = tuple(q - finished.count(k) for k, q in zip(self.__sizes, self.__fleet))
+            final.append(placed if all(k in self.__sizes for k in finished) and min(placed, default=0) >= 0
+                         else None)
+        return [len(s) for s in states], groups, final
+
+    # Граф и тип счетчиков общие для всех счетчиков с тем же полем и флотом
+    def __prepare(self) -> None:
+        key = (self.__board_size, self.__sizes, self.__fleet)
+        if key not in _graph_cache:
+            self.__graph = self.__build_graph()
+            # int64 достаточен, если в задаче без ограничений ни одно промежуточное значение не
+            # превышает Int_Limit: ограничения наблюдения только убирают переходы и уменьшают значения.
+            # Для оценки хватает точности float32, а памяти и времени он требует вдвое меньше
+            self.__dtype = np.float32
+            largest = self.__count_forced(bytes(self.__board_size ** 2), set(), True, True)
+            _graph_cache[key] = (self.__graph, np.int64 if largest < self.Int_Limit else object)
+        self.__graph, self.__dtype = _graph_cache[key]
+
+    # ---------------------------------
+    # Подсчет
+
+    def __count(self, observation: bytes, with_occupied: bool) -> tuple:
+        if self.__graph is None:
+            self.__prepare()
+        cells = self.__board_size ** 2
+        injured = self.__injured_groups(observation)
+        total = 0
+        occupied = [0] * cells if with_occupied else None
+        # включения-исключения: из расстановок вычитаются те, где раненый корабль уже целый
+        for subset in range(1 << len(injured)):
+            forced_empty = set()
+            for i, (_, nearby) in enumerate(injured):
+                if subset >> i & 1:
+                    forced_empty.update(nearby)
+            sign = -1 if bin(subset).count('1') % 2 else 1
+            part_total, part_occupied = self.__count_forced(observation, forced_empty, with_occupied)
+            total += sign * part_total
+            if with_occupied:
+                for cell in range(cells):
+                    occupied[cell] += sign * part_occupied[cell]
+        return total, occupied
+
+    # Группы попаданий (связные по сторонам), рядом с которыми остался туман войны, и их соседи
+    def __injured_groups(self, observation: bytes) -> list:
+        size = self.__board_size
+        seen = set()
+        ret = []
+        for cell in range(size * size):
+            if observation[cell] != SeaBattleGameBoard.Hit_Shot or cell in seen:
+                continue
+            group = {cell}
+            stack = [cell]
+            while stack:
+                for n in self.__neighbors(stack.pop()):
+                    if n not in group and observation[n] == SeaBattleGameBoard.Hit_Shot:
+                        group.add(n)
+                        stack.append(n)
+            seen.update(group)
+            nearby = {n for c in group for n in self.__neighbors(c)} - group
+            if any(observation[n] == SeaBattleGameBoard.Fog_Of_War for n in nearby):
+                ret.append((group, nearby))
+        return ret
+
+    def __neighbors(self, cell: int) -> list[int]:
+        x, y = divmod(cell, self.__board_size)
+        return [nx * self.__board_size + ny for nx, ny in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
+                if 0 <= nx < self.__board_size and 0 <= ny < self.__board_size]
+
+    # Оставляет только переходы между состояниями, которые достижимы от начала поля и из которых
+    # можно достроить расстановку при заданных ограничениях; такие состояния нумеруются подряд.
+    # Возвращает количества состояний перед каждой клеткой, шаги по клеткам
+    # [(occupied, lo, hi, части для прямого прохода, части для обратного прохода, все ребра)]
+    # и количества кораблей для состояний в конце поля
+    def __plan(self, allowed: list) -> tuple:
+        counts, groups, final = self.__graph
+        size = self.__board_size
+        cells = size * size
+        columns = [[g for g in groups[cell % size] if allowed[cell][g[0]]] for cell in range(cells)]
+
+        reached = [np.zeros(counts[cell % size], dtype=bool) for cell in range(cells + 1)]
+        reached[0][0] = True
+        for cell in range(cells):
+            for _, _, _, _, _, (src, dst) in columns[cell]:
+                reached[cell + 1][dst[reached[cell][src]]] = True
+        live = [None] * (cells + 1)
+        live[cells] = reached[cells] & np.array([placed is not None for placed in final], dtype=bool)
+        for cell in range(cells - 1, -1, -1):
+            useful = np.zeros(counts[cell % size], dtype=bool)
+            for _, _, _, _, _, (src, dst) in columns[cell]:
+                useful[src[live[cell + 1][dst]]] = True
+            live[cell] = useful & reached[cell]
+
+        index = [np.cumsum(alive) - 1 for alive in live]
+        steps = []
+        for cell in range(cells):
+            before, after = live[cell], live[cell + 1]
+            column = []
+            for occupied, lo, hi, forward, backward, (src, dst) in columns[cell]:
+                keep = before[src] & after[dst]
+                if not keep.any():
+                    continue
+                forward = [(index[cell + 1][d[k]], index[cell][s[k]])
+                           for d, s in forward for k in [before[s] & after[d]] if k.any()]
+                backward = [(index[cell][s[k]], index[cell + 1][d[k]])
+                            for s, d in backward for k in [before[s] & after[d]] if k.any()]
+                column.append((occupied, lo, hi, forward, backward,
+                               (index[cell][src[keep]], index[cell + 1][dst[keep]])))
+            steps.append(column)
+        final = [placed for placed, alive in zip(final, live[cells]) if alive]
+        return [int(alive.sum()) for alive in live], steps, final
+
+    # Прямой шаг: сколькими способами достигается каждое состояние после клетки
+    def __forward(self, layer, column: list, states: int):
+        new_layer = np.zeros((states,) + self.__dims, dtype=self.__dtype)
+        for _, lo, hi, parts, _, _ in column:
+            for dst, src in parts:
+                new_layer[(dst,) + hi] += layer[(src,) + lo]
+        return new_layer
+
+    # Обратный шаг: сколько расстановок можно достроить из каждого состояния перед клеткой,
+    # и в скольких расстановках клетка занята (layer - результат прямого прохода перед клеткой)
+    def __backward(self, layer, completions, column: list, states: int) -> tuple:
+        new_completions = np.zeros((states,) + self.__dims, dtype=self.__dtype)
+        occupied_count = 0
+        for occupied, lo, hi, _, parts, (src, dst) in column:
+            for part_src, part_dst in parts:
+                new_completions[(part_src,) + lo] += completions[(part_dst,) + hi]
+            if occupied:
+                occupied_count += int((layer[(src,) + lo] * completions[(dst,) + hi]).sum())
+        return new_completions, occupied_count
+
+    # Подсчет при заданных ограничениях на клетки. Прямой проход запоминает состояния только в начале
+    # каждой строки; обратный проход восстанавливает строку прямыми шагами от ее начала -
+    # так в памяти одновременно не больше 2 * size слоев вместо size * size.
+    # С largest=True возвращает наибольшее промежуточное значение (для выбора типа счетчиков)
+    def __count_forced(self, observation: bytes, forced_empty: set, with_occupied: bool,
+                       largest: bool = False) -> tuple:
+        size = self.__board_size
+        cells = size * size
+
+        allowed = []
+        for cell in range(cells):
+            mark = observation[cell]
+            can_occupy = mark in (SeaBattleGameBoard.Fog_Of_War, SeaBattleGameBoard.Hit_Shot) \
+                and cell not in forced_empty
+            can_be_empty = mark != SeaBattleGameBoard.Hit_Shot
+            allowed.append((can_be_empty, can_occupy))
+        states, steps, final = self.__plan(allowed)
+        if not states[0]:
+            return (0, [0] * cells) if with_occupied else (0, None)
+
+        highest = 0
+        rows = []
+        layer = np.zeros((states[0],) + self.__dims, dtype=self.__dtype)
+        layer[(0,) + (0,) * len(self.__dims)] = 1
+        for cell in range(cells):
+            if cell % size == 0:
+                rows.append(layer)
+            layer = self.__forward(layer, steps[cell], states[cell + 1])
+            if largest:
+                highest = max(highest, layer.max(initial=0))
+
+        completions = np.zeros((states[cells],) + self.__dims, dtype=self.__dtype)
+        for i, placed in enumerate(final):
+            completions[(i,) + placed] = 1
+        total = int((layer * completions).sum())
+        if not with_occupied:
+            return total, None
+
+        occupied = [0] * cells
+        for x in range(size - 1, -1, -1):
+            layers = [rows[x]]
+            for cell in range(x * size, x * size + size - 1):
+                layers.append(self.__forward(layers[-1], steps[cell], states[cell + 1]))
+            for cell in range(x * size + size - 1, x * size - 1, -1):
+                completions, occupied[cell] = self.__backward(layers[cell - x * size], completions,
+                                                              steps[cell], states[cell])
+                if largest:
+                    highest = max(highest, completions.max(initial=0))
+        if largest:
+            return max(highest, total)
+        return total, occupied
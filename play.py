@@ -0,0 +1,162 @@
+import importlib
+import random as rnd
+import sys
+from types import SimpleNamespace
+
+import gameConfig
+import gameEvents
+from gameConfig import Player_Types
+from gameLogic import ComputerPlayer, HumanPlayer, SeaBattleGameLogic, print_error
+
+
+# ============================================
+# Запуск партий без вопросов - для скриптов и коротких прогонов (main.py спрашивает имена игроков).
+# Типы игроков, размер поля, флот, зерно и количество партий задаются ключами; компьютер ходит
+# без ожидания [Enter]. С --headless партии играются без вывода поля и сообщений, печатаются только итоги.
+# Файл маленький и загружает только ядро игры: консольный интерфейс (main), стратегии стрельбы
+# и numpy загружаются только при использовании. Обычные ключи разбираются без argparse
+# (см. parse_args), argparse загружается только для справки и сообщений об ошибках
+#   python play.py --headless --size 10 --seed 1
+#   python play.py --player1 density --player2 computer --games 100 --headless
+#   python play.py --player1 human --player2 density
+#   python play.py --player1 density --games 1000 --headless --results results.db
+
+def make_strategy(kind: str):
+    if Player_Types[kind] is None:
+        return None
+    module, name = Player_Types[kind]
+    return getattr(importlib.import_module(module), name)()
+
+
+def make_player(kind: str, number: int, strategy):
+    if kind == 'human':
+        return HumanPlayer(f"Игрок {number}")
+    if strategy is None:
+        return ComputerPlayer(f"Комп {number}", pause=False)
+    return ComputerPlayer(f"Комп {number} ({kind})", strategy, pause=False)
+
+
+# Партия без интерфейса: возвращает победителя
+def play_headless(logic: SeaBattleGameLogic):
+    while True:
+        for player in [logic.player1, logic.player2]:
+            while player.last_shot_success:
+                logic.process_event(player.get_move())
+                if player.is_winner:
+                    return player
+
+
+# Партия в консольном интерфейсе: возвращает победителя или None, если игрок вышел
+def play_console(logic: SeaBattleGameLogic, board_size: int):
+    from main import ConsoleGameGui
+    gui = ConsoleGameGui(board_size, logic)
+    gui.draw()
+    gui.run()
+    return next((player for player in [logic.player1, logic.player2] if player.is_winner), None)
+
+
+# Одна партия с зерном seed: генератор случайных чисел инициализируется заново перед партией,
+# поэтому партию компьютеров (кроме montecarlo с ограничением времени на ход) можно переиграть
+# по ее зерну. Возвращает (логику партии, победителя или None)
+def play_game(kinds: list[str], strategies: list, board_size: int, fleet: dict, seed: int, headless: bool):
+    rnd.seed(seed)
+    players = [make_player(kind, i + 1, strategy) for i, (kind, strategy) in enumerate(zip(kinds, strategies))]
+    logic = SeaBattleGameLogic(board_size, *players, ships_quantity=fleet)
+    return logic, play_headless(logic) if headless else play_console(logic, board_size)
+
+
+# Ключи командной строки: имя -> (тип значения, значение по умолчанию); тип None - флаг без значения
+Options = {
+    'player1': (str, 'computer'),
+    'player2': (str, 'computer'),
+    'size': (int, 6),
+    'fleet': (str, None),
+    'games': (int, 1),
+    'seed': (int, None),
+    'headless': (None, False),
+    'results': (str, None),
+}
+
+
+def make_parser():
+    import argparse
+    parser = argparse.ArgumentParser(description="Партии «Морского боя» без вопросов")
+    parser.add_argument('--player1', choices=list(Player_Types), default='computer')
+    parser.add_argument('--player2', choices=list(Player_Types), default='computer')
+    parser.add_argument('--size', type=int, default=6, help=f"размер поля, до {gameConfig.Max_Board_Size}")
+    parser.add_argument('--fleet', default=None, help="флот 'длина:количество,...', например 4:1,3:2,2:3,1:4")
+    parser.add_argument('--games', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=None,
+                        help="зерно первой партии, партия i играется с зерном seed + i (по умолчанию случайное)")
+    parser.add_argument('--headless', action='store_true', help="без вывода поля и сообщений, только итоги")
+    parser.add_argument('--results', default=None, help="файл SQLite для записи итогов партий (см. gameResults)")
+    return parser
+
+
+# Разбор ключей без argparse: только полные имена ключей из Options в виде '--ключ значение' и флаги.
+# Импорт argparse занимает около половины холодного старта, поэтому он загружается, только если
+# быстрый разбор не справился (--help, сокращенный или неизвестный ключ, '--ключ=значение',
+# неверное значение) - тогда argparse печатает справку или ошибку как обычно
+def parse_args(argv: list[str]):
+    values = {name: default for name, (_, default) in Options.items()}
+    i = 0
+    try:
+        while i < len(argv):
+            name = argv[i][2:] if argv[i].startswith('--') else ''
+            kind, _ = Options[name]
+            if kind is None:
+                values[name] = True
+                i += 1
+                continue
+            value = argv[i + 1]
+            if value.startswith('--'):
+                raise ValueError(value)
+            values[name] = kind(value)
+            i += 2
+    except (KeyError, IndexError, ValueError):
+        return make_parser().parse_args(argv)
+    if values['player1'] not in Player_Types or values['player2'] not in Player_Types:
+        return make_parser().parse_args(argv)
+    return SimpleNamespace(**values)
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+
+    kinds = [args.player1, args.player2]
+    try:
+        fleet = gameConfig.parse_fleet(args.fleet) if args.fleet else dict(SeaBattleGameLogic.Ships_Quantity)
+        gameConfig.check_config(args.size, fleet)
+        if args.headless and 'human' in kinds:
+            error = "Без вывода поля (--headless) играть может только компьютер"
+            print_error(error)
+            raise ValueError(error)
+    except ValueError:
+        sys.exit(1)
+
+    seed = args.seed if args.seed is not None else rnd.randrange(2 ** 31)
+    if args.headless:
+        gameEvents.use(gameEvents.NullSink())
+    strategies = [make_strategy(kind) for kind in kinds]
+    writer = None
+    if args.results:
+        import gameResults
+        writer = gameResults.ResultWriter(args.results)
+    wins = [0, 0]
+    for game in range(args.games):
+        logic, winner = play_game(kinds, strategies, args.size, fleet, seed + game, args.headless)
+        players = [logic.player1, logic.player2]
+        if winner is None:
+            break
+        wins[players.index(winner)] += 1
+        if writer is not None:
+            writer.add(gameResults.row_from_logic(logic, seed + game, *kinds))
+        if args.headless:
+            print(f"Партия {game + 1}: победил {winner.name}")
+    for strategy in strategies:
+        if strategy is not None:
+            strategy.close()
+    if writer is not None:
+        writer.close()
+    if args.games > 1:
+        print(f"Побед: {players[0].name} - {wins[0]}, {players[1].name} - {wins[1]}")
@@ -0,0 +1,21 @@
+import pytest
+
+import gameEvents
+
+
+# Приемник, который запоминает типы событий - чтобы сравнивать поведение разных реализаций
+class RecordingSink(gameEvents.EventSink):
+    def __init__(self) -> None:
+        self.kinds = []
+
+    def handle(self, kind: int, text: str, data) -> None:
+        self.kinds.append(kind)
+
+
+# Тесты не пишут на консоль: на время теста все события идут в RecordingSink
+@pytest.fixture(autouse=True)
+def events():
+    sink = RecordingSink()
+    old = gameEvents.use(sink)
+    yield sink
+    gameEvents.use(*old)
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import gameAsync
+from gameAsync import ConsoleInput
+from gameLogic import ComputerPlayer, GameEvent, HumanPlayer, Point, SeaBattleGameLogic
+
+
+@pytest.fixture
+def console(monkeypatch):
+    read_fd, write_fd = os.pipe()
+    stream = os.fdopen(read_fd, 'r', encoding='utf-8')
+    console = ConsoleInput(stream)
+    monkeypatch.setattr(gameAsync, 'console_input', console)
+
+    def type_line(line: str) -> None:
+        if line is None:
+            os.close(write_fd)
+        else:
+            os.write(write_fd, (line + '\n').encode())
+
+    yield console, type_line
+    try:
+        os.close(write_fd)
+    except OSError:
+        pass
+
+
+# Строка, набранная после тайм-аута хода, не становится следующим ходом
+def test_line_typed_after_timeout_is_not_the_next_move(console):
+    _, type_line = console
+    human = HumanPlayer("Игрок")
+    SeaBattleGameLogic(6, human, ComputerPlayer("Комп", pause=False))
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(human.move(), 0.05)
+        type_line("1 1")
+        await asyncio.sleep(0.05)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, type_line, "2 3")
+        return await asyncio.wait_for(human.move(), 5)
+
+    event = asyncio.run(scenario())
+    assert event.type == GameEvent.Event_Shot
+    assert event.data == Point(2, 3)
+
+
+# Конец ввода - выход из игры
+def test_end_of_input_quits(console):
+    _, type_line = console
+    human = HumanPlayer("Игрок")
+    SeaBattleGameLogic(6, human, ComputerPlayer("Комп", pause=False))
+
+    async def scenario():
+        asyncio.get_running_loop().call_later(0.05, type_line, None)
+        return await asyncio.wait_for(human.move(), 5)
+
+    assert asyncio.run(scenario()).type == GameEvent.Event_Quit
+
+
+# Компьютер, который первые stalls ходов думает по delay секунд
+class StallingPlayer(ComputerPlayer):
+    def __init__(self, name: str, stalls: int, delay: float) -> None:
+        super().__init__(name, pause=False)
+        self.stalls = stalls
+        self.delay = delay
+
+    async def move(self) -> GameEvent:
+        if self.stalls:
+            self.stalls -= 1
+            await asyncio.sleep(self.delay)
+        return await super().move()
+
+
+# Ход, не сделанный за move_timeout, пропускается: выстрела нет, ход переходит к противнику
+def test_stalled_move_is_skipped_after_timeout():
+    slow = StallingPlayer("Медленный", 1, 10)
+    fast = ComputerPlayer("Быстрый", pause=False)
+    logic = SeaBattleGameLogic(6, slow, fast)
+    events = []
+
+    def on_event(event: GameEvent) -> None:
+        shots = sum(mark != 0 for row in fast.board.enemy_shots for mark in row)
+        events.append((event.type, event.player, shots))
+
+    game = gameAsync.AsyncGame(logic, 0.05, on_event)
+    result = asyncio.run(asyncio.wait_for(game.run(), 30))
+
+    assert game.timeouts == 1
+    assert events[0] == (GameEvent.Event_Timeout, slow, 0)
+    assert events[1][:2] == (GameEvent.Event_Shot, fast)
+    assert result.type == GameEvent.Event_Win
+    assert game.result is result
+    assert game.moves == len(events) - 1
+
+
+# Без тайм-аута партия ждет хода сколько угодно
+def test_without_timeout_slow_move_is_played():
+    slow = StallingPlayer("Медленный", 1, 0.2)
+    logic = SeaBattleGameLogic(6, slow, ComputerPlayer("Быстрый", pause=False))
+    events = []
+    game = gameAsync.AsyncGame(logic, on_event=events.append)
+    assert asyncio.run(game.run()).type == GameEvent.Event_Win
+    assert game.timeouts == 0
+    assert (events[0].type, events[0].player) == (GameEvent.Event_Shot, slow)
+
+
+# main.py --move-timeout играет консольную партию в асинхронном цикле
+def test_main_runs_async_game():
+    main = Path(gameAsync.__file__).with_name('main.py')
+    result = subprocess.run([sys.executable, str(main), '--move-timeout', '5'], input='\n\n',
+                            capture_output=True, text=True, encoding='utf-8', timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert 'Победил' in result.stdout
@@ -0,0 +1,93 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from gameBatch import BatchHuntShots, BatchRandomShots, BatchShotStrategy, BatchSimulation
+from gameLogic import GameEvent, Point, SeaBattleGameLogic
+from gameRecord import ReplayPlayer
+from gameSimulation import HeadlessSimulation, ShotStrategy
+from fleetPlacement import cell_to_xy
+
+
+# Пакетная стратегия, которая запоминает выстрелы: партия -> клетки по порядку
+class LoggedBatchShots(BatchShotStrategy):
+    def __init__(self, strategy: BatchShotStrategy) -> None:
+        self.__strategy = strategy
+        self.shots = {}
+
+    def reset(self, board_size: int, ships_quantity: dict, observation: np.ndarray, rng) -> None:
+        self.shots = {}
+        self.__strategy.reset(board_size, ships_quantity, observation, rng)
+
+    def choose(self, games: np.ndarray) -> np.ndarray:
+        cells = self.__strategy.choose(games)
+        for g, c in zip(games.tolist(), cells.tolist()):
+            self.shots.setdefault(g, []).append(c)
+        return cells
+
+    def observe(self, games: np.ndarray, cells: np.ndarray, results: np.ndarray) -> None:
+        self.__strategy.observe(games, cells, results)
+
+
+# Стратегия HeadlessSimulation, которая повторяет заданные выстрелы
+class ScriptedShots(ShotStrategy):
+    def __init__(self, cells: list[int]) -> None:
+        self.__cells = cells
+        self.__next = iter(())
+
+    def reset(self, board_size: int, ships_quantity: dict, observation: bytearray, rng) -> None:
+        self.__next = iter(self.__cells)
+
+    def choose(self) -> int:
+        return next(self.__next)
+
+
+def play_batch(size: int, batch: int, seed: int, make_strategy):
+    strategies = [LoggedBatchShots(make_strategy()), LoggedBatchShots(make_strategy())]
+    sim = BatchSimulation(size, batch, *strategies)
+    return sim, sim.play(seed), strategies
+
+
+# Пакет из одной партии расставляет флоты тем же генератором и с тем же зерном, что HeadlessSimulation,
+# поэтому с теми же выстрелами партии должны совпасть полностью
+@pytest.mark.parametrize('make_strategy', [BatchRandomShots, BatchHuntShots])
+def test_batch_matches_headless_simulation(make_strategy):
+    size = 10
+    for seed in range(40):
+        sim, result, strategies = play_batch(size, 1, seed, make_strategy)
+        headless = HeadlessSimulation(size, ScriptedShots(strategies[0].shots.get(0, [])),
+                                      ScriptedShots(strategies[1].shots.get(0, [])))
+        expected = headless.play(seed)
+        assert [[ship.body for ship in fleet] for fleet in headless.fleets] == \
+               [[ship.body for ship in fleet] for fleet in sim.fleets]
+        assert expected.winner == result.winner[0]
+        assert [expected.shots1, expected.shots2] == result.shots[0].tolist()
+        assert expected.turns == result.turns[0]
+
+
+# Партии большого пакета, переигранные через SeaBattleGameLogic теми же флотами и выстрелами:
+# должны совпасть победитель, количество выстрелов каждого игрока и отметки на обоих полях
+@pytest.mark.parametrize('make_strategy', [BatchRandomShots, BatchHuntShots])
+def test_batch_matches_game_logic(make_strategy):
+    size = 8
+    batch = 60
+    sim, result, strategies = play_batch(size, batch, 3, make_strategy)
+    for g in range(batch):
+        players = [ReplayPlayer(f"Игрок {side + 1}", [ship.body for ship in sim.fleets[2 * g + side]], size)
+                   for side in range(2)]
+        logic = SeaBattleGameLogic(size, *players)
+        moves = [iter(strategies[side].shots.get(g, [])) for side in range(2)]
+        shots = [0, 0]
+        winner = 0
+        while not winner:
+            side = 0 if logic.player1.last_shot_success else 1
+            player = logic.player1 if side == 0 else logic.player2
+            logic.process_event(GameEvent(GameEvent.Event_Shot, player,
+                                          Point(*cell_to_xy(next(moves[side]), size))))
+            shots[side] += 1
+            if player.is_winner:
+                winner = side + 1
+        assert winner == result.winner[g]
+        assert shots == result.shots[g].tolist()
+        for side, p in enumerate([logic.player1, logic.player2]):
+            assert (np.array(p.board.enemy_shots, dtype=np.uint8).ravel() == sim.marks[2 * g + side]).all()
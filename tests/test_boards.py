@@ -0,0 +1,104 @@
+import random as rnd
+
+import pytest
+
+import bitBoard
+from gameLogic import Point, Ship, SeaBattleGameBoard
+
+# Все реализации поля должны вести себя одинаково на одних и тех же выстрелах
+Backends = [SeaBattleGameBoard, bitBoard.BitGameBoard]
+if bitBoard.np is not None:
+    Backends.append(bitBoard.NumpyGameBoard)
+
+
+def make_fleet() -> list[Ship]:
+    return [
+        Ship([Point(5, 2), Point(5, 3), Point(5, 4)]),
+        Ship([Point(1, 1), Point(1, 2)]),
+        Ship([Point(2, 4), Point(3, 4)]),
+        Ship([Point(1, 6)]),
+        Ship([Point(5, 6)]),
+        Ship([Point(3, 6)]),
+        Ship([Point(3, 2)])
+    ]
+
+
+# Результат каждого выстрела (True/False или ValueError), число живых кораблей и отметки после него
+def play(board_class, shots: list[Point]) -> list:
+    board = board_class(6, make_fleet())
+    trace = []
+    for shot in shots:
+        try:
+            result = board.incoming_shot(shot)
+        except ValueError:
+            result = ValueError
+        marks = tuple(tuple(int(mark) for mark in row) for row in board.enemy_shots)
+        trace.append((result, board.alive_ships_count, marks))
+    return trace
+
+
+def test_hit_miss_kill_and_neighbors():
+    for board_class in Backends:
+        board = board_class(6, make_fleet())
+        assert board.alive_ships_count == 7
+
+        assert board.incoming_shot(Point(6, 6)) is False
+        assert board.enemy_shots[5][5] == SeaBattleGameBoard.Miss_Shot
+
+        assert board.incoming_shot(Point(1, 1)) is True
+        assert board.enemy_shots[0][0] == SeaBattleGameBoard.Hit_Shot
+        assert board.alive_ships_count == 7
+        assert board.enemy_shots[1][0] == SeaBattleGameBoard.Fog_Of_War
+
+        assert board.incoming_shot(Point(1, 2)) is True
+        assert board.alive_ships_count == 6
+        # соседи убитого корабля по сторонам помечены, остальное поле - нет
+        assert board.enemy_shots[1][0] == SeaBattleGameBoard.Ship_Neighbor
+        assert board.enemy_shots[1][1] == SeaBattleGameBoard.Ship_Neighbor
+        assert board.enemy_shots[0][2] == SeaBattleGameBoard.Ship_Neighbor
+        assert board.enemy_shots[1][2] == SeaBattleGameBoard.Fog_Of_War
+
+
+def test_repeated_shot_raises():
+    for board_class in Backends:
+        board = board_class(6, make_fleet())
+        board.incoming_shot(Point(6, 6))
+        board.incoming_shot(Point(5, 2))
+        with pytest.raises(ValueError):
+            board.incoming_shot(Point(6, 6))
+        with pytest.raises(ValueError):
+            board.incoming_shot(Point(5, 2))
+
+
+def test_shot_into_neighbor_mark_is_allowed():
+    for board_class in Backends:
+        board = board_class(6, make_fleet())
+        board.incoming_shot(Point(1, 6))
+        assert board.enemy_shots[1][5] == SeaBattleGameBoard.Ship_Neighbor
+        assert board.incoming_shot(Point(2, 6)) is False
+        assert board.enemy_shots[1][5] == SeaBattleGameBoard.Miss_Shot
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_backends_agree_on_random_sequences(seed, events):
+    rng = rnd.Random(seed)
+    cells = [Point(x, y) for x in range(1, 7) for y in range(1, 7)]
+    # с повторами, чтобы проверить и ValueError
+    shots = rng.sample(cells, len(cells)) + rng.sample(cells, 8)
+
+    expected = play(SeaBattleGameBoard, shots)
+    expected_events = list(events.kinds)
+    assert expected[len(cells) - 1][1] == 0
+    for board_class in Backends[1:]:
+        events.kinds.clear()
+        assert play(board_class, shots) == expected, board_class.__name__
+        assert events.kinds == expected_events, board_class.__name__
+
+
+def test_bit_board_views_are_read_only():
+    board = bitBoard.BitGameBoard(6, make_fleet())
+    board.incoming_shot(Point(1, 1))
+    with pytest.raises(TypeError):
+        board.enemy_shots[0][1] = SeaBattleGameBoard.Hit_Shot
+    with pytest.raises(TypeError):
+        board.board[0][0] = SeaBattleGameBoard.Sea_Spot
@@ -0,0 +1,115 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import gameConfig
+import gameEvents
+from gameLogic import SeaBattleGameLogic
+
+
+@pytest.mark.parametrize('spec, fleet', [
+    ('1:1', {1: 1}),
+    ('4:1,3:2,2:3,1:4', {4: 1, 3: 2, 2: 3, 1: 4}),
+    ('2:1,2:2', {2: 3}),
+    (' 3 : 1 ', {3: 1}),
+])
+def test_parse_fleet_accepts(spec, fleet):
+    assert gameConfig.parse_fleet(spec) == fleet
+    assert gameConfig.parse_fleet(gameConfig.fleet_spec(fleet)) == fleet
+
+
+@pytest.mark.parametrize('spec', ['', '3', '3:', ':1', '3:1,', 'a:1', '3:b', '1:2:3', '3;1'])
+def test_parse_fleet_rejects(spec, events):
+    with pytest.raises(ValueError):
+        gameConfig.parse_fleet(spec)
+    assert events.kinds == [gameEvents.Msg_Error]
+
+
+@pytest.mark.parametrize('board_size, fleet', [
+    (6, SeaBattleGameLogic.Ships_Quantity),
+    (2, {1: 1}),
+    (3, {3: 1, 1: 1}),
+    (10, {4: 1, 3: 2, 2: 3, 1: 4}),
+    (6, {3: 1, 2: 0}),
+])
+def test_check_config_accepts(board_size, fleet, events):
+    gameConfig.check_config(board_size, fleet)
+    assert events.kinds == []
+
+
+@pytest.mark.parametrize('board_size, fleet', [
+    (1, {1: 1}),                                    # поле меньше Min_Board_Size
+    (gameConfig.Max_Board_Size + 1, {1: 1}),
+    (6, {}),                                        # нет кораблей
+    (6, {3: 0}),
+    (6, {3: -1, 1: 2}),
+    (6, {7: 1}),                                    # корабль длиннее поля
+    (6, {0: 1}),
+    (4, {4: 4, 1: 1}),                              # клеток флота больше, чем клеток поля
+    (3, {3: 2, 1: 1}),                              # клеток хватает, но корабли не расставить
+    (4, {1: 9}),
+])
+def test_check_config_rejects(board_size, fleet, events):
+    with pytest.raises(ValueError):
+        gameConfig.check_config(board_size, fleet)
+    assert events.kinds == [gameEvents.Msg_Error]
+
+
+def write(tmp_path, text: str) -> str:
+    path = tmp_path / 'config.json'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_load_config_accepts(tmp_path):
+    path = write(tmp_path, json.dumps({'board_size': 10, 'fleet': {'4': 1, '3': 2, '2': 3, '1': 4}}))
+    assert gameConfig.load_config(path) == (10, {4: 1, 3: 2, 2: 3, 1: 4})
+    # недостающие значения - по умолчанию
+    assert gameConfig.load_config(write(tmp_path, '{"board_size": 8}')) == (8, SeaBattleGameLogic.Ships_Quantity)
+    assert gameConfig.load_config(write(tmp_path, '{"fleet": {"2": 1}}'), 5) == (5, {2: 1})
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    '{"board_size": 10,',
+    '[10]',
+    '{"board_size": "десять"}',
+    '{"board_size": null}',
+    '{"fleet": [1, 2]}',
+    '{"fleet": {"a": 1}}',
+    '{"fleet": {"2": null}}',
+    '{"board_size": 3, "fleet": {"4": 1}}',         # корабль длиннее поля
+    '{"board_size": 4, "fleet": {"1": 17}}',        # флот больше поля
+])
+def test_load_config_rejects(tmp_path, text, events):
+    with pytest.raises(ValueError):
+        gameConfig.load_config(write(tmp_path, text))
+    assert events.kinds == [gameEvents.Msg_Error]
+
+
+def test_load_config_reports_unreadable_file(tmp_path, events):
+    with pytest.raises(ValueError):
+        gameConfig.load_config(str(tmp_path / 'missing.json'))
+    with pytest.raises(ValueError):
+        gameConfig.load_config(str(tmp_path))
+    assert events.kinds == [gameEvents.Msg_Error] * 2
+
+
+# Из командной строки неверная конфигурация - сообщение об ошибке и код 1, без трассировки
+@pytest.mark.parametrize('args', [
+    ['--config', 'missing.json'],
+    ['--config', 'bad.json'],
+    ['--fleet', '3:x'],
+    ['--size', '4', '--fleet', '5:1'],
+])
+def test_main_reports_bad_config_without_traceback(tmp_path, args):
+    (tmp_path / 'bad.json').write_text('{"fleet": ', encoding='utf-8')
+    main = Path(gameConfig.__file__).with_name('main.py')
+    result = subprocess.run([sys.executable, str(main)] + args, cwd=tmp_path, capture_output=True, text=True,
+                            encoding='utf-8', stdin=subprocess.DEVNULL, timeout=60)
+    assert result.returncode == 1
+    assert 'Traceback' not in result.stdout + result.stderr
+    assert result.stdout + result.stderr
@@ -0,0 +1,82 @@
+import pytest
+
+import gameMetrics
+from gameLogic import ComputerPlayer, SeaBattleGameBoard, SeaBattleGameLogic
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    # instrument() в тестах не должен добавлять методы к замерам остальных тестов
+    monkeypatch.setattr(gameMetrics, '_targets', list(gameMetrics._targets))
+    gameMetrics.reset()
+    yield gameMetrics
+    gameMetrics.disable()
+    gameMetrics.reset()
+
+
+# Все методы, которые может подменить enable(): (класс, имя) -> метод из __dict__ класса
+def methods() -> dict:
+    return {(cls, attr): cls.__dict__[attr] for owner, attr, _ in gameMetrics._targets
+            for cls in gameMetrics._subclasses(owner) if attr in cls.__dict__}
+
+
+def test_disable_restores_original_methods(metrics):
+    before = methods()
+    assert (SeaBattleGameBoard, 'incoming_shot') in before
+    assert (ComputerPlayer, 'get_move') in before
+
+    metrics.enable()
+    metrics.enable()                # повторное включение не оборачивает обертки еще раз
+    assert metrics.enabled()
+    wrapped = methods()
+    for key, method in before.items():
+        assert wrapped[key] is not method
+        assert wrapped[key].__wrapped__ is method
+
+    metrics.disable()
+    assert not metrics.enabled()
+    after = methods()
+    assert after.keys() == before.keys()
+    assert all(after[key] is method for key, method in before.items())
+
+
+def test_instrument_while_enabled_is_restored(metrics):
+    class Worker:
+        def work(self) -> int:
+            return 1
+
+    original = Worker.__dict__['work']
+    metrics.enable()
+    metrics.instrument(Worker, 'work', 'worker')
+    assert Worker().work() == 1
+    assert metrics.snapshot()['worker']['count'] == 1
+    metrics.disable()
+    assert Worker.__dict__['work'] is original
+
+
+# Гистограммы считают каждый вызов; исключение - и вызов, и ошибка
+def test_histograms_count_calls(metrics):
+    metrics.enable()
+    players = [ComputerPlayer("Комп 1", pause=False), ComputerPlayer("Комп 2", pause=False)]
+    logic = SeaBattleGameLogic(6, *players)
+    shots = []
+    while not any(player.is_winner for player in players):
+        player = players[0] if players[0].last_shot_success else players[1]
+        shots.append(player.get_move())
+        logic.process_event(shots[-1])
+    # повторный выстрел: incoming_shot выбрасывает ValueError, process_event его обрабатывает
+    logic.process_event(shots[-1])
+    metrics.disable()
+    logic.process_event(shots[-1])      # после disable() вызовы не считаются
+
+    data = metrics.snapshot()
+    assert data['init_ships']['count'] == 2
+    assert data['get_move']['count'] == len(shots)
+    assert data['process_event']['count'] == len(shots) + 1
+    assert data['incoming_shot']['count'] == len(shots) + 1
+    assert data['incoming_shot']['errors'] == 1
+    assert data['process_event']['errors'] == 0
+    for item in data.values():
+        assert item['buckets'][-1] == (float('inf'), item['count'])
+        assert item['sum'] > 0 or not item['count']
+    assert f'seabattle_call_seconds_count{{function="get_move"}} {len(shots)}' in metrics.to_prometheus()
@@ -0,0 +1,92 @@
+import gc
+import multiprocessing
+import random as rnd
+
+from gameLogic import Point, SeaBattleGameBoard, Ship
+from gameStrategies import MonteCarloShots
+
+Fleet = {2: 1, 1: 2}
+
+
+def choose_once(strategy: MonteCarloShots) -> int:
+    strategy.reset(5, Fleet, bytearray(25), rnd.Random(0))
+    return strategy.choose()
+
+
+def test_with_closes_worker_pool():
+    with MonteCarloShots(40, None, workers=2) as strategy:
+        choose_once(strategy)
+        assert len(multiprocessing.active_children()) == 2
+    assert not multiprocessing.active_children()
+
+
+# Стратегию, которую никто не закрыл, закрывает сборщик мусора
+def test_unclosed_strategy_releases_workers():
+    strategy = MonteCarloShots(40, None, workers=2)
+    choose_once(strategy)
+    assert multiprocessing.active_children()
+    del strategy
+    gc.collect()
+    assert not multiprocessing.active_children()
+
+
+
+
+def make_fleet() -> list[Ship]:
+    return [Ship([Point(2, 2), Point(2, 3), Point(2, 4)]), Ship([Point(5, 1), Point(6, 1)]),
+            Ship([Point(5, 5)]), Ship([Point(4, 3)])]
+
+
+# Клетки, которые в согласованной расстановке пусты (промахи, соседи и клетки убитых кораблей),
+# и попадания в еще живые корабли - маски
+def known_cells(board: SeaBattleGameBoard, fleet: list[Ship]) -> tuple[int, int]:
+    size = board.size
+    shots = board.enemy_shots
+    empty = 0
+    injured = 0
+    for c in range(size * size):
+        if shots[c // size][c % size] in (SeaBattleGameBoard.Miss_Shot, SeaBattleGameBoard.Ship_Neighbor):
+            empty |= 1 << c
+    for ship in fleet:
+        cells = [(p.x - 1) * size + p.y - 1 for p in ship.body]
+        hit = [c for c in cells if shots[c // size][c % size] == SeaBattleGameBoard.Hit_Shot]
+        for c in hit:
+            if len(hit) == len(cells):
+                empty |= 1 << c
+            else:
+                injured |= 1 << c
+    return empty, injured
+
+
+# Расстановки, оставшиеся в пуле после каждого observe, согласованы со всеми промахами и попаданиями,
+# а следующий ход пул только пополняет: оставшиеся расстановки переходят в него без изменений
+def test_samples_follow_observations_and_survive_moves():
+    size = 6
+    board = SeaBattleGameBoard(size, make_fleet())
+    strategy = MonteCarloShots(60, None)
+    strategy.reset(size, {3: 1, 2: 1, 1: 2}, bytearray(size * size), rnd.Random(0))
+    kept = []
+    reused = 0
+    while board.alive_ships_count:
+        cell = strategy.choose()
+        samples = strategy._MonteCarloShots__samples
+        assert len(samples) == 60
+        assert all(a is b for a, b in zip(samples, kept))
+        reused += len(kept)
+
+        alive = board.alive_ships_count
+        board.incoming_shot(Point(cell // size + 1, cell % size + 1))
+        if board.enemy_shots[cell // size][cell % size] == SeaBattleGameBoard.Miss_Shot:
+            strategy.observe(cell, SeaBattleGameBoard.Shot_Miss)
+        elif board.alive_ships_count < alive:
+            strategy.observe(cell, SeaBattleGameBoard.Shot_Killed)
+        else:
+            strategy.observe(cell, SeaBattleGameBoard.Shot_Injured)
+
+        empty, injured = known_cells(board, make_fleet())
+        kept = list(strategy._MonteCarloShots__samples)
+        for mask, ships, _ in kept:
+            assert not mask & empty
+            assert mask & injured == injured
+            assert len(ships) == board.alive_ships_count
+    assert reused
@@ -0,0 +1,105 @@
+import random as rnd
+
+from fleetPlacement import cell_neighbors
+from gameLogic import ComputerPlayer, MovePool, Point, SeaBattleGameBoard, Ship
+
+
+def test_pop_returns_every_cell_once():
+    rnd.seed(0)
+    pool = MovePool(50)
+    cells = [pool.pop() for _ in range(50)]
+    assert sorted(cells) == list(range(50))
+    assert len(pool) == 0
+
+
+def test_discard_and_contains_after_swaps():
+    rnd.seed(1)
+    pool = MovePool(10)
+    left = set(range(10))
+    # последний слот: на его место ничего не переставляется
+    pool.discard(9)
+    left.discard(9)
+    # клетка 2 уходит, на ее место встает последняя (8)
+    pool.discard(2)
+    left.discard(2)
+    assert 8 in pool and 2 not in pool
+    # переставленную клетку можно удалить, и повторное удаление ничего не меняет
+    pool.discard(8)
+    pool.discard(8)
+    pool.discard(9)
+    left.discard(8)
+    assert len(pool) == len(left)
+    assert {c for c in range(12) if c in pool} == left
+
+    while len(pool):
+        cell = pool.pop()
+        assert cell in left
+        left.remove(cell)
+        assert cell not in pool
+        assert {c for c in range(10) if c in pool} == left
+
+
+def test_random_discards_keep_pool_consistent():
+    rng = rnd.Random(2)
+    rnd.seed(2)
+    pool = MovePool(64)
+    left = set(range(64))
+    while left:
+        if rng.random() < 0.5:
+            cell = rng.randrange(64)
+            pool.discard(cell)
+            left.discard(cell)
+        else:
+            cell = pool.pop()
+            assert cell in left
+            left.remove(cell)
+        assert len(pool) == len(left)
+        assert {c for c in range(64) if c in pool} == left
+
+
+def make_fleet() -> list[Ship]:
+    return [Ship([Point(2, 2), Point(2, 3), Point(2, 4)]), Ship([Point(5, 5)]), Ship([Point(5, 1), Point(6, 1)])]
+
+
+def neighbor_cells(board) -> set[int]:
+    size = board.size
+    return {c for c in range(size * size)
+            if board.enemy_shots[c // size][c % size] == SeaBattleGameBoard.Ship_Neighbor}
+
+
+# Перед каждым ходом после убийства в пуле компьютера нет клеток, помеченных Ship_Neighbor
+def test_prune_killed_removes_ship_neighbors():
+    size = 6
+    pruned = 0
+    for seed in range(10):
+        rnd.seed(seed)
+        player = ComputerPlayer('Комп', pause=False)
+        player.enemy = ComputerPlayer('Враг', pause=False)
+        player.enemy.board = board = SeaBattleGameBoard(size, make_fleet())
+        player.board = SeaBattleGameBoard(size, make_fleet())
+        pool = player._ComputerPlayer__possible_moves
+
+        while board.alive_ships_count:
+            shot = player.choose_shot()
+            neighbors = neighbor_cells(board)
+            assert not any(c in pool for c in neighbors)
+            pruned = max(pruned, len(neighbors))
+            board.incoming_shot(shot)
+    assert pruned
+
+
+def test_prune_killed_walks_the_whole_ship():
+    size = 5
+    player = ComputerPlayer('Комп', pause=False)
+    player.board = SeaBattleGameBoard(size, [Ship([Point(1, 1)])])
+    board = SeaBattleGameBoard(size, [Ship([Point(3, 2), Point(3, 3), Point(3, 4)])])
+    for y in (2, 4, 3):
+        board.incoming_shot(Point(3, y))
+    player.prune_killed(board, 2 * size + 2)
+    pool = player._ComputerPlayer__possible_moves
+    ship = {2 * size + 1, 2 * size + 2, 2 * size + 3}
+    nearby = {n for c in ship for n in cell_neighbors(c, size)} - ship
+    assert all(board.enemy_shots[c // size][c % size] == SeaBattleGameBoard.Ship_Neighbor for c in nearby)
+    assert not any(c in pool for c in nearby)
+    assert len(pool) == size * size - len(nearby)
+    assert all(c in pool for c in ship)
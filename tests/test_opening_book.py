@@ -0,0 +1,14 @@
+import pytest
+
+import openingBook
+
+pytest.importorskip('numpy')
+
+
+# workers=0 и workers=1 строят книгу в текущем процессе, без пула
+def test_build_in_process_for_zero_and_one_worker():
+    fleet = {2: 1, 1: 1}
+    table = openingBook.build(4, fleet, 2, workers=0)
+    assert table == openingBook.build(4, fleet, 2, workers=1)
+    assert len(table) == openingBook.nodes_count(2)
+    assert table[0] is not None
@@ -0,0 +1,120 @@
+import random as rnd
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from fleetPlacement import cell_neighbors, cell_to_xy
+from gameLogic import Point, SeaBattleGameBoard, random_fleet
+from placementCount import PlacementCounter
+
+Fog = SeaBattleGameBoard.Fog_Of_War
+Hit = SeaBattleGameBoard.Hit_Shot
+
+Fleets = [(4, {2: 1, 1: 2}), (5, {3: 1, 2: 1, 1: 1})]
+
+
+# Все расстановки флота перебором: корабли - отрезки, которые не пересекаются и не касаются сторонами.
+# Корабли одной длины ставятся по возрастанию первой клетки, чтобы не считать перестановки
+def all_layouts(size: int, quantity: dict) -> list[frozenset]:
+    segments = {}
+    for length in quantity:
+        segments[length] = sorted({tuple(sorted(x * size + y + (i * size if vertical else i) for i in range(length)))
+                                   for x in range(size) for y in range(size) for vertical in (False, True)
+                                   if (x if vertical else y) + length <= size})
+    ships = [length for length in sorted(quantity, reverse=True) for _ in range(quantity[length])]
+    layouts = []
+
+    def place(i: int, taken: frozenset, blocked: frozenset, start: int) -> None:
+        if i == len(ships):
+            layouts.append(taken)
+            return
+        candidates = segments[ships[i]]
+        for j in range(start if i and ships[i - 1] == ships[i] else 0, len(candidates)):
+            segment = candidates[j]
+            if blocked.isdisjoint(segment):
+                near = {n for c in segment for n in cell_neighbors(c, size)}
+                place(i + 1, taken | set(segment), blocked | set(segment) | near, j + 1)
+
+    place(0, frozenset(), frozenset(), 0)
+    return layouts
+
+
+# Совместима ли расстановка с наблюдением: клетки без тумана и попаданий пусты, попадания заняты,
+# а группа попаданий, рядом с которой остался туман, - еще не весь корабль
+def consistent(layout: frozenset, observation: bytes, size: int) -> bool:
+    for cell, mark in enumerate(observation):
+        if (mark == Hit) != (cell in layout) and mark != Fog:
+            return False
+    seen = set()
+    for cell, mark in enumerate(observation):
+        if mark != Hit or cell in seen:
+            continue
+        group = {cell}
+        stack = [cell]
+        while stack:
+            for n in cell_neighbors(stack.pop(), size):
+                if n not in group and observation[n] == Hit:
+                    group.add(n)
+                    stack.append(n)
+        seen |= group
+        nearby = {n for c in group for n in cell_neighbors(c, size)} - group
+        if any(observation[n] == Fog for n in nearby) and not any(n in layout for n in nearby):
+            return False
+    return True
+
+
+# Наблюдения настоящих партий: случайный флот и случайные выстрелы по нему
+def observations(size: int, quantity: dict, games: int) -> list[bytes]:
+    rnd.seed(size)
+    ret = [bytes(size * size)]
+    for _ in range(games):
+        board = SeaBattleGameBoard(size, random_fleet(size, quantity))
+        cells = rnd.sample(range(size * size), size * size)
+        for shots, cell in enumerate(cells):
+            board.incoming_shot(Point(*cell_to_xy(cell, size)))
+            if shots % 3 == 2:
+                ret.append(bytes(int(mark) for row in board.enemy_shots for mark in row))
+            if not board.alive_ships_count:
+                break
+    return ret
+
+
+@pytest.mark.parametrize('size, quantity', Fleets)
+def test_counts_and_probabilities_match_enumeration(size, quantity):
+    layouts = all_layouts(size, quantity)
+    counter = PlacementCounter(size, quantity, 0)
+    assert counter.count() == len(layouts)
+
+    marks = set()
+    for observation in observations(size, quantity, 6):
+        marks.update(observation)
+        matching = [layout for layout in layouts if consistent(layout, observation, size)]
+        assert counter.count(observation) == len(matching)
+        expected = [sum(cell in layout for layout in matching) / len(matching) if matching else 0.0
+                    for cell in range(size * size)]
+        assert counter.probabilities(observation) == pytest.approx(expected)
+    # среди наблюдений есть промахи, раненые и убитые корабли (попадание с соседями)
+    assert {SeaBattleGameBoard.Miss_Shot, Hit, SeaBattleGameBoard.Ship_Neighbor} <= marks
+
+
+def test_injured_ship_is_not_complete():
+    size, quantity = Fleets[0]
+    observation = bytearray(size * size)
+    observation[5] = Hit
+    layouts = [layout for layout in all_layouts(size, quantity) if consistent(layout, bytes(observation), size)]
+    counter = PlacementCounter(size, quantity, 0)
+    assert counter.count(bytes(observation)) == len(layouts)
+    # одиночный корабль в клетке 5 был бы потоплен, значит корабль продолжается к соседу
+    assert all(layout & {1, 4, 6, 9} for layout in layouts)
+    probabilities = counter.probabilities(bytes(observation))
+    assert probabilities[5] == 1.0
+    assert sum(probabilities[n] for n in (1, 4, 6, 9)) == pytest.approx(1.0)
+
+
+def test_impossible_observation_counts_zero():
+    size, quantity = Fleets[0]
+    observation = bytes([SeaBattleGameBoard.Miss_Shot]) * (size * size)
+    counter = PlacementCounter(size, quantity, 0)
+    assert counter.count(observation) == 0
+    assert counter.probabilities(observation) == [0.0] * (size * size)
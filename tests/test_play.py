@@ -0,0 +1,33 @@
+import pytest
+
+import play
+
+
+# Быстрый разбор ключей дает то же, что argparse
+@pytest.mark.parametrize('argv', [
+    [],
+    ['--headless', '--seed', '0'],
+    ['--player1', 'density', '--player2', 'random', '--games', '100', '--headless'],
+    ['--size', '10', '--fleet', '4:1,3:2,2:3,1:4', '--seed', '-5', '--results', 'results.db'],
+])
+def test_parse_args_matches_argparse(argv):
+    assert vars(play.parse_args(argv)) == vars(play.make_parser().parse_args(argv))
+
+
+# Все, с чем быстрый разбор не справился, передается argparse
+@pytest.mark.parametrize('argv', [
+    ['--player1', 'nobody'],
+    ['--size', 'x'],
+    ['--size'],
+    ['--unknown'],
+    ['--games', '--headless'],
+])
+def test_parse_args_errors_go_to_argparse(argv, capsys):
+    with pytest.raises(SystemExit):
+        play.parse_args(argv)
+    assert 'usage:' in capsys.readouterr().err
+
+
+def test_parse_args_accepts_argparse_forms():
+    args = play.parse_args(['--seed=3', '--head'])
+    assert args.seed == 3 and args.headless
@@ -0,0 +1,22 @@
+import gc
+import pickle
+
+from gameLogic import Point, Ship
+
+
+def test_point_is_interned():
+    p = Point(3, 4)
+    assert Point(3, 4) is p
+    assert pickle.loads(pickle.dumps(p)) is p
+    assert Ship([Point(1, 1), Point(1, 2)]).body == {Point(1, 2), Point(1, 1)}
+
+
+# Точки, на которые никто не ссылается, не остаются в таблице экземпляров
+def test_unused_points_are_released():
+    table = Point._Point__interned
+    keys = [(Point, x, y) for x in range(5000, 5100) for y in range(100)]
+    points = [Point(x, y) for _, x, y in keys]
+    assert all(key in table for key in keys)
+    del points
+    gc.collect()
+    assert not any(key in table for key in keys)
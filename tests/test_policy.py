@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from gameLogic import SeaBattleGameBoard, SeaBattleGameLogic
+from gamePolicy import Feature_Channels, PolicyBatcher, PolicyModel, encode, self_play
+
+Size = 6
+
+
+def test_forward_and_choose_shapes():
+    for hidden in ((), (32,), (16, 8)):
+        model = PolicyModel.create(Size, hidden)
+        assert len(model.layers) == len(hidden) + 1
+        marks = np.zeros((3, Size * Size), dtype=np.uint8)
+        marks[1, 0] = SeaBattleGameBoard.Miss_Shot
+        features = encode(marks, Size)
+        assert features.shape == (3, Feature_Channels * Size * Size)
+        assert model.forward(features).shape == (3, Size * Size)
+        cells = model.choose(marks)
+        assert cells.shape == (3,)
+        assert cells[1] != 0
+
+
+def test_fit_keeps_shapes_and_reduces_loss():
+    model = PolicyModel.create(Size, (32,))
+    shapes = [(w.shape, b.shape) for w, b in model.layers]
+    marks, ships, shots = self_play(None, Size, SeaBattleGameLogic.Ships_Quantity, 40, seed=1)
+    assert marks.shape == ships.shape and marks.shape[1] == Size * Size
+    assert len(shots) == 40 and len(marks) == shots.sum()
+    losses = model.fit(marks, ships, epochs=5, batch=64, lr=1e-2)
+    assert len(losses) == 5
+    assert losses[-1] < losses[0]
+    assert [(w.shape, b.shape) for w, b in model.layers] == shapes
+
+
+# Запросы нескольких партий за один проход цикла событий считаются одним тиком
+def test_batcher_serves_concurrent_requests_in_one_tick():
+    model = PolicyModel.create(Size, (16,))
+    observations = np.zeros((5, Size * Size), dtype=np.uint8)
+    for i in range(5):
+        observations[i, :i] = SeaBattleGameBoard.Miss_Shot
+
+    async def scenario():
+        batcher = PolicyBatcher(model)
+        cells = await asyncio.gather(*(batcher.request(observation) for observation in observations))
+        return batcher, cells
+
+    batcher, cells = asyncio.run(scenario())
+    assert batcher.ticks == 1
+    assert batcher.moves == 5
+    assert cells == model.choose(observations).tolist()
+
+
+def test_batcher_ticks_at_max_batch():
+    model = PolicyModel.create(Size, ())
+    observations = np.zeros((5, Size * Size), dtype=np.uint8)
+
+    async def scenario():
+        batcher = PolicyBatcher(model, max_batch=2)
+        await asyncio.gather(*(batcher.request(observation) for observation in observations))
+        return batcher
+
+    batcher = asyncio.run(scenario())
+    assert batcher.ticks == 3
+    assert batcher.moves == 5
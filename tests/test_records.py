@@ -0,0 +1,46 @@
+import pytest
+
+from gameRecord import GameRecord, RecordReader, RecordWriter, decode, encode, record_simulation
+
+
+def test_round_trip_large_board_and_long_ship(tmp_path):
+    size = 300
+    horizontal = tuple(range(5 * size + 10, 5 * size + 210))
+    vertical = tuple(7 + z * size for z in range(200))
+    records = [
+        GameRecord(2 ** 64 - 1, size, 1, ([horizontal, (size * size - 1,)], [vertical, (0,)]),
+                   (0, 7, size * size - 1, 12345)),
+        GameRecord(0, 1000, 0, ([tuple(range(1000))], [tuple(z * 1000 for z in range(1000))]), (999999,)),
+    ]
+    for record in records:
+        assert decode(encode(record))[0] == record
+
+    path = str(tmp_path / 'games.sbr')
+    with RecordWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    with RecordReader(path) as reader:
+        assert list(reader) == records
+        assert reader[1] == records[1]
+
+
+def test_round_trip_simulated_games(tmp_path):
+    path = str(tmp_path / 'games.sbr')
+    with RecordWriter(path) as writer:
+        record_simulation(writer, 3, 10, base_seed=5)
+    with RecordReader(path) as reader:
+        assert [record.seed for record in reader] == [5, 6, 7]
+        assert all(record.winner for record in reader)
+
+
+def test_seed_out_of_range_is_rejected(tmp_path):
+    path = str(tmp_path / 'games.sbr')
+    record = GameRecord(1, 10, 0, ([(0,)], [(99,)]), ())
+    with RecordWriter(path) as writer:
+        for seed in (-1, 2 ** 64):
+            with pytest.raises(ValueError):
+                writer.write(record._replace(seed=seed))
+        writer.write(record)
+    with RecordReader(path) as reader:
+        assert len(reader) == 1
+        assert reader[0] == record
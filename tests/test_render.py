@@ -0,0 +1,94 @@
+import io
+import re
+
+import pytest
+
+import main
+from gameLogic import ComputerPlayer, HumanPlayer, SeaBattleGameLogic
+from main import ConsoleGameGui
+
+Size = 8
+Screen_Lines = 40
+
+# ANSI-последовательности, которые выводит ConsoleGameGui в режиме in_place
+Escape = re.compile(r'\x1b(7|8|\[(\d*)(?:;(\d*))?([HJKr]))')
+
+
+# Минимальный терминал: экран - словарь строк, курсор, сохранение курсора (ESC 7 / ESC 8)
+def emulate(text: str) -> list[str]:
+    screen = {}
+    row, column = 1, 1
+    saved = (1, 1)
+    pos = 0
+    while pos < len(text):
+        match = Escape.match(text, pos)
+        if match:
+            code, first, second, command = match.groups()
+            if code == '7':
+                saved = (row, column)
+            elif code == '8':
+                row, column = saved
+            elif command == 'H':
+                row, column = int(first or 1), int(second or 1)
+            elif command == 'J':
+                screen.clear()
+            elif command == 'K':
+                screen[row] = []
+            pos = match.end()
+            continue
+        char = text[pos]
+        pos += 1
+        if char == '\n':
+            row, column = row + 1, 1
+            continue
+        line = screen.setdefault(row, [])
+        line.extend(' ' * (column - len(line)))
+        line[column - 1] = char
+        column += 1
+    return [''.join(screen.get(r, [])).rstrip() for r in range(1, max(screen, default=0) + 1)]
+
+
+# Кадр, который строится с нуля по состоянию партии
+def full_frame(logic: SeaBattleGameLogic) -> list[str]:
+    out = io.StringIO()
+    ConsoleGameGui(Size, logic, out=out).draw()
+    return [line.rstrip() for line in out.getvalue().split('\n')[:-1]]
+
+
+def play(in_place: bool, players) -> tuple[SeaBattleGameLogic, str]:
+    logic = SeaBattleGameLogic(Size, *players)
+    out = io.StringIO()
+    gui = ConsoleGameGui(Size, logic, in_place=in_place, out=out)
+    gui.draw()
+    gui.run()
+    return logic, out.getvalue()
+
+
+def computers() -> list:
+    return [ComputerPlayer("Комп 1", pause=False), ComputerPlayer("Комп 2", pause=False)]
+
+
+# Без in_place каждый кадр выводится целиком; последний кадр совпадает с кадром, построенным с нуля
+def test_incremental_frame_matches_full_render():
+    logic, text = play(False, computers())
+    frame = full_frame(logic)
+    frames = text.split('\n')[:-1]
+    assert [line.rstrip() for line in frames[-len(frame):]] == frame
+    assert logic.player1.is_winner or logic.player2.is_winner
+
+
+# В режиме in_place экран после партии - тот же кадр, что и построенный с нуля
+@pytest.mark.parametrize('players', [computers, lambda: [HumanPlayer("Игрок"), ComputerPlayer("Комп", pause=False)]],
+                         ids=['computers', 'human'])
+def test_in_place_screen_matches_full_render(monkeypatch, players):
+    monkeypatch.setattr(main, '_terminal_lines', lambda: Screen_Lines)
+    if players is not computers:
+        # человек стреляет по порядку по всем клеткам
+        moves = iter(f"{x} {y}" for x in range(1, Size + 1) for y in range(1, Size + 1))
+        monkeypatch.setattr('builtins.input', lambda prompt='': next(moves))
+    logic, text = play(True, players())
+    assert logic.player1.is_winner or logic.player2.is_winner
+    frame = full_frame(logic)
+    assert emulate(text)[:len(frame)] == frame
+    # после партии терминалу возвращена обычная прокрутка
+    assert text.endswith(f"\x1b[r\x1b[{Screen_Lines};1H")
@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+from gameConfig import Player_Types
+from gameLogic import SeaBattleGameLogic
+from gameResults import GameRow, ResultStore, ResultWriter, connect, row_from_logic
+from play import make_strategy, play_game
+
+
+def indexes(path: str) -> set[str]:
+    connection = sqlite3.connect(path)
+    try:
+        return {name for name, in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index' "
+                                                     "AND name LIKE 'results_by_%'")}
+    finally:
+        connection.close()
+
+
+# Без явных имен row_from_logic называет игроков так же, как play.py
+def test_row_from_logic_uses_player_kinds():
+    for kinds in (['density', 'computer'], ['random', 'exact']):
+        logic, _ = play_game(kinds, [make_strategy(kind) for kind in kinds], 6,
+                             SeaBattleGameLogic.Ships_Quantity, 1, True)
+        row = row_from_logic(logic, 1)
+        assert [row.player1, row.player2] == kinds
+        assert row == row_from_logic(logic, 1, *kinds)
+    assert set(kinds) <= set(Player_Types)
+
+
+def test_bulk_load_keeps_indexes_dropped_until_close(tmp_path):
+    path = str(tmp_path / 'results.db')
+    connect(path).close()
+    assert indexes(path) == {'results_by_config', 'results_by_seed'}
+
+    writer = ResultWriter(path, batch=10, bulk=True)
+    writer.add_many(GameRow('random', 'density', 10, '1:1', seed, 1, 20, 10, None) for seed in range(25))
+    writer.flush()
+    while writer.written < 20:
+        time.sleep(0.01)
+    # соединение читателя во время загрузки индексы не создает
+    with ResultStore(path) as store:
+        assert len(store) >= 20
+    assert not indexes(path)
+    writer.close()
+    assert indexes(path) == {'results_by_config', 'results_by_seed'}
+    with ResultStore(path) as store:
+        assert len(store) == 25
+        assert store.win_rates() == [('random', 'density', 10, '1:1', 25, 25)]
@@ -0,0 +1,64 @@
+import asyncio
+
+from gameServer import (GameServer, Mode_Computer, Mode_Match, Msg_Result, Msg_Start, Msg_Timeout,
+                        Msg_Turn, encode_hello, encode_move, read_server_message)
+
+
+async def connect(server, name: str, mode: int):
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(encode_hello(mode, name))
+    return reader, writer
+
+
+async def expect(reader, kind: int):
+    while True:
+        message = await asyncio.wait_for(read_server_message(reader), 5)
+        if message[0] == kind:
+            return message[1]
+
+
+# Клиент, отключившийся в ожидании соперника, в пару не попадает
+def test_disconnected_waiting_client_is_not_paired():
+    async def scenario():
+        game_server = GameServer(6)
+        server = await game_server.start()
+        async with server:
+            _, gone = await connect(server, "ушел", Mode_Match)
+            await asyncio.sleep(0.05)
+            gone.close()
+            await asyncio.sleep(0.05)
+            first, first_writer = await connect(server, "первый", Mode_Match)
+            await asyncio.sleep(0.05)
+            second, second_writer = await connect(server, "второй", Mode_Match)
+            start1 = await expect(first, Msg_Start)
+            start2 = await expect(second, Msg_Start)
+            for writer in (first_writer, second_writer):
+                writer.close()
+            return start1[2], start2[2]
+
+    assert asyncio.run(scenario()) == ("второй", "первый")
+
+
+# Выстрел, отправленный на прежний Msg_Turn после тайм-аута, не становится следующим ходом
+def test_late_shot_after_timeout_is_skipped():
+    async def scenario():
+        server = await GameServer(6, move_timeout=0.2).start()
+        async with server:
+            reader, writer = await connect(server, "игрок", Mode_Computer)
+            await expect(reader, Msg_Start)
+            late_turn = await expect(reader, Msg_Turn)
+            await expect(reader, Msg_Timeout)
+            writer.write(encode_move(late_turn, 1, 1))
+            turn = await expect(reader, Msg_Turn)
+            assert turn != late_turn
+            writer.write(encode_move(turn, 2, 2))
+            while True:
+                kind, data = await asyncio.wait_for(read_server_message(reader), 5)
+                if kind == Msg_Result and data[0] == 0:
+                    break
+            writer.write(encode_move(quit_game=True))
+            writer.close()
+            return data[1:3]
+
+    assert asyncio.run(scenario()) == (2, 2)
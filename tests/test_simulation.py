@@ -0,0 +1,79 @@
+import random as rnd
+
+import pytest
+
+from fleetPlacement import FleetPlacer, cell_to_xy
+from gameLogic import GameEvent, Point, SeaBattleGameBoard, SeaBattleGameLogic, Ship
+from gameRecord import ReplayPlayer
+from gameSimulation import HeadlessSimulation, RandomShots, ShotStrategy, SimBoard
+from gameStrategies import DensityShots
+
+
+# Стратегия, которая запоминает свои выстрелы
+class LoggedShots(ShotStrategy):
+    def __init__(self, strategy: ShotStrategy) -> None:
+        self.__strategy = strategy
+        self.shots = []
+
+    def reset(self, board_size: int, ships_quantity: dict, observation, rng) -> None:
+        self.shots = []
+        self.__strategy.reset(board_size, ships_quantity, observation, rng)
+
+    def choose(self) -> int:
+        cell = self.__strategy.choose()
+        self.shots.append(cell)
+        return cell
+
+    def observe(self, cell: int, result: int) -> None:
+        self.__strategy.observe(cell, result)
+
+
+# Те же флоты и выстрелы, проведенные через SeaBattleGameLogic: победитель, выстрелы и ходы
+def replay_logic(size: int, fleets, orders: list[list[int]]) -> tuple:
+    players = [ReplayPlayer(f"Игрок {side + 1}", [ship.body for ship in fleets[side]], size) for side in range(2)]
+    logic = SeaBattleGameLogic(size, *players)
+    moves = [iter(order) for order in orders]
+    shots = [0, 0]
+    turns = 1
+    side = 0
+    while True:
+        player = logic.player1 if side == 0 else logic.player2
+        logic.process_event(GameEvent(GameEvent.Event_Shot, player, Point(*cell_to_xy(next(moves[side]), size))))
+        shots[side] += 1
+        if player.is_winner:
+            return side + 1, shots[0], shots[1], turns
+        if not player.last_shot_success:
+            side ^= 1
+            turns += 1
+
+
+@pytest.mark.parametrize('make_strategy', [RandomShots, DensityShots])
+def test_headless_matches_game_logic(make_strategy):
+    size = 10
+    strategies = [LoggedShots(make_strategy()), LoggedShots(make_strategy())]
+    sim = HeadlessSimulation(size, *strategies)
+    for seed in range(30):
+        result = sim.play(seed)
+        expected = replay_logic(size, sim.fleets, [s.shots for s in strategies])
+        assert (result.winner, result.shots1, result.shots2, result.turns) == expected
+
+
+def test_sim_board_matches_game_board():
+    size = 10
+    results = {SeaBattleGameBoard.Shot_Miss: False, SeaBattleGameBoard.Shot_Injured: True,
+               SeaBattleGameBoard.Shot_Killed: True}
+    for seed in range(10):
+        rng = rnd.Random(seed)
+        fleet = FleetPlacer(size, SeaBattleGameLogic.Ships_Quantity, rng).place()
+        sim_board = SimBoard(size, fleet)
+        board = SeaBattleGameBoard(size, [Ship([Point(*cell_to_xy(c, size)) for c in ship.body]) for ship in fleet])
+        cells = list(range(size * size))
+        for cell in rng.sample(cells, len(cells)) + rng.sample(cells, 10):
+            result = sim_board.incoming_shot(cell)
+            if result == SimBoard.Shot_Already:
+                with pytest.raises(ValueError):
+                    board.incoming_shot(Point(*cell_to_xy(cell, size)))
+            else:
+                assert board.incoming_shot(Point(*cell_to_xy(cell, size))) == results[result]
+            assert sim_board.alive_ships_count == board.alive_ships_count
+            assert list(sim_board.shots) == [mark for row in board.enemy_shots for mark in row]
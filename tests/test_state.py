@@ -0,0 +1,95 @@
+import random as rnd
+
+import pytest
+
+import bitBoard
+from gameLogic import ComputerPlayer, GameEvent, Point, SeaBattleGameBoard, SeaBattleGameLogic
+from gameState import restore, snapshot
+
+Size = 8
+Backends = [SeaBattleGameBoard, bitBoard.BitGameBoard]
+if bitBoard.np is not None:
+    Backends.append(bitBoard.NumpyGameBoard)
+
+
+def current_player(logic: SeaBattleGameLogic):
+    return logic.player1 if logic.player1.last_shot_success else logic.player2
+
+
+def shoot(logic: SeaBattleGameLogic, cell: int) -> None:
+    player = current_player(logic)
+    logic.process_event(GameEvent(GameEvent.Event_Shot, player, Point(cell // Size + 1, cell % Size + 1)))
+
+
+# Партия компьютеров, сыгранная до середины
+def midgame(board_class) -> SeaBattleGameLogic:
+    logic = SeaBattleGameLogic(Size, ComputerPlayer('Комп 1', pause=False), ComputerPlayer('Комп 2', pause=False),
+                               board_class)
+    for _ in range(Size * Size // 2):
+        player = current_player(logic)
+        logic.process_event(GameEvent(GameEvent.Event_Shot, player, player.choose_shot()))
+        if player.is_winner:
+            break
+    return logic
+
+
+# Доигрывает партию и возвращает номера клеток всех выстрелов
+def finish(logic: SeaBattleGameLogic) -> list[int]:
+    shots = []
+    while not (logic.player1.is_winner or logic.player2.is_winner):
+        player = current_player(logic)
+        shot = player.choose_shot()
+        shots.append((shot.x - 1) * Size + (shot.y - 1))
+        logic.process_event(GameEvent(GameEvent.Event_Shot, player, shot))
+    return shots
+
+
+# Ветка снимка, доигранная теми же выстрелами, совпадает с живой партией, а восстановленная
+# из снимка партия после тех же выстрелов приходит в то же состояние
+@pytest.mark.parametrize('board_class', Backends, ids=lambda c: c.__name__)
+def test_fork_and_restore_replay_the_live_game(board_class):
+    rnd.seed(0)
+    for _ in range(10):
+        logic = midgame(board_class)
+        state = snapshot(logic)
+        shots = finish(logic)
+        final = snapshot(logic)
+        assert final.winner
+
+        fork = state.fork()
+        for cell in shots:
+            fork.shoot(cell)
+        assert fork.state() == final
+        assert fork.winner == final.winner
+
+        restore(logic, state)
+        assert snapshot(logic) == state
+        for cell in shots:
+            shoot(logic, cell)
+        assert snapshot(logic) == final
+
+
+# Выстрелы и розыгрыш в ветке не меняют ни снимок, ни другие ветки того же снимка
+@pytest.mark.parametrize('board_class', Backends, ids=lambda c: c.__name__)
+def test_fork_does_not_change_parent(board_class):
+    rnd.seed(1)
+    logic = midgame(board_class)
+    state = snapshot(logic)
+    fields = tuple(state)
+    target = state.current ^ 1
+    fork = state.fork()
+    sibling = state.fork()
+    assert fork.state() is state
+
+    cell = (state.open_cells(target) & -state.open_cells(target)).bit_length() - 1
+    fork.shoot(cell)
+    assert fork.state() != state
+    fork.rollout(rnd.Random(0))
+    assert fork.winner
+
+    assert tuple(state) == fields
+    assert state.open_cells(target) >> cell & 1
+    assert sibling.state() is state
+    assert snapshot(logic) == state
+    # ветка, созданная после розыгрыша соседней, играет с того же места
+    assert state.fork().rollout(rnd.Random(0)) == sibling.rollout(rnd.Random(0))
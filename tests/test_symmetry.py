@@ -0,0 +1,46 @@
+import random as rnd
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from boardSymmetry import Symmetries, SymmetryCache, canonical, transform
+from gameLogic import SeaBattleGameBoard
+from gameStrategies import ExactShots
+from placementCount import PlacementCounter
+
+Fleet = {2: 1, 1: 2}
+
+
+def test_canonical_form_is_shared_by_all_copies():
+    size = 5
+    observation = bytes(rnd.Random(0).choice([0, 0, SeaBattleGameBoard.Miss_Shot]) for _ in range(size * size))
+    form, symmetry = canonical(observation, size)
+    assert transform(observation, size, symmetry) == form
+    for s in range(Symmetries):
+        assert canonical(transform(observation, size, s), size)[0] == form
+
+
+def test_cached_values_match_direct_computation():
+    size = 5
+    counter = PlacementCounter(size, Fleet, 0)
+    cache = SymmetryCache()
+    observation = bytearray(size * size)
+    observation[1] = observation[7] = SeaBattleGameBoard.Miss_Shot
+    for s in range(Symmetries):
+        copy = transform(bytes(observation), size, s)
+        assert cache.values(copy, None, counter.probabilities) == counter.probabilities(copy)
+    assert len(cache) == 1
+    assert cache.hits == Symmetries - 1
+
+
+# С общим кэшем собственный кэш PlacementCounter не хранит расчетов
+def test_exact_shots_does_not_cache_twice():
+    size = 5
+    shared = SymmetryCache()
+    strategy = ExactShots(256, shared)
+    strategy.reset(size, Fleet, bytearray(size * size), rnd.Random(0))
+    strategy.choose()
+    strategy.choose()
+    assert strategy.counter.hits == 0
+    assert shared.hits == 1 and shared.misses == 1
@@ -0,0 +1,36 @@
+import gameTournament
+from gameSimulation import RandomShots
+from gameTournament import Tournament
+
+
+def summary(stats: dict) -> dict:
+    return {pair: (s.games, s.wins, s.turns, s.shots_to_win) for pair, s in stats.items()}
+
+
+# Результат турнира зависит только от зерна, а не от числа процессов и порядка шардов
+def test_results_do_not_depend_on_workers():
+    tournament = Tournament(6, ['density', 'montecarlo'], base_seed=7)
+    one = tournament.run(6, workers=1, shard_size=4)
+    two = tournament.run(6, workers=2, shard_size=4)
+    assert summary(one) == summary(two)
+    assert all(s.games == 6 for s in one.values())
+    assert len(one) == 4
+
+
+class ClosingShots(RandomShots):
+    closed = 0
+
+    def close(self) -> None:
+        ClosingShots.closed += 1
+
+
+def test_shard_and_replay_close_strategies(monkeypatch):
+    monkeypatch.setitem(gameTournament.Strategies, 'closing', ClosingShots)
+    ClosingShots.closed = 0
+    tournament = Tournament(6, ['closing'])
+    stats = tournament.run(10, workers=1, shard_size=4)
+    # 3 шарда по две стратегии
+    assert ClosingShots.closed == 6
+    assert tournament.replay(('closing', 'closing'), 3).winner in (1, 2)
+    assert ClosingShots.closed == 8
+    assert stats[('closing', 'closing')].games == 10